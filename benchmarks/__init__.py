@@ -0,0 +1,3 @@
+"""
+Benchmark suite for the A/B testing framework
+"""
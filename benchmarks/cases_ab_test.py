@@ -0,0 +1,185 @@
+"""
+ABTest benchmark cases
+Author: Gabriel Demetrios Lafis
+Description: Latency and throughput cases for every public ABTest method
+"""
+
+import numpy as np
+
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.continuous import SufficientStats
+
+from .harness import benchmark
+
+SEED = 20240601
+
+
+def _framework() -> ABTest:
+    return ABTest(alpha=0.05, power=0.80, seed=SEED)
+
+
+def _experiments(n: int):
+    """
+    Realistic conversion counts for ``n`` experiments.
+    """
+    rng = np.random.default_rng(SEED)
+    visitors_a = rng.integers(1000, 100000, n)
+    visitors_b = rng.integers(1000, 100000, n)
+    rates = rng.uniform(0.01, 0.2, n)
+    conversions_a = rng.binomial(visitors_a, rates)
+    conversions_b = rng.binomial(visitors_b, rates * rng.uniform(0.9, 1.2, n))
+    return conversions_a, visitors_a, conversions_b, visitors_b
+
+
+def _planning_grid(n: int):
+    side = int(np.sqrt(n))
+    baseline_rate = np.linspace(0.01, 0.5, side)[:, None]
+    mde = np.linspace(0.01, 0.5, side)[None, :]
+    return baseline_rate, mde
+
+
+def _cells(n):
+    return int(np.sqrt(n)) ** 2
+
+
+@benchmark("calculate_sample_size")
+def calculate_sample_size(_):
+    ab_test = _framework()
+    return lambda: ab_test.calculate_sample_size(0.10, 0.05)
+
+
+@benchmark("calculate_sample_size_grid", params=(100, 10000, 1000000), items=_cells)
+def calculate_sample_size_grid(n):
+    ab_test = _framework()
+    baseline_rate, mde = _planning_grid(n)
+    return lambda: ab_test.calculate_sample_size_grid(baseline_rate, mde)
+
+
+@benchmark("calculate_power", params=(100, 10000), items=_cells)
+def calculate_power(n):
+    ab_test = _framework()
+    baseline_rate, mde = _planning_grid(n)
+    return lambda: ab_test.calculate_power(10000, baseline_rate, mde)
+
+
+@benchmark("calculate_mde", params=(100, 10000), items=_cells)
+def calculate_mde(n):
+    ab_test = _framework()
+    side = int(np.sqrt(n))
+    sample_size = np.linspace(100, 100000, side)[:, None]
+    baseline_rate = np.linspace(0.01, 0.5, side)[None, :]
+    return lambda: ab_test.calculate_mde(sample_size, baseline_rate)
+
+
+@benchmark("calculate_duration", params=(100, 10000), items=_cells)
+def calculate_duration(n):
+    ab_test = _framework()
+    baseline_rate, mde = _planning_grid(n)
+    return lambda: ab_test.calculate_duration(5000, baseline_rate, mde)
+
+
+@benchmark("two_proportion_ztest")
+def two_proportion_ztest(_):
+    ab_test = _framework()
+    return lambda: ab_test.two_proportion_ztest(1000, 10000, 1100, 10000)
+
+
+@benchmark("two_proportion_ztest_loop", params=(1000, 10000), items=lambda n: n)
+def two_proportion_ztest_loop(n):
+    ab_test = _framework()
+    experiments = [tuple(map(int, row)) for row in zip(*_experiments(n))]
+    return lambda: [ab_test.two_proportion_ztest(*row) for row in experiments]
+
+
+@benchmark(
+    "two_proportion_ztest_batch",
+    params=(1000, 10000, 100000),
+    quick_params=(10000,),
+    items=lambda n: n,
+)
+def two_proportion_ztest_batch(n):
+    ab_test = _framework()
+    counts = _experiments(n)
+    return lambda: ab_test.two_proportion_ztest_batch(*counts)
+
+
+@benchmark(
+    "bayesian_ab_test",
+    params=(10**4, 10**5, 10**6, 10**7),
+    quick_params=(10**4, 10**5),
+    items=lambda n: n,
+)
+def bayesian_ab_test(n):
+    ab_test = _framework()
+    return lambda: ab_test.bayesian_ab_test(1000, 10000, 1100, 10000, n_simulations=n)
+
+
+@benchmark("bayesian_ab_test_exact")
+def bayesian_ab_test_exact(_):
+    ab_test = _framework()
+    return lambda: ab_test.bayesian_ab_test(1000, 10000, 1100, 10000, method="exact")
+
+
+@benchmark("multi_arm_ztest", params=(5, 50), items=lambda k: k * (k - 1) // 2)
+def multi_arm_ztest(k):
+    ab_test = _framework()
+    conversions, visitors, _, _ = _experiments(k)
+    return lambda: ab_test.multi_arm_ztest(conversions, visitors)
+
+
+@benchmark(
+    "bayesian_multi_arm_test",
+    params=(10**4, 10**5, 10**6),
+    quick_params=(10**4,),
+    items=lambda n: n,
+)
+def bayesian_multi_arm_test(n):
+    ab_test = _framework()
+    conversions, visitors, _, _ = _experiments(4)
+    return lambda: ab_test.bayesian_multi_arm_test(conversions, visitors, n_simulations=n)
+
+
+@benchmark("welch_ttest", params=(10**4, 10**6), items=lambda n: 2 * n)
+def welch_ttest(n):
+    ab_test = _framework()
+    rng = np.random.default_rng(SEED)
+    values_a = rng.lognormal(0, 1, n)
+    values_b = rng.lognormal(0.05, 1, n)
+    return lambda: ab_test.welch_ttest(values_a, values_b)
+
+
+@benchmark("welch_ttest_sufficient_stats")
+def welch_ttest_sufficient_stats(_):
+    ab_test = _framework()
+    stats_a = SufficientStats(100000, 10.0, 2.5e6)
+    stats_b = SufficientStats(100000, 10.1, 2.6e6)
+    return lambda: ab_test.welch_ttest(stats_a, stats_b)
+
+
+@benchmark("mann_whitney_test", params=(100, 10000), items=lambda bins: 2 * bins)
+def mann_whitney_test(bins):
+    ab_test = _framework()
+    rng = np.random.default_rng(SEED)
+    counts_a = rng.poisson(50, bins)
+    counts_b = rng.poisson(52, bins)
+    return lambda: ab_test.mann_whitney_test(counts_a, counts_b)
+
+
+@benchmark("cuped_test", params=(10**4, 10**6), items=lambda n: 2 * n)
+def cuped_test(n):
+    ab_test = _framework()
+    rng = np.random.default_rng(SEED)
+    x_a, x_b = rng.normal(10, 2, n), rng.normal(10, 2, n)
+    y_a = 0.8 * x_a + rng.normal(0, 1, n)
+    y_b = 0.8 * x_b + rng.normal(0.05, 1, n)
+    return lambda: ab_test.cuped_test((y_a, x_a), (y_b, x_b))
+
+
+@benchmark("bootstrap_test", params=(10**3, 10**4), items=lambda n: 2 * n * 1000)
+def bootstrap_test(n):
+    ab_test = _framework()
+    rng = np.random.default_rng(SEED)
+    values_a = rng.lognormal(0, 1, n)
+    values_b = rng.lognormal(0.05, 1, n)
+    return lambda: ab_test.bootstrap_test(values_a, values_b, n_replicates=1000)
+
@@ -0,0 +1,38 @@
+"""
+Startup benchmark cases
+Author: Gabriel Demetrios Lafis
+Description: Cold import and first-call time of the package, measured in fresh interpreters
+"""
+
+import os
+import subprocess
+import sys
+
+from .harness import benchmark
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Statements timed in a new interpreter; "scipy_stats" is the import the
+# package used to pay eagerly and serves as a reference point.
+STARTUP_STATEMENTS = {
+    "interpreter": "pass",
+    "package": "import src.hypothesis_testing",
+    "abtest": "from src.hypothesis_testing import ABTest",
+    "first_ztest": (
+        "from src.hypothesis_testing import ABTest; "
+        "ab_test = ABTest(); "
+        "ab_test.two_proportion_ztest(120, 1500, 145, 1500); "
+        "ab_test.calculate_sample_size(0.10, 0.05)"
+    ),
+    "scipy_stats": "import scipy.stats",
+}
+
+
+@benchmark(
+    "cold_start",
+    params=tuple(STARTUP_STATEMENTS),
+    quick_params=("interpreter", "first_ztest"),
+)
+def cold_start(name):
+    command = [sys.executable, "-c", STARTUP_STATEMENTS[name]]
+    return lambda: subprocess.run(command, cwd=_ROOT, check=True)
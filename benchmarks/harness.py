@@ -0,0 +1,256 @@
+"""
+Benchmark harness
+Author: Gabriel Demetrios Lafis
+Description: Timing, peak-memory measurement, JSON storage and regression comparison
+"""
+
+import gc
+import importlib
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import scipy
+
+# Registered cases: name -> {"setup", "params", "quick_params", "items"}
+BENCHMARKS: Dict[str, Dict] = {}
+
+# Modules of this package whose import registers the cases
+CASE_MODULES = ("cases_ab_test", "cases_startup")
+
+
+def benchmark(name: str, params=(None,), quick_params=None, items: Optional[Callable] = None):
+    """
+    Register a benchmark case.
+
+    The decorated function receives one parameter value and returns the
+    zero-argument callable to time, so expensive setup stays out of the
+    measurement.
+
+    Parameters:
+    -----------
+    name : str
+        Case name, stored as ``name[param]`` in the results
+    params : sequence
+        Scales the case runs at
+    quick_params : sequence, optional
+        Subset of scales used with ``--quick`` (defaults to the first scale)
+    items : callable, optional
+        Maps a parameter to the number of items processed per call, used to
+        report throughput (defaults to one item per call)
+    """
+
+    def decorator(setup: Callable) -> Callable:
+        BENCHMARKS[name] = {
+            "setup": setup,
+            "params": tuple(params),
+            "quick_params": tuple(quick_params) if quick_params is not None else tuple(params[:1]),
+            "items": items,
+        }
+        return setup
+
+    return decorator
+
+
+def _calibrate(func: Callable, min_time: float) -> int:
+    """
+    Number of calls per repeat so that a repeat lasts at least ``min_time``.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            return number
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+
+def measure(func: Callable, repeat: int = 5, min_time: float = 0.05) -> Dict:
+    """
+    Time a callable and measure its peak traced memory.
+
+    Parameters:
+    -----------
+    func : callable
+        Zero-argument callable to measure
+    repeat : int
+        Number of timed repeats
+    min_time : float
+        Minimum duration of each repeat in seconds
+
+    Returns:
+    --------
+    dict : Per-call min/median/mean/stdev seconds, calls per repeat and peak
+        memory in bytes
+    """
+    func()  # warm-up
+    number = _calibrate(func, min_time)
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+
+    # Peak memory is measured on a separate call; tracing slows execution
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+        "peak_memory_bytes": peak,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_cases() -> None:
+    """
+    Import every case module so its cases are registered.
+    """
+    for module in CASE_MODULES:
+        importlib.import_module(f".{module}", __package__)
+
+
+def run_benchmarks(
+    pattern: Optional[str] = None,
+    quick: bool = False,
+    repeat: int = 5,
+    min_time: float = 0.05,
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict:
+    """
+    Run the registered benchmark cases.
+
+    Parameters:
+    -----------
+    pattern : str, optional
+        Only run cases whose name contains this substring
+    quick : bool
+        Run only the quick scales of every case
+    repeat : int
+        Number of timed repeats per case
+    min_time : float
+        Minimum duration of each repeat in seconds
+    log : callable, optional
+        Called with a progress line after each case
+
+    Returns:
+    --------
+    dict : ``{"metadata": {...}, "results": {case: measurement}}``
+    """
+    load_cases()
+    results = {}
+    for name, case in BENCHMARKS.items():
+        if pattern is not None and pattern not in name:
+            continue
+        for param in case["quick_params"] if quick else case["params"]:
+            key = name if param is None else f"{name}[{param}]"
+            measurement = measure(case["setup"](param), repeat, min_time)
+            items = case["items"](param) if case["items"] is not None else 1
+            measurement["items"] = items
+            measurement["throughput"] = items / measurement["median"]
+            results[key] = measurement
+            if log is not None:
+                log(
+                    f"{key:<48} {measurement['median'] * 1e3:12.4f} ms"
+                    f" {measurement['throughput']:14.1f} items/s"
+                    f" {measurement['peak_memory_bytes'] / 2**20:10.2f} MiB"
+                )
+
+    metadata = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "quick": quick,
+    }
+    return {"metadata": metadata, "results": results}
+
+
+def save_results(results: Dict, path: str) -> None:
+    """
+    Write benchmark results to a JSON file.
+    """
+    with open(path, "w") as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict:
+    """
+    Read benchmark results from a JSON file.
+    """
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Compare two benchmark runs case by case.
+
+    Parameters:
+    -----------
+    baseline : dict
+        Results of the reference run
+    current : dict
+        Results of the run under test
+    threshold : float
+        Relative slowdown of the median time (or growth of peak memory)
+        above which a case counts as a regression
+
+    Returns:
+    --------
+    list : One entry per case present in both runs, with the time and
+        memory ratios (current / baseline) and a ``regression`` flag
+    """
+    comparisons = []
+    for key, new in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        time_ratio = new["median"] / old["median"] if old["median"] > 0 else 1.0
+        memory_ratio = (
+            new["peak_memory_bytes"] / old["peak_memory_bytes"]
+            if old["peak_memory_bytes"] > 0
+            else 1.0
+        )
+        comparisons.append(
+            {
+                "case": key,
+                "baseline_median": old["median"],
+                "current_median": new["median"],
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "regression": time_ratio > 1 + threshold or memory_ratio > 1 + threshold,
+            }
+        )
+    return comparisons
@@ -0,0 +1,61 @@
+"""
+Benchmark runner
+Author: Gabriel Demetrios Lafis
+Description: Command-line entry point that runs, stores and compares benchmarks
+
+Usage (from the repository root):
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --quick --compare bench.json --threshold 0.15
+"""
+
+import argparse
+import sys
+
+from .harness import compare_results, load_results, run_benchmarks, save_results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the A/B testing framework")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown or memory growth reported as a regression (default 0.10)",
+    )
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="Run only the small scales")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repeats per case")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="Minimum seconds per repeat"
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<48} {'median':>15} {'throughput':>20} {'peak':>14}")
+    results = run_benchmarks(args.filter, args.quick, args.repeat, args.min_time, log=print)
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        comparisons = compare_results(load_results(args.compare), results, args.threshold)
+        regressions = [c for c in comparisons if c["regression"]]
+        print(f"\nComparison against {args.compare} (threshold {args.threshold:.0%}):")
+        for c in comparisons:
+            flag = "REGRESSION" if c["regression"] else "ok"
+            print(
+                f"{c['case']:<48} time x{c['time_ratio']:6.3f}"
+                f"  memory x{c['memory_ratio']:6.3f}  {flag}"
+            )
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) found")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,61 @@
 """
 Hypothesis testing module for A/B testing
+
+Public names are imported from their submodules on first access, so
+importing the package stays cheap and only pulls in what a job uses.
 """
 
-from .ab_test import ABTest
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "ABTest": "ab_test",
+    "ABTestService": "service",
+    "ArmAccumulator": "streaming",
+    "BayesianResult": "results",
+    "BetaPosterior": "posteriors",
+    "CovariateStats": "cuped",
+    "EventCounter": "ingestion",
+    "ExperimentAccumulator": "streaming",
+    "ExperimentStore": "store",
+    "GammaPosterior": "posteriors",
+    "GroupSequentialTest": "sequential",
+    "Instrumentation": "instrumentation",
+    "MSPRTTest": "sequential",
+    "NormalInverseGammaPosterior": "posteriors",
+    "PoissonBootstrap": "bootstrap",
+    "PortfolioRunner": "portfolio",
+    "PowerSimulator": "power_simulation",
+    "RandomStreams": "random_streams",
+    "ResultCache": "cache",
+    "ResultSet": "results",
+    "StreamingQuantiles": "monte_carlo",
+    "SufficientStats": "continuous",
+    "ThompsonSamplingAllocator": "bandit",
+    "ZTestResult": "results",
+    "adjust_pvalues": "corrections",
+    "count_events": "ingestion",
+    "cuped_theta": "cuped",
+    "duration_grid": "planning",
+    "load_test": "service",
+    "mde_grid": "planning",
+    "posterior_from_dict": "posteriors",
+    "power_grid": "planning",
+    "sample_size_grid": "planning",
+    "segment_counts": "segments",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["ABTest"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
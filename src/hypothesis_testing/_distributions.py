@@ -0,0 +1,91 @@
+"""
+Normal distribution helpers
+Author: Gabriel Demetrios Lafis
+Description: Lightweight normal CDF, survival function and quantile without importing scipy.stats
+"""
+
+import math
+
+import numpy as np
+
+_SQRT2 = math.sqrt(2.0)
+_SQRT2PI = math.sqrt(2.0 * math.pi)
+
+# Acklam's rational approximation of the normal quantile (relative error
+# below 1.2e-9), refined to full double precision with one Halley step.
+_A = (-3.969683028665376e01, 2.209460984245205e02, -2.759285104469687e02,
+      1.383577518672690e02, -3.066479806614716e01, 2.506628277459239e00)
+_B = (-5.447609879822406e01, 1.615858368580409e02, -1.556989798598866e02,
+      6.680131188771972e01, -1.328068155288572e01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e00,
+      -2.549732539343734e00, 4.374664141464968e00, 2.938163982698783e00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e00,
+      3.754408661907416e00)
+_P_LOW = 0.02425
+
+
+def _lower_quantile(p: float) -> float:
+    """
+    Normal quantile for 0 < p <= 0.5.
+    """
+    if p < _P_LOW:
+        q = math.sqrt(-2.0 * math.log(p))
+        x = (((((_C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5]) / (
+            (((_D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1.0
+        )
+    else:
+        q = p - 0.5
+        r = q * q
+        x = (((((_A[0] * r + _A[1]) * r + _A[2]) * r + _A[3]) * r + _A[4]) * r + _A[5]) * q / (
+            ((((_B[0] * r + _B[1]) * r + _B[2]) * r + _B[3]) * r + _B[4]) * r + 1.0
+        )
+    error = 0.5 * math.erfc(-x / _SQRT2) - p
+    u = error * _SQRT2PI * math.exp(0.5 * x * x)
+    return x - u / (1.0 + 0.5 * x * u)
+
+
+def norm_cdf(x):
+    """
+    Standard normal CDF.
+
+    Scalars are evaluated with ``math.erfc``; arrays use ``scipy.special.ndtr``,
+    which is only imported on first use.
+    """
+    if np.ndim(x) == 0:
+        return 0.5 * math.erfc(-float(x) / _SQRT2)
+    from scipy import special
+
+    return special.ndtr(x)
+
+
+def norm_sf(x):
+    """
+    Standard normal survival function, ``1 - norm_cdf(x)`` without cancellation.
+    """
+    if np.ndim(x) == 0:
+        return 0.5 * math.erfc(float(x) / _SQRT2)
+    from scipy import special
+
+    return special.ndtr(-np.asarray(x, dtype=np.float64))
+
+
+def norm_ppf(p):
+    """
+    Standard normal quantile (inverse CDF).
+
+    Scalars use a refined rational approximation accurate to double
+    precision; arrays use ``scipy.special.ndtri``. Values outside [0, 1]
+    give nan, 0 and 1 give -inf and inf.
+    """
+    if np.ndim(p) == 0:
+        p = float(p)
+        if not 0.0 < p < 1.0:
+            if p == 0.0:
+                return -math.inf
+            return math.inf if p == 1.0 else math.nan
+        if p > 0.5:
+            return -_lower_quantile(1.0 - p)
+        return _lower_quantile(p)
+    from scipy import special
+
+    return special.ndtri(p)
@@ -5,8 +5,96 @@ Description: Statistical framework for A/B testing with frequentist and Bayesian
 """
 
 import numpy as np
-from scipy import stats
-from typing import Dict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from ._distributions import norm_cdf, norm_ppf, norm_sf
+from .bootstrap import INTERVAL_METHODS, PoissonBootstrap
+from .cache import ResultCache
+from .continuous import SufficientStats
+from .corrections import adjust_pvalues
+from .cuped import CovariateStats, cuped_theta
+from .instrumentation import Instrumentation
+from .monte_carlo import DEFAULT_CHUNK_SIZE
+from .posteriors import BetaPosterior, prob_b_better_batch
+from .planning import duration_grid, mde_grid, power_grid, sample_size_grid
+from .random_streams import RandomStreams
+from .results import BayesianResult, ResultSet, ZTestResult
+from .segments import segment_counts
+
+# Largest number of terms evaluated by the closed-form P(X > Y) sum before
+# switching to numerical integration.
+_EXACT_SUM_LIMIT = 50000
+
+# Smallest Beta shape for which the fixed Gauss-Legendre rule replaces
+# adaptive quadrature (smaller shapes can have singular densities)
+_QUADRATURE_MIN_SHAPE = 5.0
+
+
+def _prob_beta_greater(alpha_x: float, beta_x: float, alpha_y: float, beta_y: float) -> float:
+    """
+    Exact probability that X > Y for independent X ~ Beta(alpha_x, beta_x)
+    and Y ~ Beta(alpha_y, beta_y).
+
+    Uses Evan Miller's closed-form sum when one of the shape parameters is a
+    small enough integer, a fixed Gauss-Legendre rule when every shape is at
+    least ``_QUADRATURE_MIN_SHAPE`` (smooth, unimodal densities), and
+    adaptive quadrature otherwise.
+    """
+    if float(alpha_x).is_integer() and alpha_x <= _EXACT_SUM_LIMIT:
+        if not (float(alpha_y).is_integer() and alpha_y < alpha_x):
+            from scipy import special
+
+            i = np.arange(int(alpha_x), dtype=np.float64)
+            log_terms = (
+                special.betaln(alpha_y + i, beta_y + beta_x)
+                - np.log(beta_x + i)
+                - special.betaln(1 + i, beta_x)
+                - special.betaln(alpha_y, beta_y)
+            )
+            return float(min(max(np.exp(log_terms).sum(), 0.0), 1.0))
+    if float(alpha_y).is_integer() and alpha_y <= _EXACT_SUM_LIMIT:
+        return 1.0 - _prob_beta_greater(alpha_y, beta_y, alpha_x, beta_x)
+
+    if min(alpha_x, beta_x, alpha_y, beta_y) >= _QUADRATURE_MIN_SHAPE:
+        return float(prob_b_better_batch(alpha_y, beta_y, alpha_x, beta_x))
+
+    from scipy import integrate, stats
+
+    # P(X > Y) = integral of f_X(x) * F_Y(x) over the effective support of X
+    lower = stats.beta.ppf(1e-12, alpha_x, beta_x)
+    upper = stats.beta.isf(1e-12, alpha_x, beta_x)
+    value, _ = integrate.quad(
+        lambda x: stats.beta.pdf(x, alpha_x, beta_x) * stats.beta.cdf(x, alpha_y, beta_y),
+        lower,
+        upper,
+        points=[alpha_x / (alpha_x + beta_x), alpha_y / (alpha_y + beta_y)],
+        limit=200,
+        epsabs=1e-12,
+    )
+    return float(min(max(value, 0.0), 1.0))
+
+
+def _prob_beta_greater_batch(alpha_x, beta_x, alpha_y, beta_y) -> np.ndarray:
+    """
+    ``_prob_beta_greater`` for many pairs of Beta distributions.
+
+    Pairs whose shapes are all at least ``_QUADRATURE_MIN_SHAPE`` share one
+    fixed Gauss-Legendre evaluation; the others use the scalar routine.
+    """
+    alpha_x, beta_x, alpha_y, beta_y = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (alpha_x, beta_x, alpha_y, beta_y))
+    )
+    smooth = np.minimum.reduce([alpha_x, beta_x, alpha_y, beta_y]) >= _QUADRATURE_MIN_SHAPE
+    probs = np.empty(alpha_x.shape)
+    if smooth.any():
+        probs[smooth] = prob_b_better_batch(
+            alpha_y[smooth], beta_y[smooth], alpha_x[smooth], beta_x[smooth]
+        )
+    for index in zip(*np.nonzero(~smooth)):
+        probs[index] = _prob_beta_greater(
+            alpha_x[index], beta_x[index], alpha_y[index], beta_y[index]
+        )
+    return probs
 
 
 class ABTest:
@@ -14,7 +102,15 @@ class ABTest:
     A comprehensive A/B testing framework for conversion rate optimization.
     """
 
-    def __init__(self, alpha: float = 0.05, power: float = 0.80):
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        power: float = 0.80,
+        seed=None,
+        bit_generator: str = "PCG64",
+        cache_size: Optional[int] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
         """
         Initialize the A/B test framework.
 
@@ -24,12 +120,87 @@ class ABTest:
             Significance level (Type I error rate)
         power : float
             Statistical power (1 - Type II error rate)
+        seed : None, int, np.random.SeedSequence or np.random.Generator
+            Seed for Monte Carlo methods. When set, every Monte Carlo call is
+            reproducible: identical inputs (or an identical ``key``) give
+            identical results.
+        bit_generator : str
+            Bit generator used for Monte Carlo draws (e.g. "PCG64DXSM" or
+            "Philox")
+        cache_size : int, optional
+            Enables an LRU cache of this many test results. Without a seed,
+            cached Monte Carlo results are reused as-is for identical inputs.
+        instrumentation : Instrumentation, optional
+            Collector for per-stage timings ("validation", "distribution",
+            "rng", "percentile") and counters (calls, samples drawn, cache
+            hits and misses). Defaults to a disabled collector that can be
+            switched on later with ``ab_test.instrumentation.enabled = True``.
         """
         self.alpha = alpha
         self.power = power
         self.beta = 1 - power
+        self.random_streams = RandomStreams(seed, bit_generator)
+        self.cache = ResultCache(cache_size) if cache_size else None
+        self.instrumentation = (
+            instrumentation if instrumentation is not None else Instrumentation(enabled=False)
+        )
+
+    def _cache_key(self, *parts) -> Tuple:
+        """
+        Build a cache key from call inputs and the framework configuration.
+        """
+        streams = self.random_streams
+        seed_key = (
+            (streams.seed_sequence.entropy, tuple(streams.seed_sequence.spawn_key))
+            if streams.seeded
+            else None
+        )
+        return parts + (self.alpha, self.power, streams.bit_generator, seed_key)
+
+    def _cached(self, key: Tuple, compute) -> Dict:
+        """
+        Look a result up in the cache, counting hits and misses.
+        """
+        missed = False
+
+        def tracked_compute():
+            nonlocal missed
+            missed = True
+            return compute()
 
-    def calculate_sample_size(self, baseline_rate: float, mde: float, ratio: float = 1.0) -> int:
+        result = self.cache.get_or_compute(key, tracked_compute)
+        self.instrumentation.count("cache_misses" if missed else "cache_hits")
+        return result
+
+    def _resolve_rng(
+        self,
+        rng: Optional[np.random.Generator],
+        seed,
+        key: Optional[Hashable],
+        default_key: Hashable,
+    ) -> np.random.Generator:
+        """
+        Pick the generator for a Monte Carlo call.
+
+        Precedence: an explicit ``rng``, then a per-call ``seed``, then the
+        stream of ``key``. A seeded framework falls back to the stream of
+        ``default_key`` (the call inputs) so identical calls repeat exactly.
+        """
+        if rng is not None:
+            return rng
+        if seed is not None:
+            return self.random_streams.make_generator(np.random.SeedSequence(seed))
+        if key is None and self.random_streams.seeded:
+            key = default_key
+        return self.random_streams.generator(key)
+
+    def calculate_sample_size(
+        self,
+        baseline_rate: float,
+        mde: float,
+        ratio: float = 1.0,
+        variance_reduction: float = 0.0,
+    ) -> int:
         """
         Calculate required sample size for an A/B test.
 
@@ -41,6 +212,10 @@ class ABTest:
             Minimum detectable effect (relative change, e.g., 0.1 for 10%)
         ratio : float
             Ratio of treatment to control group size
+        variance_reduction : float
+            Expected fraction of variance removed by CUPED, i.e. the squared
+            correlation between the metric and its pre-experiment covariate
+            (0 for an unadjusted test)
 
         Returns:
         --------
@@ -52,6 +227,8 @@ class ABTest:
             raise ValueError("mde must be greater than 0")
         if ratio <= 0:
             raise ValueError("ratio must be greater than 0")
+        if not (0 <= variance_reduction < 1):
+            raise ValueError("variance_reduction must be in [0, 1)")
 
         p1 = baseline_rate
         p2 = baseline_rate * (1 + mde)
@@ -66,23 +243,120 @@ class ABTest:
         p_pooled = (p1 + ratio * p2) / (1 + ratio)
 
         # Z-scores
-        z_alpha = stats.norm.ppf(1 - self.alpha / 2)
-        z_beta = stats.norm.ppf(self.power)
+        z_alpha = norm_ppf(1 - self.alpha / 2)
+        z_beta = norm_ppf(self.power)
 
         # Sample size calculation
         numerator = (
             z_alpha * np.sqrt(p_pooled * (1 - p_pooled) * (1 + 1 / ratio))
             + z_beta * np.sqrt(p1 * (1 - p1) + p2 * (1 - p2) / ratio)
-        ) ** 2
+        ) ** 2 * (1 - variance_reduction)
         denominator = (p2 - p1) ** 2
 
         n = int(np.ceil(numerator / denominator))
 
         return n
 
+    def calculate_sample_size_grid(
+        self, baseline_rate, mde, ratio=1.0, alpha=None, power=None, variance_reduction=0.0
+    ) -> np.ma.MaskedArray:
+        """
+        Calculate required sample sizes over broadcast parameter grids.
+
+        Parameters:
+        -----------
+        baseline_rate : float or array-like
+            Current conversion rate (between 0 and 1)
+        mde : float or array-like
+            Minimum detectable effect (relative change)
+        ratio : float or array-like
+            Ratio of treatment to control group size
+        alpha : float or array-like, optional
+            Significance level (defaults to this framework's alpha)
+        power : float or array-like, optional
+            Statistical power (defaults to this framework's power)
+        variance_reduction : float or array-like
+            Expected fraction of variance removed by CUPED
+
+        Returns:
+        --------
+        np.ma.MaskedArray : Sample size per group for every combination, with
+            invalid combinations masked instead of raising
+        """
+        return sample_size_grid(
+            baseline_rate,
+            mde,
+            ratio,
+            self.alpha if alpha is None else alpha,
+            self.power if power is None else power,
+            variance_reduction,
+        )
+
+    def calculate_power(self, sample_size, baseline_rate, mde, ratio=1.0) -> np.ma.MaskedArray:
+        """
+        Calculate the power achieved with a given sample size per group.
+
+        Parameters:
+        -----------
+        sample_size : int or array-like
+            Visitors in the control group
+        baseline_rate : float or array-like
+            Current conversion rate (between 0 and 1)
+        mde : float or array-like
+            Minimum detectable effect (relative change)
+        ratio : float or array-like
+            Ratio of treatment to control group size
+
+        Returns:
+        --------
+        np.ma.MaskedArray : Power for every combination, invalid ones masked
+        """
+        return power_grid(sample_size, baseline_rate, mde, ratio, self.alpha)
+
+    def calculate_mde(self, sample_size, baseline_rate, ratio=1.0) -> np.ma.MaskedArray:
+        """
+        Calculate the smallest relative effect detectable with a given sample size.
+
+        Parameters:
+        -----------
+        sample_size : int or array-like
+            Visitors in the control group
+        baseline_rate : float or array-like
+            Current conversion rate (between 0 and 1)
+        ratio : float or array-like
+            Ratio of treatment to control group size
+
+        Returns:
+        --------
+        np.ma.MaskedArray : Relative MDE for every combination, undetectable
+            ones masked
+        """
+        return mde_grid(sample_size, baseline_rate, ratio, self.alpha, self.power)
+
+    def calculate_duration(self, daily_traffic, baseline_rate, mde, ratio=1.0) -> np.ma.MaskedArray:
+        """
+        Calculate the number of days needed to reach the required sample size.
+
+        Parameters:
+        -----------
+        daily_traffic : float or array-like
+            Visitors entering the experiment per day, across both groups
+        baseline_rate : float or array-like
+            Current conversion rate (between 0 and 1)
+        mde : float or array-like
+            Minimum detectable effect (relative change)
+        ratio : float or array-like
+            Ratio of treatment to control group size
+
+        Returns:
+        --------
+        np.ma.MaskedArray : Whole days for every combination, invalid ones masked
+        """
+        return duration_grid(daily_traffic, baseline_rate, mde, ratio, self.alpha, self.power)
+
     def two_proportion_ztest(
         self, conversions_a: int, visitors_a: int, conversions_b: int, visitors_b: int
-    ) -> Dict:
+    ) -> ZTestResult:
         """
         Perform a two-proportion z-test for A/B testing.
 
@@ -99,28 +373,49 @@ class ABTest:
 
         Returns:
         --------
-        dict : Test results including p-value, confidence interval, and effect size
+        ZTestResult : Test results including p-value, confidence interval, and
+            effect size (a read-only mapping with the former dict keys)
         """
-        if visitors_a <= 0 or visitors_b <= 0:
-            raise ValueError("Number of visitors must be greater than 0")
-        if conversions_a < 0 or conversions_b < 0:
-            raise ValueError("Number of conversions cannot be negative")
-        if conversions_a > visitors_a or conversions_b > visitors_b:
-            raise ValueError("Conversions cannot exceed visitors")
+        instrumentation = self.instrumentation
+        instrumentation.count("calls.two_proportion_ztest")
+        with instrumentation.stage("validation"):
+            if visitors_a <= 0 or visitors_b <= 0:
+                raise ValueError("Number of visitors must be greater than 0")
+            if conversions_a < 0 or conversions_b < 0:
+                raise ValueError("Number of conversions cannot be negative")
+            if conversions_a > visitors_a or conversions_b > visitors_b:
+                raise ValueError("Conversions cannot exceed visitors")
+
+        if self.cache is None:
+            return self._two_proportion_ztest(conversions_a, visitors_a, conversions_b, visitors_b)
+        return self._cached(
+            self._cache_key(
+                "two_proportion_ztest", conversions_a, visitors_a, conversions_b, visitors_b
+            ),
+            lambda: self._two_proportion_ztest(
+                conversions_a, visitors_a, conversions_b, visitors_b
+            ),
+        )
 
+    def _two_proportion_ztest(
+        self, conversions_a: int, visitors_a: int, conversions_b: int, visitors_b: int
+    ) -> ZTestResult:
+        """
+        Two-proportion z-test on validated counts.
+        """
         # Handle edge case where both groups have zero conversions
         if conversions_a == 0 and conversions_b == 0:
-            return {
-                "conversion_rate_a": 0.0,
-                "conversion_rate_b": 0.0,
-                "absolute_difference": 0.0,
-                "relative_lift": 0.0,
-                "z_statistic": 0.0,
-                "p_value": 1.0,
-                "is_significant": False,
-                "confidence_interval": (0.0, 0.0),
-                "confidence_level": 1 - self.alpha,
-            }
+            return ZTestResult(
+                conversion_rate_a=0.0,
+                conversion_rate_b=0.0,
+                absolute_difference=0.0,
+                relative_lift=0.0,
+                z_statistic=0.0,
+                p_value=1.0,
+                is_significant=False,
+                confidence_interval=(0.0, 0.0),
+                confidence_level=1 - self.alpha,
+            )
 
         # Calculate proportions
         p_a = conversions_a / visitors_a
@@ -135,11 +430,12 @@ class ABTest:
         # Z-statistic
         z_stat = (p_b - p_a) / se
 
-        # P-value (two-tailed)
-        p_value = 2 * (1 - stats.norm.cdf(abs(z_stat)))
+        with self.instrumentation.stage("distribution"):
+            # P-value (two-tailed)
+            p_value = 2 * (1 - norm_cdf(abs(z_stat)))
 
-        # Confidence interval for the difference
-        z_critical = stats.norm.ppf(1 - self.alpha / 2)
+            # Confidence interval for the difference
+            z_critical = norm_ppf(1 - self.alpha / 2)
         se_diff = np.sqrt(p_a * (1 - p_a) / visitors_a + p_b * (1 - p_b) / visitors_b)
         ci_lower = (p_b - p_a) - z_critical * se_diff
         ci_upper = (p_b - p_a) + z_critical * se_diff
@@ -147,16 +443,389 @@ class ABTest:
         # Relative lift
         relative_lift = (p_b - p_a) / p_a if p_a > 0 else 0
 
+        results = ZTestResult(
+            conversion_rate_a=p_a,
+            conversion_rate_b=p_b,
+            absolute_difference=p_b - p_a,
+            relative_lift=relative_lift,
+            z_statistic=z_stat,
+            p_value=p_value,
+            is_significant=p_value < self.alpha,
+            confidence_interval=(ci_lower, ci_upper),
+            confidence_level=1 - self.alpha,
+        )
+
+        return results
+
+    def two_proportion_ztest_batch(
+        self, conversions_a, visitors_a=None, conversions_b=None, visitors_b=None
+    ) -> ResultSet:
+        """
+        Perform many two-proportion z-tests in a single vectorized pass.
+
+        Element ``i`` of every output array matches what
+        ``two_proportion_ztest`` returns for the ``i``-th set of counts,
+        including the zero-conversion and zero-baseline edge cases.
+
+        Parameters:
+        -----------
+        conversions_a : array-like, structured array or mapping
+            Conversions in group A. If the remaining arguments are omitted, this
+            is treated as a table (NumPy structured array or mapping of columns)
+            with fields ``conversions_a``, ``visitors_a``, ``conversions_b`` and
+            ``visitors_b``.
+        visitors_a : array-like, optional
+            Visitors in group A
+        conversions_b : array-like, optional
+            Conversions in group B
+        visitors_b : array-like, optional
+            Visitors in group B
+
+        Returns:
+        --------
+        ResultSet : Columnar results; every column is an ndarray with one
+            entry per test, and ``confidence_level`` is a constant
+        """
+        instrumentation = self.instrumentation
+        instrumentation.count("calls.two_proportion_ztest_batch")
+        if visitors_a is None and conversions_b is None and visitors_b is None:
+            table = conversions_a
+            conversions_a = table["conversions_a"]
+            visitors_a = table["visitors_a"]
+            conversions_b = table["conversions_b"]
+            visitors_b = table["visitors_b"]
+        elif visitors_a is None or conversions_b is None or visitors_b is None:
+            raise ValueError("Pass either all four count arrays or a single table of counts")
+
+        # Scalar counts give a one-row result
+        conversions_a, visitors_a, conversions_b, visitors_b = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(conversions_a, dtype=np.float64)),
+            np.atleast_1d(np.asarray(visitors_a, dtype=np.float64)),
+            np.atleast_1d(np.asarray(conversions_b, dtype=np.float64)),
+            np.atleast_1d(np.asarray(visitors_b, dtype=np.float64)),
+        )
+
+        with instrumentation.stage("validation"):
+            if np.any(visitors_a <= 0) or np.any(visitors_b <= 0):
+                raise ValueError("Number of visitors must be greater than 0")
+            if np.any(conversions_a < 0) or np.any(conversions_b < 0):
+                raise ValueError("Number of conversions cannot be negative")
+            if np.any(conversions_a > visitors_a) or np.any(conversions_b > visitors_b):
+                raise ValueError("Conversions cannot exceed visitors")
+        instrumentation.count("tests_evaluated", conversions_a.size)
+
+        # Both groups with zero conversions are reported as "no effect"
+        both_zero = (conversions_a == 0) & (conversions_b == 0)
+
+        p_a = conversions_a / visitors_a
+        p_b = conversions_b / visitors_b
+        diff = p_b - p_a
+
+        p_pooled = (conversions_a + conversions_b) / (visitors_a + visitors_b)
+        se = np.sqrt(p_pooled * (1 - p_pooled) * (1 / visitors_a + 1 / visitors_b))
+
+        # se == 0 happens when both groups convert fully; the scalar path
+        # yields nan there, so keep the same values without the warnings.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_stat = diff / se
+            relative_lift = np.where(p_a > 0, diff / np.where(p_a > 0, p_a, 1.0), 0.0)
+        z_stat = np.where(both_zero, 0.0, z_stat)
+
+        with instrumentation.stage("distribution"):
+            p_value = 2 * (1 - norm_cdf(np.abs(z_stat)))
+            z_critical = norm_ppf(1 - self.alpha / 2)
+
+        se_diff = np.sqrt(p_a * (1 - p_a) / visitors_a + p_b * (1 - p_b) / visitors_b)
+        ci_lower = diff - z_critical * se_diff
+        ci_upper = diff + z_critical * se_diff
+
+        results = ResultSet(
+            {
+                "conversion_rate_a": p_a,
+                "conversion_rate_b": p_b,
+                "absolute_difference": diff,
+                "relative_lift": relative_lift,
+                "z_statistic": z_stat,
+                "p_value": p_value,
+                "is_significant": p_value < self.alpha,
+                "ci_lower": ci_lower,
+                "ci_upper": ci_upper,
+                "confidence_level": 1 - self.alpha,
+            }
+        )
+
+        return results
+
+    def welch_ttest(self, stats_a, stats_b) -> Dict:
+        """
+        Perform Welch's t-test for a continuous metric.
+
+        Parameters:
+        -----------
+        stats_a : SufficientStats or array-like
+            Sufficient statistics (or raw values) of group A (control)
+        stats_b : SufficientStats or array-like
+            Sufficient statistics (or raw values) of group B (treatment)
+
+        Returns:
+        --------
+        dict : Test results including p-value, confidence interval, and effect size
+        """
+        self.instrumentation.count("calls.welch_ttest")
+        if not isinstance(stats_a, SufficientStats):
+            stats_a = SufficientStats.from_values(stats_a)
+        if not isinstance(stats_b, SufficientStats):
+            stats_b = SufficientStats.from_values(stats_b)
+        if stats_a.count < 2 or stats_b.count < 2:
+            raise ValueError("Each group needs at least two observations")
+
+        var_a = stats_a.variance / stats_a.count
+        var_b = stats_b.variance / stats_b.count
+        diff = stats_b.mean - stats_a.mean
+        se = np.sqrt(var_a + var_b)
+
+        if se > 0:
+            t_stat = diff / se
+            # Welch-Satterthwaite degrees of freedom
+            df = (var_a + var_b) ** 2 / (
+                var_a**2 / (stats_a.count - 1) + var_b**2 / (stats_b.count - 1)
+            )
+            from scipy import stats
+
+            with self.instrumentation.stage("distribution"):
+                p_value = 2 * stats.t.sf(abs(t_stat), df)
+                t_critical = stats.t.ppf(1 - self.alpha / 2, df)
+        else:
+            # Both groups are constant
+            df = float(stats_a.count + stats_b.count - 2)
+            t_stat = 0.0 if diff == 0 else np.copysign(np.inf, diff)
+            p_value = 1.0 if diff == 0 else 0.0
+            t_critical = 0.0
+
+        relative_lift = diff / stats_a.mean if stats_a.mean != 0 else 0
+
         results = {
-            "conversion_rate_a": p_a,
-            "conversion_rate_b": p_b,
-            "absolute_difference": p_b - p_a,
+            "mean_a": stats_a.mean,
+            "mean_b": stats_b.mean,
+            "absolute_difference": diff,
             "relative_lift": relative_lift,
-            "z_statistic": z_stat,
+            "t_statistic": t_stat,
+            "degrees_of_freedom": df,
             "p_value": p_value,
             "is_significant": p_value < self.alpha,
+            "confidence_interval": (diff - t_critical * se, diff + t_critical * se),
+            "confidence_level": 1 - self.alpha,
+        }
+
+        return results
+
+    def cuped_test(self, stats_a, stats_b) -> Dict:
+        """
+        Perform a CUPED (regression-adjusted) test using a pre-experiment covariate.
+
+        The adjustment coefficient theta = cov(y, x) / var(x) is estimated on
+        both groups pooled, and Welch's t-test is run on the adjusted metric
+        y - theta * (x - mean(x)).
+
+        Parameters:
+        -----------
+        stats_a : CovariateStats or tuple of (y, x) arrays
+            Metric and covariate moments of group A (control)
+        stats_b : CovariateStats or tuple of (y, x) arrays
+            Metric and covariate moments of group B (treatment)
+
+        Returns:
+        --------
+        dict : ``welch_ttest`` results on the adjusted metric, plus ``theta``
+            and the achieved ``variance_reduction``
+        """
+        self.instrumentation.count("calls.cuped_test")
+        with self.instrumentation.stage("validation"):
+            if not isinstance(stats_a, CovariateStats):
+                stats_a = CovariateStats.from_values(*stats_a)
+            if not isinstance(stats_b, CovariateStats):
+                stats_b = CovariateStats.from_values(*stats_b)
+
+        theta = cuped_theta(stats_a, stats_b)
+        pooled = stats_a.copy().merge(stats_b)
+        adjusted_a = stats_a.adjusted(theta, pooled.mean_x)
+        adjusted_b = stats_b.adjusted(theta, pooled.mean_x)
+
+        results = self.welch_ttest(adjusted_a, adjusted_b)
+
+        raw_m2 = stats_a.m2_y + stats_b.m2_y
+        results["theta"] = theta
+        results["variance_reduction"] = (
+            1 - (adjusted_a.m2 + adjusted_b.m2) / raw_m2 if raw_m2 > 0 else 0.0
+        )
+
+        return results
+
+    def bootstrap_test(
+        self,
+        values_a,
+        values_b,
+        n_replicates: int = 2000,
+        method: str = "bca",
+        seed=None,
+        max_workers: Optional[int] = 1,
+    ) -> Dict:
+        """
+        Compare means with a Poisson-bootstrap confidence interval.
+
+        Parameters:
+        -----------
+        values_a : array-like
+            Observations of group A (control)
+        values_b : array-like
+            Observations of group B (treatment)
+        n_replicates : int
+            Number of bootstrap replicates
+        method : str
+            "percentile" or "bca" (bias-corrected and accelerated)
+        seed : None, int or np.random.SeedSequence, optional
+            Seed of the replicate weights (defaults to a stream derived from
+            this framework's seed)
+        max_workers : int, optional
+            Worker processes used for the replicate blocks
+
+        Returns:
+        --------
+        dict : Means, difference, bootstrap interval and standard error; the
+            difference is significant when the interval excludes zero
+        """
+        instrumentation = self.instrumentation
+        instrumentation.count("calls.bootstrap_test")
+        with instrumentation.stage("validation"):
+            if method not in INTERVAL_METHODS:
+                raise ValueError(f"method must be one of {INTERVAL_METHODS}")
+        if seed is None and self.random_streams.seeded:
+            seed = self.random_streams.child_sequence("bootstrap")
+        with PoissonBootstrap(
+            n_replicates,
+            seed=seed,
+            bit_generator=self.random_streams.bit_generator,
+            max_workers=max_workers,
+        ) as bootstrap:
+            with instrumentation.stage("rng"):
+                bootstrap.update("a", values_a)
+                bootstrap.update("b", values_b)
+
+        with instrumentation.stage("percentile"):
+            ci_lower, ci_upper = bootstrap.confidence_interval(1 - self.alpha, method)
+        replicates = bootstrap.replicates()
+        mean_a = bootstrap.mean("a")
+        diff = bootstrap.estimate
+
+        results = {
+            "mean_a": mean_a,
+            "mean_b": bootstrap.mean("b"),
+            "absolute_difference": diff,
+            "relative_lift": diff / mean_a if mean_a != 0 else 0,
+            "standard_error": float(replicates.std(ddof=1)),
+            "is_significant": bool(ci_lower > 0 or ci_upper < 0),
             "confidence_interval": (ci_lower, ci_upper),
             "confidence_level": 1 - self.alpha,
+            "method": method,
+            "n_replicates": int(replicates.size),
+        }
+
+        return results
+
+    def mann_whitney_test(self, counts_a, counts_b, bin_values=None) -> Dict:
+        """
+        Perform a Mann-Whitney U test on pre-binned histograms.
+
+        Observations in the same bin are treated as ties, so the test runs in
+        O(number of bins) regardless of the number of users.
+
+        Parameters:
+        -----------
+        counts_a : array-like
+            Observations of group A per ordered bin
+        counts_b : array-like
+            Observations of group B per the same bins
+        bin_values : array-like, optional
+            Representative value of each bin, used for the means, difference
+            and lift (defaults to the bin index)
+
+        Returns:
+        --------
+        dict : Test results; the confidence interval is for the probability
+            of superiority P(B > A) + P(B = A) / 2, with DeLong's standard error
+        """
+        instrumentation = self.instrumentation
+        instrumentation.count("calls.mann_whitney_test")
+        counts_a = np.asarray(counts_a, dtype=np.float64)
+        counts_b = np.asarray(counts_b, dtype=np.float64)
+        with instrumentation.stage("validation"):
+            if counts_a.ndim != 1 or counts_a.shape != counts_b.shape:
+                raise ValueError("counts_a and counts_b must be 1-D arrays of equal length")
+            if np.any(counts_a < 0) or np.any(counts_b < 0):
+                raise ValueError("Bin counts cannot be negative")
+            n_a = counts_a.sum()
+            n_b = counts_b.sum()
+            if n_a == 0 or n_b == 0:
+                raise ValueError("Each group needs at least one observation")
+            if bin_values is None:
+                bin_values = np.arange(counts_a.size, dtype=np.float64)
+            bin_values = np.asarray(bin_values, dtype=np.float64)
+            if bin_values.shape != counts_a.shape:
+                raise ValueError("bin_values must have one value per bin")
+
+        # U for B: pairs where B is above A, counting ties within a bin as half
+        a_below = np.cumsum(counts_a) - counts_a
+        u_stat = float(np.sum(counts_b * (a_below + 0.5 * counts_a)))
+
+        n = n_a + n_b
+        ties = counts_a + counts_b
+        tie_term = np.sum(ties**3 - ties) / (n * (n - 1)) if n > 1 else 0.0
+        var_u = n_a * n_b / 12 * ((n + 1) - tie_term)
+        mean_u = n_a * n_b / 2
+
+        with instrumentation.stage("distribution"):
+            if var_u > 0:
+                # Continuity-corrected normal approximation
+                z_stat = (u_stat - mean_u - np.sign(u_stat - mean_u) * 0.5) / np.sqrt(var_u)
+                p_value = min(2 * norm_sf(abs(z_stat)), 1.0)
+            else:
+                z_stat = 0.0
+                p_value = 1.0
+            z_critical = norm_ppf(1 - self.alpha / 2)
+
+        superiority = u_stat / (n_a * n_b)
+        # DeLong variance: spread of each observation's placement value (its
+        # share of wins against the other group), which unlike the null
+        # variance of U stays valid when the groups differ
+        placement_a = (n_b - np.cumsum(counts_b) + 0.5 * counts_b) / n_b
+        placement_b = (a_below + 0.5 * counts_a) / n_a
+        variance = 0.0
+        if n_a > 1:
+            variance += np.dot(counts_a, (placement_a - superiority) ** 2) / (n_a - 1) / n_a
+        if n_b > 1:
+            variance += np.dot(counts_b, (placement_b - superiority) ** 2) / (n_b - 1) / n_b
+        se_superiority = float(np.sqrt(variance))
+
+        mean_a = float(np.dot(counts_a, bin_values) / n_a)
+        mean_b = float(np.dot(counts_b, bin_values) / n_b)
+        diff = mean_b - mean_a
+        relative_lift = diff / mean_a if mean_a != 0 else 0
+
+        results = {
+            "mean_a": mean_a,
+            "mean_b": mean_b,
+            "absolute_difference": diff,
+            "relative_lift": relative_lift,
+            "u_statistic": u_stat,
+            "probability_of_superiority": superiority,
+            "z_statistic": z_stat,
+            "p_value": p_value,
+            "is_significant": p_value < self.alpha,
+            "confidence_interval": (
+                max(superiority - z_critical * se_superiority, 0.0),
+                min(superiority + z_critical * se_superiority, 1.0),
+            ),
+            "confidence_level": 1 - self.alpha,
         }
 
         return results
@@ -168,7 +837,14 @@ class ABTest:
         conversions_b: int,
         visitors_b: int,
         n_simulations: int = 100000,
-    ) -> Dict:
+        method: str = "monte_carlo",
+        rng: Optional[np.random.Generator] = None,
+        seed=None,
+        key: Optional[Hashable] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        tolerance: Optional[float] = None,
+        prior: Optional[BetaPosterior] = None,
+    ) -> BayesianResult:
         """
         Perform Bayesian A/B test using Beta distributions.
 
@@ -183,56 +859,577 @@ class ABTest:
         visitors_b : int
             Number of visitors in group B
         n_simulations : int
-            Number of Monte Carlo simulations
+            Number of Monte Carlo simulations (ignored when method="exact")
+        method : str
+            "monte_carlo" to estimate the results from posterior draws, or
+            "exact" to compute them deterministically from the Beta posteriors
+        rng : np.random.Generator, optional
+            Generator used for the Monte Carlo draws
+        seed : int or np.random.SeedSequence, optional
+            Seed for this call only
+        key : hashable, optional
+            Experiment key selecting an independent, reproducible stream
+        chunk_size : int
+            Posterior draws per arm held in memory at once. Larger runs are
+            accumulated chunk by chunk, so memory does not grow with
+            n_simulations; credible intervals then come from the exact
+            posterior quantiles instead of sample percentiles.
+        tolerance : float, optional
+            Stop drawing once the Monte Carlo standard error of every reported
+            probability and expected loss is at most this value (checked after
+            each chunk)
+        prior : BetaPosterior, optional
+            Prior shared by both arms (defaults to the uniform Beta(1, 1)),
+            e.g. ``BetaPosterior.from_baseline(rate, strength)`` built from a
+            historical baseline
 
         Returns:
         --------
-        dict : Bayesian test results
+        BayesianResult : Bayesian test results (a mapping with the former
+            dict keys); Monte Carlo results also report the number of
+            simulations used and their standard error
         """
-        if visitors_a <= 0 or visitors_b <= 0:
-            raise ValueError("Number of visitors must be greater than 0")
-        if conversions_a < 0 or conversions_b < 0:
-            raise ValueError("Number of conversions cannot be negative")
-        if conversions_a > visitors_a or conversions_b > visitors_b:
-            raise ValueError("Conversions cannot exceed visitors")
+        instrumentation = self.instrumentation
+        instrumentation.count("calls.bayesian_ab_test")
+        with instrumentation.stage("validation"):
+            if method not in ("monte_carlo", "exact"):
+                raise ValueError("method must be 'monte_carlo' or 'exact'")
+            if n_simulations <= 0:
+                raise ValueError("n_simulations must be greater than 0")
+            if chunk_size <= 0:
+                raise ValueError("chunk_size must be greater than 0")
+            if tolerance is not None and tolerance <= 0:
+                raise ValueError("tolerance must be greater than 0")
+            if prior is not None and not isinstance(prior, BetaPosterior):
+                raise ValueError("prior must be a BetaPosterior")
+            if visitors_a <= 0 or visitors_b <= 0:
+                raise ValueError("Number of visitors must be greater than 0")
+            if conversions_a < 0 or conversions_b < 0:
+                raise ValueError("Number of conversions cannot be negative")
+            if conversions_a > visitors_a or conversions_b > visitors_b:
+                raise ValueError("Conversions cannot exceed visitors")
 
-        # Prior: Beta(1, 1) - uniform prior
-        alpha_prior = 1
-        beta_prior = 1
+        args = (
+            conversions_a,
+            visitors_a,
+            conversions_b,
+            visitors_b,
+            n_simulations,
+            method,
+            chunk_size,
+            tolerance,
+            prior if prior is not None else BetaPosterior(),
+        )
+        if self.cache is None or rng is not None:
+            return self._bayesian_ab_test(*args, rng, seed, key)
+        prior_params = (args[-1].alpha, args[-1].beta)
+        if method == "exact":
+            # Exact results depend on neither the simulation settings nor the RNG
+            cache_key = self._cache_key(
+                "bayesian_ab_test", *args[:4], None, method, None, None, prior_params, None, None
+            )
+        else:
+            cache_key = self._cache_key(
+                "bayesian_ab_test", *args[:-1], prior_params, seed, key
+            )
+        return self._cached(cache_key, lambda: self._bayesian_ab_test(*args, rng, seed, key))
 
+    def _bayesian_ab_test(
+        self,
+        conversions_a: int,
+        visitors_a: int,
+        conversions_b: int,
+        visitors_b: int,
+        n_simulations: int,
+        method: str,
+        chunk_size: int,
+        tolerance: Optional[float],
+        prior: BetaPosterior,
+        rng: Optional[np.random.Generator],
+        seed,
+        key: Optional[Hashable],
+    ) -> BayesianResult:
+        """
+        Bayesian A/B test on validated counts.
+        """
         # Posterior distributions
-        alpha_a = alpha_prior + conversions_a
-        beta_a = beta_prior + (visitors_a - conversions_a)
+        posterior_a = prior.copy().update(conversions_a, visitors_a)
+        posterior_b = prior.copy().update(conversions_b, visitors_b)
 
-        alpha_b = alpha_prior + conversions_b
-        beta_b = beta_prior + (visitors_b - conversions_b)
+        if method == "exact":
+            return self._bayesian_exact(posterior_a, posterior_b)
 
         # Sample from posterior distributions
-        rng = np.random.default_rng()
-        samples_a = rng.beta(alpha_a, beta_a, n_simulations)
-        samples_b = rng.beta(alpha_b, beta_b, n_simulations)
+        rng = self._resolve_rng(
+            rng,
+            seed,
+            key,
+            (
+                "bayesian_ab_test",
+                int(conversions_a),
+                int(visitors_a),
+                int(conversions_b),
+                int(visitors_b),
+                int(n_simulations),
+            ),
+        )
+        return self._bayesian_monte_carlo(
+            rng, posterior_a, posterior_b, n_simulations, chunk_size, tolerance
+        )
 
-        # Probability that B is better than A
-        prob_b_better = np.mean(samples_b > samples_a)
+    def _bayesian_monte_carlo(
+        self,
+        rng: np.random.Generator,
+        posterior_a,
+        posterior_b,
+        n_simulations: int,
+        chunk_size: int,
+        tolerance: Optional[float],
+    ) -> BayesianResult:
+        """
+        Monte Carlo comparison of two posteriors in fixed-size chunks.
 
-        # Expected loss
-        expected_loss_b = np.mean(np.maximum(samples_a - samples_b, 0))
-        expected_loss_a = np.mean(np.maximum(samples_b - samples_a, 0))
+        Only running sums are kept between chunks. A run that fits in one
+        chunk takes the credible intervals from the sample percentiles; longer
+        runs use the exact posterior quantiles, since binned draws can miss
+        skewed tails by a bin width.
+        """
+        instrumentation = self.instrumentation
+        single_chunk = n_simulations <= chunk_size
 
-        # Credible intervals
-        ci_a = np.percentile(samples_a, [2.5, 97.5])
-        ci_b = np.percentile(samples_b, [2.5, 97.5])
+        drawn = 0
+        b_better = 0
+        loss_b = loss_b_sq = loss_a = loss_a_sq = 0.0
+        sum_a = sum_b = 0.0
+        standard_error = np.inf
+        while drawn < n_simulations:
+            size = min(chunk_size, n_simulations - drawn)
+            with instrumentation.stage("rng"):
+                samples_a = posterior_a.sample(rng, size)
+                samples_b = posterior_b.sample(rng, size)
+            instrumentation.count("samples_drawn", 2 * size)
 
-        results = {
-            "prob_b_better_than_a": prob_b_better,
-            "prob_a_better_than_b": 1 - prob_b_better,
-            "expected_loss_choosing_b": expected_loss_b,
-            "expected_loss_choosing_a": expected_loss_a,
-            "credible_interval_a": ci_a,
-            "credible_interval_b": ci_b,
-            "posterior_mean_a": np.mean(samples_a),
-            "posterior_mean_b": np.mean(samples_b),
-        }
+            diff = samples_b - samples_a
+            b_better += int(np.count_nonzero(diff > 0))
+            gain = np.maximum(diff, 0)
+            loss_a += float(gain.sum())
+            loss_a_sq += float(gain @ gain)
+            np.maximum(-diff, 0, out=gain)
+            loss_b += float(gain.sum())
+            loss_b_sq += float(gain @ gain)
+            sum_a += float(samples_a.sum())
+            sum_b += float(samples_b.sum())
+            drawn += size
+
+            if single_chunk:
+                with instrumentation.stage("percentile"):
+                    ci_a = np.percentile(samples_a, [2.5, 97.5])
+                    ci_b = np.percentile(samples_b, [2.5, 97.5])
+
+            # Standard errors of the probability and of both expected losses
+            prob = b_better / drawn
+            standard_error = np.sqrt(
+                max(
+                    prob * (1 - prob),
+                    loss_a_sq / drawn - (loss_a / drawn) ** 2,
+                    loss_b_sq / drawn - (loss_b / drawn) ** 2,
+                    0.0,
+                )
+                / drawn
+            )
+            if tolerance is not None and standard_error <= tolerance:
+                break
+
+        if not single_chunk:
+            with instrumentation.stage("percentile"):
+                ci_a = posterior_a.credible_interval(0.95)
+                ci_b = posterior_b.credible_interval(0.95)
+
+        prob_b_better = b_better / drawn
+
+        results = BayesianResult(
+            prob_b_better_than_a=prob_b_better,
+            prob_a_better_than_b=1 - prob_b_better,
+            expected_loss_choosing_b=loss_b / drawn,
+            expected_loss_choosing_a=loss_a / drawn,
+            credible_interval_a=ci_a,
+            credible_interval_b=ci_b,
+            posterior_mean_a=sum_a / drawn,
+            posterior_mean_b=sum_b / drawn,
+            n_simulations=drawn,
+            monte_carlo_standard_error=standard_error,
+        )
+
+        return results
+
+    def _bayesian_exact(
+        self, posterior_a: BetaPosterior, posterior_b: BetaPosterior
+    ) -> BayesianResult:
+        """
+        Closed-form Bayesian results for Beta posteriors A and B.
+        """
+        alpha_a, beta_a = posterior_a.alpha, posterior_a.beta
+        alpha_b, beta_b = posterior_b.alpha, posterior_b.beta
+        mean_a = posterior_a.mean
+        mean_b = posterior_b.mean
+
+        with self.instrumentation.stage("distribution"):
+            prob_b_better = _prob_beta_greater(alpha_b, beta_b, alpha_a, beta_a)
+
+            # E[max(A - B, 0)] = E[A; A > B] - E[B; A > B], and E[A; A > B]
+            # equals mean_a * P(A' > B) with A' ~ Beta(alpha_a + 1, beta_a).
+            expected_loss_b = mean_a * _prob_beta_greater(
+                alpha_a + 1, beta_a, alpha_b, beta_b
+            ) - mean_b * _prob_beta_greater(alpha_a, beta_a, alpha_b + 1, beta_b)
+            expected_loss_a = mean_b * _prob_beta_greater(
+                alpha_b + 1, beta_b, alpha_a, beta_a
+            ) - mean_a * _prob_beta_greater(alpha_b, beta_b, alpha_a + 1, beta_a)
+            credible_interval_a = posterior_a.quantile([0.025, 0.975])
+            credible_interval_b = posterior_b.quantile([0.025, 0.975])
+
+        results = BayesianResult(
+            prob_b_better_than_a=prob_b_better,
+            prob_a_better_than_b=1 - prob_b_better,
+            expected_loss_choosing_b=max(expected_loss_b, 0.0),
+            expected_loss_choosing_a=max(expected_loss_a, 0.0),
+            credible_interval_a=credible_interval_a,
+            credible_interval_b=credible_interval_b,
+            posterior_mean_a=mean_a,
+            posterior_mean_b=mean_b,
+        )
+
+        return results
+
+    def _bayesian_exact_batch(
+        self, conversions_a, visitors_a, conversions_b, visitors_b
+    ) -> List[BayesianResult]:
+        """
+        ``bayesian_ab_test(method="exact")`` under the uniform prior for many
+        validated experiments at once.
+        """
+        conversions_a, visitors_a, conversions_b, visitors_b = (
+            np.asarray(v, dtype=np.float64)
+            for v in (conversions_a, visitors_a, conversions_b, visitors_b)
+        )
+        alpha_a = 1.0 + conversions_a
+        beta_a = 1.0 + visitors_a - conversions_a
+        alpha_b = 1.0 + conversions_b
+        beta_b = 1.0 + visitors_b - conversions_b
+        mean_a = alpha_a / (alpha_a + beta_a)
+        mean_b = alpha_b / (alpha_b + beta_b)
+        self.instrumentation.count("tests_evaluated", alpha_a.size)
+
+        with self.instrumentation.stage("distribution"):
+            from scipy import special
+
+            prob_b_better = _prob_beta_greater_batch(alpha_b, beta_b, alpha_a, beta_a)
+            expected_loss_b = mean_a * _prob_beta_greater_batch(
+                alpha_a + 1, beta_a, alpha_b, beta_b
+            ) - mean_b * _prob_beta_greater_batch(alpha_a, beta_a, alpha_b + 1, beta_b)
+            expected_loss_a = mean_b * _prob_beta_greater_batch(
+                alpha_b + 1, beta_b, alpha_a, beta_a
+            ) - mean_a * _prob_beta_greater_batch(alpha_b, beta_b, alpha_a + 1, beta_a)
+            levels = np.array([0.025, 0.975])
+            intervals_a = special.betaincinv(alpha_a[:, None], beta_a[:, None], levels)
+            intervals_b = special.betaincinv(alpha_b[:, None], beta_b[:, None], levels)
+
+        return [
+            BayesianResult(
+                prob_b_better_than_a=float(prob_b_better[i]),
+                prob_a_better_than_b=1 - float(prob_b_better[i]),
+                expected_loss_choosing_b=max(float(expected_loss_b[i]), 0.0),
+                expected_loss_choosing_a=max(float(expected_loss_a[i]), 0.0),
+                credible_interval_a=intervals_a[i],
+                credible_interval_b=intervals_b[i],
+                posterior_mean_a=float(mean_a[i]),
+                posterior_mean_b=float(mean_b[i]),
+            )
+            for i in range(alpha_a.size)
+        ]
+
+    def compare_posteriors(
+        self,
+        posterior_a,
+        posterior_b,
+        n_simulations: int = 100000,
+        method: str = "monte_carlo",
+        rng: Optional[np.random.Generator] = None,
+        seed=None,
+        key: Optional[Hashable] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        tolerance: Optional[float] = None,
+    ) -> BayesianResult:
+        """
+        Compare two stored posteriors without re-deriving them from counts.
+
+        Parameters:
+        -----------
+        posterior_a : BetaPosterior, GammaPosterior or NormalInverseGammaPosterior
+            Posterior of group A (control)
+        posterior_b : same family as posterior_a
+            Posterior of group B (treatment)
+        n_simulations : int
+            Number of Monte Carlo simulations (ignored when method="exact")
+        method : str
+            "monte_carlo", or "exact" (Beta posteriors only)
+        rng : np.random.Generator, optional
+            Generator used for the Monte Carlo draws
+        seed : int or np.random.SeedSequence, optional
+            Seed for this call only
+        key : hashable, optional
+            Experiment key selecting an independent, reproducible stream
+        chunk_size : int
+            Posterior draws per arm held in memory at once
+        tolerance : float, optional
+            Monte Carlo standard error at which drawing stops early
+
+        Returns:
+        --------
+        BayesianResult : Same fields as ``bayesian_ab_test``, for the
+            conversion rate, event rate or metric mean depending on the family
+        """
+        instrumentation = self.instrumentation
+        instrumentation.count("calls.compare_posteriors")
+        with instrumentation.stage("validation"):
+            if type(posterior_a) is not type(posterior_b):
+                raise ValueError("Both posteriors must belong to the same family")
+            if method not in ("monte_carlo", "exact"):
+                raise ValueError("method must be 'monte_carlo' or 'exact'")
+            if method == "exact" and not isinstance(posterior_a, BetaPosterior):
+                raise ValueError("method='exact' is only available for Beta posteriors")
+            if method == "monte_carlo" and n_simulations <= 0:
+                raise ValueError("n_simulations must be greater than 0")
+            if method == "monte_carlo" and chunk_size <= 0:
+                raise ValueError("chunk_size must be greater than 0")
+        if method == "exact":
+            return self._bayesian_exact(posterior_a, posterior_b)
+
+        rng = self._resolve_rng(
+            rng,
+            seed,
+            key,
+            (
+                "compare_posteriors",
+                tuple(posterior_a.to_dict().items()),
+                tuple(posterior_b.to_dict().items()),
+                n_simulations,
+            ),
+        )
+        return self._bayesian_monte_carlo(
+            rng, posterior_a, posterior_b, n_simulations, chunk_size, tolerance
+        )
+
+    def multi_arm_ztest(self, conversions, visitors, correction: str = "holm") -> ResultSet:
+        """
+        Perform all pairwise two-proportion z-tests for an A/B/n experiment.
+
+        Parameters:
+        -----------
+        conversions : array-like
+            Number of conversions per arm
+        visitors : array-like
+            Number of visitors per arm
+        correction : str
+            Multiple-comparison correction applied to the pairwise p-values
+            ("none", "bonferroni", "holm" or "fdr_bh")
+
+        Returns:
+        --------
+        ResultSet : Columnar results with one entry per pair (i, j), i < j,
+            where arm i plays the role of group A and arm j of group B
+        """
+        instrumentation = self.instrumentation
+        instrumentation.count("calls.multi_arm_ztest")
+        conversions = np.asarray(conversions)
+        visitors = np.asarray(visitors)
+        with instrumentation.stage("validation"):
+            if conversions.ndim != 1 or conversions.shape != visitors.shape:
+                raise ValueError("conversions and visitors must be 1-D arrays of equal length")
+            if conversions.size < 2:
+                raise ValueError("At least two arms are required")
+
+        arm_a, arm_b = np.triu_indices(conversions.size, k=1)
+        results = self.two_proportion_ztest_batch(
+            conversions[arm_a], visitors[arm_a], conversions[arm_b], visitors[arm_b]
+        )
+
+        with instrumentation.stage("correction"):
+            p_adjusted = adjust_pvalues(results["p_value"], correction)
+        results["arm_a"] = arm_a
+        results["arm_b"] = arm_b
+        results["p_value_adjusted"] = p_adjusted
+        results["is_significant"] = p_adjusted < self.alpha
+        results["correction"] = correction
+
+        return results
+
+    def segment_ztest(
+        self,
+        arms,
+        converted,
+        segments,
+        by=None,
+        correction: str = "fdr_bh",
+        min_visitors: int = 1,
+    ) -> ResultSet:
+        """
+        Perform two-proportion z-tests on every segment slice of an experiment.
+
+        Counts for all slices are aggregated from per-unit arrays with integer
+        group keys and ``np.bincount`` (only observed combinations are
+        materialized), tested with one ``two_proportion_ztest_batch`` call and
+        corrected for multiple comparisons across all slices.
+
+        Parameters:
+        -----------
+        arms : array-like
+            Arm of each unit (0 = group A, 1 = group B)
+        converted : array-like
+            Whether each unit converted (0/1 or bool)
+        segments : mapping of str to array-like
+            Segment value of each unit per dimension, e.g. country or platform
+        by : sequence of sequences of str, optional
+            Groupings to slice by (defaults to every non-empty combination of
+            the dimensions; an empty grouping is the overall experiment)
+        correction : str
+            Multiple-comparison correction across slices
+            ("none", "bonferroni", "holm" or "fdr_bh")
+        min_visitors : int
+            Slices with fewer visitors in either arm are not tested; their
+            statistics are NaN and they do not count towards the correction
+
+        Returns:
+        --------
+        ResultSet : Columnar results with one entry per slice: the columns of
+            ``segment_counts``, the ``two_proportion_ztest_batch`` columns,
+            ``tested``, ``p_value_adjusted`` and ``correction``
+        """
+        if min_visitors < 1:
+            raise ValueError("min_visitors must be at least 1")
+        self.instrumentation.count("calls.segment_ztest")
+
+        with self.instrumentation.stage("aggregation"):
+            counts = segment_counts(arms, converted, segments, by)
+        tested = (counts["visitors_a"] >= min_visitors) & (counts["visitors_b"] >= min_visitors)
+
+        batch = self.two_proportion_ztest_batch(
+            counts["conversions_a"][tested],
+            counts["visitors_a"][tested],
+            counts["conversions_b"][tested],
+            counts["visitors_b"][tested],
+        )
+
+        results = ResultSet(counts)
+        for name, values in batch.items():
+            if not isinstance(values, np.ndarray):
+                results[name] = values
+            elif values.dtype == bool:
+                column = np.zeros(tested.size, dtype=bool)
+                column[tested] = values
+                results[name] = column
+            else:
+                column = np.full(tested.size, np.nan)
+                column[tested] = values
+                results[name] = column
+
+        p_adjusted = adjust_pvalues(results["p_value"], correction)
+        results["tested"] = tested
+        results["p_value_adjusted"] = p_adjusted
+        results["is_significant"] = np.nan_to_num(p_adjusted, nan=1.0) < self.alpha
+        results["correction"] = correction
+
+        return results
+
+    def bayesian_multi_arm_test(
+        self,
+        conversions,
+        visitors,
+        n_simulations: int = 100000,
+        rng: Optional[np.random.Generator] = None,
+        seed=None,
+        key: Optional[Hashable] = None,
+        prior: Optional[BetaPosterior] = None,
+    ) -> ResultSet:
+        """
+        Perform a Bayesian A/B/n test from one shared posterior sample matrix.
+
+        Parameters:
+        -----------
+        conversions : array-like
+            Number of conversions per arm
+        visitors : array-like
+            Number of visitors per arm
+        n_simulations : int
+            Number of Monte Carlo simulations
+        rng : np.random.Generator, optional
+            Generator used for the Monte Carlo draws
+        seed : int or np.random.SeedSequence, optional
+            Seed for this call only
+        key : hashable, optional
+            Experiment key selecting an independent, reproducible stream
+        prior : BetaPosterior, optional
+            Prior shared by every arm (defaults to the uniform Beta(1, 1))
+
+        Returns:
+        --------
+        ResultSet : Per-arm columns of P(arm is best), expected loss of
+            choosing the arm, posterior means and 95% credible intervals
+            (shape (k, 2))
+        """
+        instrumentation = self.instrumentation
+        instrumentation.count("calls.bayesian_multi_arm_test")
+        conversions = np.asarray(conversions)
+        visitors = np.asarray(visitors)
+        with instrumentation.stage("validation"):
+            if conversions.ndim != 1 or conversions.shape != visitors.shape:
+                raise ValueError("conversions and visitors must be 1-D arrays of equal length")
+            if conversions.size < 2:
+                raise ValueError("At least two arms are required")
+            if n_simulations <= 0:
+                raise ValueError("n_simulations must be greater than 0")
+            if np.any(visitors <= 0):
+                raise ValueError("Number of visitors must be greater than 0")
+            if np.any(conversions < 0):
+                raise ValueError("Number of conversions cannot be negative")
+            if np.any(conversions > visitors):
+                raise ValueError("Conversions cannot exceed visitors")
+
+        if prior is None:
+            prior = BetaPosterior()
+        alpha_post = prior.alpha + conversions
+        beta_post = prior.beta + (visitors - conversions)
+
+        # One (n_simulations, k) draw shared by every arm
+        rng = self._resolve_rng(
+            rng,
+            seed,
+            key,
+            (
+                "bayesian_multi_arm_test",
+                tuple(conversions.tolist()),
+                tuple(visitors.tolist()),
+                n_simulations,
+            ),
+        )
+        with instrumentation.stage("rng"):
+            samples = rng.beta(alpha_post, beta_post, size=(n_simulations, conversions.size))
+        instrumentation.count("samples_drawn", samples.size)
+
+        best = np.argmax(samples, axis=1)
+        prob_best = np.bincount(best, minlength=conversions.size) / n_simulations
+        expected_loss = np.mean(samples.max(axis=1, keepdims=True) - samples, axis=0)
+
+        with instrumentation.stage("percentile"):
+            credible_intervals = np.percentile(samples, [2.5, 97.5], axis=0).T
+
+        results = ResultSet(
+            {
+                "prob_best": prob_best,
+                "expected_loss": expected_loss,
+                "credible_intervals": credible_intervals,
+                "posterior_means": samples.mean(axis=0),
+            }
+        )
 
         return results
 
@@ -0,0 +1,198 @@
+"""
+Thompson-sampling allocator
+Author: Gabriel Demetrios Lafis
+Description: Thread-safe multi-armed bandit traffic allocation on Beta posteriors
+"""
+
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from .posteriors import BetaPosterior
+from .random_streams import RandomStreams
+
+
+class ThompsonSamplingAllocator:
+    """
+    Shifts traffic towards the arms most likely to be best.
+
+    Each arm keeps a Beta posterior of its conversion rate. Allocation
+    weights are P(arm is best), estimated from one batched matrix of
+    posterior draws, and are only recomputed when new data has arrived and
+    ``refresh_interval`` seconds have passed. Arm choices are drawn from the
+    weights in blocks of ``batch_size`` and served from that buffer, so a
+    single decision costs an index lookup under a lock. Choosing arms in
+    proportion to P(arm is best) is exactly Thompson sampling against the
+    posteriors of the last refresh.
+    """
+
+    def __init__(
+        self,
+        n_arms: int,
+        prior: Optional[BetaPosterior] = None,
+        refresh_interval: float = 1.0,
+        n_simulations: int = 10000,
+        batch_size: int = 1024,
+        min_weight: float = 0.0,
+        seed=None,
+        bit_generator: str = "PCG64",
+    ):
+        """
+        Initialize the allocator.
+
+        Parameters:
+        -----------
+        n_arms : int
+            Number of arms
+        prior : BetaPosterior, optional
+            Prior of every arm (defaults to Beta(1, 1))
+        refresh_interval : float
+            Minimum seconds between allocation refreshes
+        n_simulations : int
+            Posterior draws per arm used to estimate the weights
+        batch_size : int
+            Arm choices drawn ahead of time per refill of the buffer
+        min_weight : float
+            Allocation floor per arm to keep exploring every variant
+        seed : None, int or np.random.SeedSequence
+            Seed of the posterior draws and arm choices
+        bit_generator : str
+            Name of the bit generator
+        """
+        if n_arms < 2:
+            raise ValueError("n_arms must be at least 2")
+        if refresh_interval < 0:
+            raise ValueError("refresh_interval cannot be negative")
+        if n_simulations <= 0 or batch_size <= 0:
+            raise ValueError("n_simulations and batch_size must be greater than 0")
+        if not (0 <= min_weight <= 1 / n_arms):
+            raise ValueError("min_weight must be between 0 and 1 / n_arms")
+        if prior is None:
+            prior = BetaPosterior()
+
+        self.n_arms = n_arms
+        self.refresh_interval = refresh_interval
+        self.n_simulations = n_simulations
+        self.batch_size = batch_size
+        self.min_weight = min_weight
+
+        self._alpha = np.full(n_arms, prior.alpha)
+        self._beta = np.full(n_arms, prior.beta)
+        self._rng = RandomStreams(seed, bit_generator).generator()
+        self._lock = threading.Lock()
+        self._stale = True
+        self._refreshed_at = -np.inf
+        self._weights = np.full(n_arms, 1 / n_arms)
+        self._choices = np.empty(0, dtype=np.intp)
+        self._position = 0
+        self.refreshes = 0
+
+    def update(self, arm: int, conversions: int, visitors: int) -> None:
+        """
+        Add observed counts for one arm.
+        """
+        if not (0 <= arm < self.n_arms):
+            raise ValueError(f"arm must be between 0 and {self.n_arms - 1}")
+        if visitors < 0 or conversions < 0 or conversions > visitors:
+            raise ValueError("Counts must satisfy 0 <= conversions <= visitors")
+        with self._lock:
+            self._alpha[arm] += conversions
+            self._beta[arm] += visitors - conversions
+            self._stale = True
+
+    def update_batch(self, arms, conversions, visitors) -> None:
+        """
+        Add observed counts for many (arm, conversions, visitors) records.
+        """
+        arms = np.asarray(arms, dtype=np.intp)
+        conversions = np.asarray(conversions, dtype=np.float64)
+        visitors = np.asarray(visitors, dtype=np.float64)
+        if np.any((arms < 0) | (arms >= self.n_arms)):
+            raise ValueError(f"arm must be between 0 and {self.n_arms - 1}")
+        if np.any((conversions < 0) | (conversions > visitors)):
+            raise ValueError("Counts must satisfy 0 <= conversions <= visitors")
+        successes = np.bincount(arms, weights=conversions, minlength=self.n_arms)
+        trials = np.bincount(arms, weights=visitors, minlength=self.n_arms)
+        with self._lock:
+            self._alpha += successes
+            self._beta += trials - successes
+            self._stale = True
+
+    def _refresh_locked(self, force: bool = False) -> None:
+        """
+        Recompute the weights and refill the choice buffer (lock held).
+        """
+        now = time.monotonic()
+        if not force and not (
+            self._stale and now - self._refreshed_at >= self.refresh_interval
+        ):
+            return
+        samples = self._rng.beta(self._alpha, self._beta, size=(self.n_simulations, self.n_arms))
+        prob_best = np.bincount(samples.argmax(axis=1), minlength=self.n_arms) / self.n_simulations
+        self._weights = self.min_weight + (1 - self.n_arms * self.min_weight) * prob_best
+        self._choices = self._draw_choices()
+        self._position = 0
+        self._stale = False
+        self._refreshed_at = now
+        self.refreshes += 1
+
+    def _draw_choices(self) -> np.ndarray:
+        return self._rng.choice(self.n_arms, size=self.batch_size, p=self._weights)
+
+    def refresh(self) -> np.ndarray:
+        """
+        Recompute the allocation now, regardless of the refresh interval.
+        """
+        with self._lock:
+            self._refresh_locked(force=True)
+            return self._weights.copy()
+
+    def allocation(self) -> np.ndarray:
+        """
+        Current allocation weights (P(arm is best), with the floor applied).
+        """
+        with self._lock:
+            self._refresh_locked(force=self.refreshes == 0)
+            return self._weights.copy()
+
+    def choose(self, n: Optional[int] = None):
+        """
+        Pick arms for incoming requests.
+
+        Parameters:
+        -----------
+        n : int, optional
+            Number of decisions; a single int is returned when omitted
+
+        Returns:
+        --------
+        int or np.ndarray : Chosen arm index (or indices)
+        """
+        count = 1 if n is None else n
+        if count < 0:
+            raise ValueError("n must be non-negative")
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+        with self._lock:
+            self._refresh_locked(force=self.refreshes == 0)
+            picks: List[np.ndarray] = []
+            needed = count
+            while needed > 0:
+                if self._position >= self._choices.size:
+                    self._choices = self._draw_choices()
+                    self._position = 0
+                take = min(needed, self._choices.size - self._position)
+                picks.append(self._choices[self._position : self._position + take])
+                self._position += take
+                needed -= take
+        chosen = np.concatenate(picks) if len(picks) > 1 else picks[0].copy()
+        return int(chosen[0]) if n is None else chosen
+
+    def posteriors(self) -> List[BetaPosterior]:
+        """
+        Snapshot of every arm's posterior.
+        """
+        with self._lock:
+            return [BetaPosterior(a, b) for a, b in zip(self._alpha, self._beta)]
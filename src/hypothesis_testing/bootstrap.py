@@ -0,0 +1,302 @@
+"""
+Poisson bootstrap
+Author: Gabriel Demetrios Lafis
+Description: Streaming Poisson bootstrap with percentile and BCa confidence intervals
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ._distributions import norm_cdf, norm_ppf
+from .random_streams import RandomStreams
+
+INTERVAL_METHODS = ("percentile", "bca")
+
+
+def _replicate_block(
+    generator: np.random.Generator, values: np.ndarray, n_replicates: int, chunk_size: int
+) -> Tuple[np.random.Generator, np.ndarray, np.ndarray]:
+    """
+    Draw Poisson(1) weights for one block of replicates and accumulate the
+    weighted count and weighted sum of ``values``.
+
+    Weights are drawn unit by unit (rows of a units x replicates matrix), so
+    the result does not depend on how the values were split into chunks.
+    Returns the advanced generator so the block can run in a worker process.
+    """
+    weight_sums = np.zeros(n_replicates)
+    value_sums = np.zeros(n_replicates)
+    for start in range(0, values.size, chunk_size):
+        chunk = values[start : start + chunk_size]
+        weights = generator.poisson(1.0, size=(chunk.size, n_replicates))
+        weight_sums += weights.sum(axis=0)
+        value_sums += chunk @ weights
+    return generator, weight_sums, value_sums
+
+
+class _ArmReplicates:
+    """
+    Per-arm state: central moments of the observed values and the weighted
+    sums of every replicate block.
+    """
+
+    __slots__ = ("count", "mean", "m2", "m3", "generators", "weight_sums", "value_sums")
+
+    def __init__(self, generators: List[np.random.Generator], block_sizes: List[int]):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.generators = generators
+        self.weight_sums = [np.zeros(size) for size in block_sizes]
+        self.value_sums = [np.zeros(size) for size in block_sizes]
+
+    def add_moments(self, values: np.ndarray) -> None:
+        """
+        Fold a batch into the running count, mean, M2 and M3 (Chan et al.).
+        """
+        n_b = values.size
+        mean_b = values.mean()
+        deviations = values - mean_b
+        m2_b = float(deviations @ deviations)
+        m3_b = float(np.sum(deviations**3))
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.m3 = n_b, mean_b, m2_b, m3_b
+            return
+        n_a = self.count
+        count = n_a + n_b
+        delta = mean_b - self.mean
+        self.m3 += (
+            m3_b
+            + delta**3 * n_a * n_b * (n_a - n_b) / count**2
+            + 3 * delta * (n_a * m2_b - n_b * self.m2) / count
+        )
+        self.m2 += m2_b + delta**2 * n_a * n_b / count
+        self.mean += delta * n_b / count
+        self.count = count
+
+    def replicate_means(self) -> np.ndarray:
+        weights = np.concatenate(self.weight_sums)
+        sums = np.concatenate(self.value_sums)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / weights
+
+
+class PoissonBootstrap:
+    """
+    Online bootstrap of the difference in means between two arms.
+
+    Each unit receives an independent Poisson(1) weight per replicate instead
+    of being resampled by index, so values can be streamed in chunks and each
+    replicate is just a weighted count and sum. Replicates are split into
+    blocks with their own random streams; blocks can be evaluated on a
+    process pool and a seeded run draws the same weights for any number of
+    workers or any chunking of the input. The pool is started on the first
+    parallel update and reused until ``close`` (or the end of a ``with``
+    block).
+    """
+
+    def __init__(
+        self,
+        n_replicates: int = 2000,
+        seed=None,
+        bit_generator: str = "PCG64",
+        block_size: int = 1000,
+        chunk_size: int = 2048,
+        max_workers: Optional[int] = 1,
+    ):
+        """
+        Initialize the bootstrap.
+
+        Parameters:
+        -----------
+        n_replicates : int
+            Number of bootstrap replicates
+        seed : None, int or np.random.SeedSequence
+            Root seed of the replicate weights
+        bit_generator : str
+            Name of the bit generator used for the weights
+        block_size : int
+            Replicates per block (the unit of work sent to a worker)
+        chunk_size : int
+            Units weighted at a time; a block holds a chunk_size x block_size
+            weight matrix in memory
+        max_workers : int, optional
+            Worker processes used to evaluate blocks (None for the CPU
+            count); 1 evaluates them in the current process
+        """
+        if n_replicates <= 0:
+            raise ValueError("n_replicates must be greater than 0")
+        if block_size <= 0 or chunk_size <= 0:
+            raise ValueError("block_size and chunk_size must be greater than 0")
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+
+        self.n_replicates = n_replicates
+        self.random_streams = RandomStreams(seed, bit_generator)
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self._block_sizes = [
+            min(block_size, n_replicates - start) for start in range(0, n_replicates, block_size)
+        ]
+        self._arms: Dict[str, _ArmReplicates] = {}
+        self._executor = None
+
+    def _arm(self, arm: str) -> _ArmReplicates:
+        if arm not in ("a", "b"):
+            raise ValueError('arm must be "a" or "b"')
+        if arm not in self._arms:
+            generators = [
+                self.random_streams.generator((arm, block))
+                for block in range(len(self._block_sizes))
+            ]
+            self._arms[arm] = _ArmReplicates(generators, self._block_sizes)
+        return self._arms[arm]
+
+    def update(self, arm: str, values) -> None:
+        """
+        Ingest a chunk of observations for one arm.
+
+        Parameters:
+        -----------
+        arm : str
+            "a" (control) or "b" (treatment)
+        values : array-like
+            Observed metric values
+        """
+        state = self._arm(arm)
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        state.add_moments(values)
+
+        n_blocks = len(self._block_sizes)
+        args = (
+            state.generators,
+            [values] * n_blocks,
+            self._block_sizes,
+            [self.chunk_size] * n_blocks,
+        )
+        if self.max_workers == 1 or n_blocks == 1:
+            outputs = list(map(_replicate_block, *args))
+        else:
+            executor = self._pool()
+            # One task per worker: blocks pickled together share one copy of values
+            workers = self.max_workers or os.cpu_count() or 1
+            chunksize = -(-n_blocks // workers)
+            outputs = list(executor.map(_replicate_block, *args, chunksize=chunksize))
+
+        for block, (generator, weight_sums, value_sums) in enumerate(outputs):
+            state.generators[block] = generator
+            state.weight_sums[block] += weight_sums
+            state.value_sums[block] += value_sums
+
+    def _pool(self):
+        """
+        Process pool shared by every update, started on first use.
+        """
+        if self._executor is None:
+            # multiprocessing is imported only when workers are requested
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        """
+        Shut down the worker pool, if one was started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "PoissonBootstrap":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict:
+        # The pool belongs to this process and is not copied
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    def replicates(self) -> np.ndarray:
+        """
+        Bootstrap replicates of mean(B) - mean(A).
+
+        Replicates in which an arm received zero total weight are dropped.
+        """
+        if "a" not in self._arms or "b" not in self._arms:
+            raise ValueError("Both arms need observations")
+        diffs = self._arms["b"].replicate_means() - self._arms["a"].replicate_means()
+        return diffs[np.isfinite(diffs)]
+
+    def _acceleration(self) -> float:
+        """
+        BCa acceleration from the empirical influence values of the
+        difference in means, (y - mean) / n with the control arm negated.
+        """
+        arm_a, arm_b = self._arms["a"], self._arms["b"]
+        sum_cubes = arm_b.m3 / arm_b.count**3 - arm_a.m3 / arm_a.count**3
+        sum_squares = arm_b.m2 / arm_b.count**2 + arm_a.m2 / arm_a.count**2
+        if sum_squares == 0:
+            return 0.0
+        return sum_cubes / (6 * sum_squares**1.5)
+
+    def confidence_interval(
+        self, confidence_level: float = 0.95, method: str = "bca"
+    ) -> Tuple[float, float]:
+        """
+        Bootstrap confidence interval for mean(B) - mean(A).
+
+        Parameters:
+        -----------
+        confidence_level : float
+            Two-sided coverage of the interval
+        method : str
+            "percentile" or "bca" (bias-corrected and accelerated)
+
+        Returns:
+        --------
+        tuple : (lower, upper)
+        """
+        if method not in INTERVAL_METHODS:
+            raise ValueError(f"method must be one of {INTERVAL_METHODS}")
+        if not (0 < confidence_level < 1):
+            raise ValueError("confidence_level must be between 0 and 1")
+
+        replicates = self.replicates()
+        tail = (1 - confidence_level) / 2
+        levels = np.array([tail, 1 - tail])
+
+        if method == "bca":
+            estimate = self.estimate
+            below = np.mean(replicates < estimate) + 0.5 * np.mean(replicates == estimate)
+            if 0 < below < 1:
+                z0 = norm_ppf(below)
+                acceleration = self._acceleration()
+                z = norm_ppf(levels)
+                levels = norm_cdf(z0 + (z0 + z) / (1 - acceleration * (z0 + z)))
+
+        lower, upper = np.quantile(replicates, levels)
+        return float(lower), float(upper)
+
+    def mean(self, arm: str) -> float:
+        """
+        Observed mean of one arm.
+        """
+        if arm not in self._arms:
+            raise ValueError(f"No observations for arm {arm!r}")
+        return self._arms[arm].mean
+
+    @property
+    def estimate(self) -> float:
+        """
+        Observed difference in means, mean(B) - mean(A).
+        """
+        return self.mean("b") - self.mean("a")
+
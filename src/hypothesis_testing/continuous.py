@@ -0,0 +1,110 @@
+"""
+Continuous-metric sufficient statistics
+Author: Gabriel Demetrios Lafis
+Description: Mergeable Welford/Chan moment accumulators for revenue-style metrics
+"""
+
+import numpy as np
+
+
+class SufficientStats:
+    """
+    Count, mean and sum of squared deviations of a stream of observations.
+
+    Updates use Welford's algorithm and merges use Chan et al.'s parallel
+    formula, so partial statistics from several workers can be combined
+    without holding raw values.
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        """
+        Initialize the statistics.
+
+        Parameters:
+        -----------
+        count : int
+            Number of observations
+        mean : float
+            Mean of the observations
+        m2 : float
+            Sum of squared deviations from the mean
+        """
+        if count < 0 or m2 < 0:
+            raise ValueError("count and m2 cannot be negative")
+        self.count = int(count)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+
+    @classmethod
+    def from_values(cls, values) -> "SufficientStats":
+        """
+        Build statistics from an array of observations.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return cls()
+        mean = values.mean()
+        return cls(values.size, mean, float(np.sum((values - mean) ** 2)))
+
+    @classmethod
+    def from_sums(cls, count: int, total: float, sum_squares: float) -> "SufficientStats":
+        """
+        Build statistics from a count, a sum and a sum of squares.
+        """
+        if count == 0:
+            return cls()
+        mean = total / count
+        return cls(count, mean, max(sum_squares - count * mean**2, 0.0))
+
+    def update(self, value: float) -> None:
+        """
+        Ingest a single observation (Welford).
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def update_batch(self, values) -> None:
+        """
+        Ingest a batch of observations.
+        """
+        self.merge(SufficientStats.from_values(values))
+
+    def merge(self, other: "SufficientStats") -> "SufficientStats":
+        """
+        Fold another set of statistics into this one (Chan et al.).
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self) -> float:
+        """
+        Unbiased sample variance.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def total(self) -> float:
+        """
+        Sum of the observations.
+        """
+        return self.mean * self.count
+
+    def __add__(self, other: "SufficientStats") -> "SufficientStats":
+        return SufficientStats(self.count, self.mean, self.m2).merge(other)
+
+    def __repr__(self) -> str:
+        return f"SufficientStats(count={self.count}, mean={self.mean}, m2={self.m2})"
@@ -0,0 +1,59 @@
+"""
+Multiple-comparison corrections
+Author: Gabriel Demetrios Lafis
+Description: Vectorized p-value adjustments for families of hypothesis tests
+"""
+
+import numpy as np
+
+CORRECTION_METHODS = ("none", "bonferroni", "holm", "fdr_bh")
+
+
+def adjust_pvalues(p_values, method: str = "holm") -> np.ndarray:
+    """
+    Adjust a family of p-values for multiple comparisons.
+
+    Parameters:
+    -----------
+    p_values : array-like
+        Unadjusted p-values
+    method : str
+        "none", "bonferroni", "holm" (family-wise error rate) or
+        "fdr_bh" (Benjamini-Hochberg false discovery rate)
+
+    Returns:
+    --------
+    np.ndarray : Adjusted p-values in the original shape, capped at 1. NaN
+        p-values stay NaN and do not count towards the family size.
+    """
+    if method not in CORRECTION_METHODS:
+        raise ValueError(f"method must be one of {CORRECTION_METHODS}")
+
+    p_values = np.asarray(p_values, dtype=np.float64)
+    if method == "none":
+        return p_values.copy()
+
+    flat = p_values.ravel()
+    valid = ~np.isnan(flat)
+    m = int(valid.sum())
+    result = flat.copy()
+    if m == 0:
+        return result.reshape(p_values.shape)
+
+    if method == "bonferroni":
+        result[valid] = np.minimum(flat[valid] * m, 1.0)
+        return result.reshape(p_values.shape)
+
+    valid_idx = np.flatnonzero(valid)
+    order = valid_idx[np.argsort(flat[valid_idx], kind="mergesort")]
+    ranked = flat[order]
+
+    if method == "holm":
+        # Step-down: p_(i) * (m - i), made monotone non-decreasing
+        adjusted = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    else:
+        # Step-up: p_(i) * m / (i + 1), made monotone from the largest p-value down
+        adjusted = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+
+    result[order] = np.minimum(adjusted, 1.0)
+    return result.reshape(p_values.shape)
@@ -0,0 +1,117 @@
+"""
+CUPED variance reduction
+Author: Gabriel Demetrios Lafis
+Description: Single-pass covariate moments for CUPED / regression-adjusted A/B tests
+"""
+
+import numpy as np
+
+from .continuous import SufficientStats
+
+
+class CovariateStats:
+    """
+    Streaming joint moments of an experiment metric ``y`` and its
+    pre-experiment covariate ``x``.
+
+    Batches are folded in with Chan et al.'s pairwise update, so the CUPED
+    coefficient can be computed after a single pass over the data and
+    partial statistics from several workers can be merged.
+    """
+
+    __slots__ = ("count", "mean_y", "mean_x", "m2_y", "m2_x", "c_xy")
+
+    def __init__(self):
+        self.count = 0
+        self.mean_y = 0.0
+        self.mean_x = 0.0
+        self.m2_y = 0.0
+        self.m2_x = 0.0
+        self.c_xy = 0.0
+
+    @classmethod
+    def from_values(cls, y, x) -> "CovariateStats":
+        """
+        Build statistics from paired per-unit arrays.
+        """
+        acc = cls()
+        acc.update_batch(y, x)
+        return acc
+
+    def update_batch(self, y, x) -> None:
+        """
+        Ingest a batch of units.
+
+        Parameters:
+        -----------
+        y : array-like
+            Experiment-period metric per unit
+        x : array-like
+            Pre-experiment metric per unit
+        """
+        y = np.asarray(y, dtype=np.float64).ravel()
+        x = np.asarray(x, dtype=np.float64).ravel()
+        if y.shape != x.shape:
+            raise ValueError("y and x must have the same length")
+        if y.size == 0:
+            return
+        batch = CovariateStats()
+        batch.count = y.size
+        batch.mean_y = y.mean()
+        batch.mean_x = x.mean()
+        dy = y - batch.mean_y
+        dx = x - batch.mean_x
+        batch.m2_y = float(dy @ dy)
+        batch.m2_x = float(dx @ dx)
+        batch.c_xy = float(dy @ dx)
+        self.merge(batch)
+
+    def merge(self, other: "CovariateStats") -> "CovariateStats":
+        """
+        Fold another set of statistics into this one.
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            return self
+        count = self.count + other.count
+        weight = self.count * other.count / count
+        delta_y = other.mean_y - self.mean_y
+        delta_x = other.mean_x - self.mean_x
+        self.m2_y += other.m2_y + delta_y**2 * weight
+        self.m2_x += other.m2_x + delta_x**2 * weight
+        self.c_xy += other.c_xy + delta_y * delta_x * weight
+        self.mean_y += delta_y * other.count / count
+        self.mean_x += delta_x * other.count / count
+        self.count = count
+        return self
+
+    def copy(self) -> "CovariateStats":
+        return CovariateStats().merge(self)
+
+    def adjusted(self, theta: float, mean_x: float) -> SufficientStats:
+        """
+        Sufficient statistics of the CUPED-adjusted metric
+        ``y - theta * (x - mean_x)``.
+        """
+        m2 = self.m2_y - 2 * theta * self.c_xy + theta**2 * self.m2_x
+        return SufficientStats(
+            self.count, self.mean_y - theta * (self.mean_x - mean_x), max(m2, 0.0)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CovariateStats(count={self.count}, mean_y={self.mean_y}, mean_x={self.mean_x})"
+        )
+
+
+def cuped_theta(stats_a: CovariateStats, stats_b: CovariateStats) -> float:
+    """
+    CUPED coefficient cov(y, x) / var(x) estimated on both groups pooled.
+    """
+    pooled = stats_a.copy().merge(stats_b)
+    if pooled.m2_x == 0:
+        return 0.0
+    return pooled.c_xy / pooled.m2_x
@@ -0,0 +1,411 @@
+"""
+Event-log ingestion
+Author: Gabriel Demetrios Lafis
+Description: Chunked readers that turn raw exposure/conversion logs into per-experiment counts
+"""
+
+import csv
+import os
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Event codes
+EXPOSURE = 0
+CONVERSION = 1
+
+# Arm code for events whose arm must be assigned by hashing
+UNASSIGNED = -1
+
+# Fixed-width record layout for binary event dumps (.bin / .dat / .npy)
+EVENT_DTYPE = np.dtype(
+    [("experiment_id", "<i8"), ("user_id", "<i8"), ("event", "i1"), ("arm", "i1")]
+)
+
+_EVENT_NAMES = {"exposure": EXPOSURE, "conversion": CONVERSION}
+
+
+def assign_arms(experiment_ids, user_ids, n_arms: int = 2, salt: int = 0) -> np.ndarray:
+    """
+    Deterministically assign users to arms by hashing (experiment, user).
+
+    Uses the SplitMix64 finalizer, so the same user always lands in the same
+    arm of an experiment without keeping any assignment state.
+
+    Parameters:
+    -----------
+    experiment_ids : array-like of int
+        Experiment identifiers
+    user_ids : array-like of int
+        User identifiers
+    n_arms : int
+        Number of arms
+    salt : int
+        Salt to re-randomize assignments
+
+    Returns:
+    --------
+    np.ndarray : Arm index per event (0 for A, 1 for B, ...)
+    """
+    with np.errstate(over="ignore"):
+        x = np.asarray(user_ids).astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        x ^= np.asarray(experiment_ids).astype(np.uint64) + np.uint64(salt & 0xFFFFFFFFFFFFFFFF)
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(0x94D049BB133111EB)
+        x ^= x >> np.uint64(31)
+    return (x % np.uint64(n_arms)).astype(np.int8)
+
+
+class _SortedIdSet:
+    """
+    Set of int64 ids kept as sorted unique arrays.
+
+    New ids are buffered and merged once the buffer is as large as the merged
+    set, which keeps inserts amortized O(log n) per id at 8 bytes per id.
+    """
+
+    __slots__ = ("_merged", "_pending", "_pending_size")
+
+    def __init__(self):
+        self._merged = np.empty(0, dtype=np.int64)
+        self._pending: List[np.ndarray] = []
+        self._pending_size = 0
+
+    def add(self, ids: np.ndarray) -> None:
+        if ids.size == 0:
+            return
+        self._pending.append(np.unique(ids))
+        self._pending_size += ids.size
+        if self._pending_size >= self._merged.size:
+            self._compact()
+
+    def _compact(self) -> None:
+        if self._pending:
+            self._merged = np.unique(np.concatenate([self._merged, *self._pending]))
+            self._pending = []
+            self._pending_size = 0
+
+    def values(self) -> np.ndarray:
+        self._compact()
+        return self._merged
+
+
+class EventCounter:
+    """
+    Incrementally deduplicates users and counts visitors and conversions.
+
+    A visitor is a unique user exposed to an arm; a conversion is a visitor
+    with at least one conversion event in the same experiment. Memory grows
+    with the number of unique users, not with the size of the log.
+    """
+
+    def __init__(self, n_arms: int = 2, salt: int = 0):
+        """
+        Initialize the counter.
+
+        Parameters:
+        -----------
+        n_arms : int
+            Number of arms per experiment
+        salt : int
+            Salt used when arms have to be assigned by hashing
+        """
+        if n_arms < 2:
+            raise ValueError("n_arms must be at least 2")
+        self.n_arms = n_arms
+        self.salt = salt
+        self._exposed: Dict[int, List[_SortedIdSet]] = {}
+        self._converted: Dict[int, _SortedIdSet] = {}
+
+    def update(self, experiment_id, user_id, event, arm=None) -> None:
+        """
+        Ingest one chunk of events.
+
+        Parameters:
+        -----------
+        experiment_id : array-like of int
+            Experiment of each event
+        user_id : array-like of int
+            User of each event
+        event : array-like of int
+            EXPOSURE (0) or CONVERSION (1)
+        arm : array-like of int, optional
+            Logged arm of each event; missing or UNASSIGNED (-1) entries are
+            assigned with ``assign_arms``
+        """
+        experiment_id = np.asarray(experiment_id, dtype=np.int64)
+        user_id = np.asarray(user_id, dtype=np.int64)
+        event = np.asarray(event)
+
+        exposures = event == EXPOSURE
+        if arm is None:
+            arm = assign_arms(experiment_id, user_id, self.n_arms, self.salt)
+        else:
+            arm = np.asarray(arm, dtype=np.int8)
+            missing = arm == UNASSIGNED
+            if np.any(missing):
+                arm = arm.copy()
+                arm[missing] = assign_arms(
+                    experiment_id[missing], user_id[missing], self.n_arms, self.salt
+                )
+            if np.any(exposures & ((arm < 0) | (arm >= self.n_arms))):
+                raise ValueError(f"Arm codes must be between 0 and {self.n_arms - 1}")
+
+        # Group the chunk by experiment once instead of masking per experiment
+        order = np.argsort(experiment_id, kind="stable")
+        experiment_id = experiment_id[order]
+        user_id = user_id[order]
+        event = event[order]
+        arm = arm[order]
+        experiments, starts = np.unique(experiment_id, return_index=True)
+        ends = np.append(starts[1:], experiment_id.size)
+
+        for exp, start, end in zip(experiments.tolist(), starts, ends):
+            if exp not in self._exposed:
+                self._exposed[exp] = [_SortedIdSet() for _ in range(self.n_arms)]
+                self._converted[exp] = _SortedIdSet()
+            users = user_id[start:end]
+            events = event[start:end]
+            arms = arm[start:end]
+            for index in range(self.n_arms):
+                self._exposed[exp][index].add(users[(events == EXPOSURE) & (arms == index)])
+            self._converted[exp].add(users[events == CONVERSION])
+
+    def arm_counts(self) -> Dict[int, Dict[str, np.ndarray]]:
+        """
+        Return per-arm conversions and visitors for every experiment.
+
+        Returns:
+        --------
+        dict : experiment id -> {"conversions": array, "visitors": array}
+        """
+        counts = {}
+        for exp, arms in self._exposed.items():
+            converted = self._converted[exp].values()
+            visitors = np.array([arm.values().size for arm in arms], dtype=np.int64)
+            conversions = np.array(
+                [
+                    np.count_nonzero(np.isin(arm.values(), converted, assume_unique=True))
+                    for arm in arms
+                ],
+                dtype=np.int64,
+            )
+            counts[exp] = {"conversions": conversions, "visitors": visitors}
+        return counts
+
+    def counts(self) -> Dict[int, Dict[str, int]]:
+        """
+        Return two-arm counts ready to unpack into ABTest methods.
+
+        Returns:
+        --------
+        dict : experiment id -> {conversions_a, visitors_a, conversions_b, visitors_b}
+        """
+        if self.n_arms != 2:
+            raise ValueError("counts() needs exactly two arms; use arm_counts()")
+        return {
+            exp: {
+                "conversions_a": int(c["conversions"][0]),
+                "visitors_a": int(c["visitors"][0]),
+                "conversions_b": int(c["conversions"][1]),
+                "visitors_b": int(c["visitors"][1]),
+            }
+            for exp, c in self.arm_counts().items()
+        }
+
+
+def _parse_event(value: str) -> int:
+    value = value.strip()
+    if value.lower() in _EVENT_NAMES:
+        return _EVENT_NAMES[value.lower()]
+    return int(value)
+
+
+def _parse_arm(value: str) -> int:
+    value = value.strip()
+    if value == "":
+        return UNASSIGNED
+    if len(value) == 1 and value.isalpha():
+        return ord(value.upper()) - ord("A")
+    return int(value)
+
+
+def _label_codes(values, parse) -> np.ndarray:
+    """
+    Map a column of labels or numbers to int8 codes.
+
+    Text labels go through ``parse`` once per distinct value; nulls (None or
+    NaN) are parsed as empty labels.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "iub":
+        return values.astype(np.int8)
+    if values.dtype.kind == "f":
+        nulls = np.isnan(values)
+        codes = np.full(values.shape, parse("") if nulls.any() else 0, dtype=np.int8)
+        codes[~nulls] = values[~nulls]
+        return codes
+    labels = np.array(
+        ["" if value is None else str(value) for value in values.tolist()], dtype=str
+    )
+    unique, inverse = np.unique(labels, return_inverse=True)
+    codes = np.array([parse(label) for label in unique.tolist()], dtype=np.int8)
+    return codes[inverse.reshape(values.shape)]
+
+
+def _encode_chunk(chunk: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Convert the raw columns of one chunk to the integer layout ``EventCounter`` expects.
+    """
+    encoded = {
+        "experiment_id": np.asarray(chunk["experiment_id"]).astype(np.int64),
+        "user_id": np.asarray(chunk["user_id"]).astype(np.int64),
+        "event": _label_codes(chunk["event"], _parse_event),
+    }
+    if "arm" in chunk:
+        encoded["arm"] = _label_codes(chunk["arm"], _parse_arm)
+    return encoded
+
+
+def iter_csv_chunks(path: str, chunk_size: int = 100000) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Read a CSV event log in chunks.
+
+    The file needs a header with ``experiment_id``, ``user_id`` and ``event``
+    columns (events as 0/1 or "exposure"/"conversion") and may have an
+    ``arm`` column (0/1/... or A/B/...).
+
+    Yields:
+    -------
+    dict : Column arrays for at most ``chunk_size`` events
+    """
+    with open(path, newline="") as fh:
+        reader = csv.reader(fh)
+        header = [name.strip() for name in next(reader)]
+        try:
+            exp_col = header.index("experiment_id")
+            user_col = header.index("user_id")
+            event_col = header.index("event")
+        except ValueError:
+            raise ValueError("CSV needs experiment_id, user_id and event columns") from None
+        arm_col = header.index("arm") if "arm" in header else None
+
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            rows.append(row)
+            if len(rows) == chunk_size:
+                yield _csv_rows_to_columns(rows, exp_col, user_col, event_col, arm_col)
+                rows = []
+        if rows:
+            yield _csv_rows_to_columns(rows, exp_col, user_col, event_col, arm_col)
+
+
+def _csv_rows_to_columns(rows, exp_col, user_col, event_col, arm_col) -> Dict[str, np.ndarray]:
+    chunk = {
+        "experiment_id": np.array([int(row[exp_col]) for row in rows], dtype=np.int64),
+        "user_id": np.array([int(row[user_col]) for row in rows], dtype=np.int64),
+        "event": np.array([row[event_col] for row in rows]),
+    }
+    if arm_col is not None:
+        chunk["arm"] = np.array([row[arm_col] for row in rows])
+    return _encode_chunk(chunk)
+
+
+def iter_parquet_chunks(path: str, chunk_size: int = 100000) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Read a Parquet event log in record batches (requires pyarrow).
+
+    Columns follow the CSV layout; string ``event`` and ``arm`` labels are
+    mapped to codes the same way, and null arms are left UNASSIGNED.
+
+    Yields:
+    -------
+    dict : Column arrays for at most ``chunk_size`` events
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files requires pyarrow: pip install pyarrow") from None
+
+    parquet_file = pq.ParquetFile(path)
+    available = parquet_file.schema_arrow.names
+    columns = [name for name in ("experiment_id", "user_id", "event", "arm") if name in available]
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        yield _encode_chunk(
+            {name: batch.column(name).to_numpy(zero_copy_only=False) for name in columns}
+        )
+
+
+def iter_binary_chunks(
+    path: str, chunk_size: int = 1000000, dtype: np.dtype = EVENT_DTYPE
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Read a fixed-width binary event dump through a memory map.
+
+    ``.npy`` files are opened with ``np.load(mmap_mode="r")``; any other file
+    is treated as raw records of ``dtype``. Only the pages of the current
+    chunk are touched, so memory stays bounded regardless of file size.
+
+    Yields:
+    -------
+    dict : Column views for at most ``chunk_size`` events
+    """
+    if str(path).endswith(".npy"):
+        records = np.load(path, mmap_mode="r")
+    else:
+        if os.path.getsize(path) == 0:
+            return
+        records = np.memmap(path, dtype=dtype, mode="r")
+    for start in range(0, records.shape[0], chunk_size):
+        chunk = records[start : start + chunk_size]
+        yield {name: np.asarray(chunk[name]) for name in chunk.dtype.names}
+
+
+def count_events(
+    path: str,
+    file_format: Optional[str] = None,
+    chunk_size: int = 100000,
+    n_arms: int = 2,
+    salt: int = 0,
+) -> EventCounter:
+    """
+    Stream an event log from disk into an ``EventCounter``.
+
+    Parameters:
+    -----------
+    path : str
+        Path to the event log
+    file_format : str, optional
+        "csv", "parquet" or "binary"; inferred from the extension if omitted
+    chunk_size : int
+        Number of events read per chunk
+    n_arms : int
+        Number of arms per experiment
+    salt : int
+        Salt used when arms have to be assigned by hashing
+
+    Returns:
+    --------
+    EventCounter : Counter holding the per-experiment counts
+    """
+    if file_format is None:
+        extension = os.path.splitext(str(path))[1].lower()
+        file_format = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}.get(
+            extension, "binary"
+        )
+    readers = {
+        "csv": iter_csv_chunks,
+        "parquet": iter_parquet_chunks,
+        "binary": iter_binary_chunks,
+    }
+    if file_format not in readers:
+        raise ValueError(f"file_format must be one of {tuple(readers)}")
+
+    counter = EventCounter(n_arms=n_arms, salt=salt)
+    for chunk in readers[file_format](path, chunk_size):
+        counter.update(chunk["experiment_id"], chunk["user_id"], chunk["event"], chunk.get("arm"))
+    return counter
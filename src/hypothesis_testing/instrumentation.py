@@ -0,0 +1,154 @@
+"""
+Instrumentation
+Author: Gabriel Demetrios Lafis
+Description: Opt-in per-stage timings and counters for ABTest hot paths
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class _NullStage:
+    """
+    Reusable no-op context manager returned while instrumentation is off.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """
+    Times one execution of a stage and reports it on exit.
+    """
+
+    __slots__ = ("_instrumentation", "_name", "_start")
+
+    def __init__(self, instrumentation: "Instrumentation", name: str):
+        self._instrumentation = instrumentation
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._instrumentation.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Instrumentation:
+    """
+    Collects per-stage timings and event counters.
+
+    While disabled, ``stage`` returns a shared no-op context manager and
+    ``count`` returns immediately, so instrumented code pays only a method
+    call. Recording is thread-safe.
+    """
+
+    def __init__(
+        self, enabled: bool = True, callback: Optional[Callable[[str, str, float], None]] = None
+    ):
+        """
+        Initialize the collector.
+
+        Parameters:
+        -----------
+        enabled : bool
+            Whether stages and counters are recorded
+        callback : callable, optional
+            Called as ``callback(kind, name, value)`` for every recorded event,
+            with kind "timing" (value in seconds) or "counter" (increment).
+            It runs on the calling thread and is not copied to worker
+            processes.
+        """
+        self.enabled = enabled
+        self.callback = callback
+        self._stages: Dict[str, list] = {}
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str):
+        """
+        Context manager timing one execution of the stage ``name``.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Record one execution of a stage.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                self._stages[name] = [1, seconds, seconds]
+            else:
+                stage[0] += 1
+                stage[1] += seconds
+                stage[2] = max(stage[2], seconds)
+        if self.callback is not None:
+            self.callback("timing", name, seconds)
+
+    def count(self, name: str, value: float = 1) -> None:
+        """
+        Increment the counter ``name``.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+        if self.callback is not None:
+            self.callback("counter", name, value)
+
+    def snapshot(self) -> Dict:
+        """
+        Return a copy of everything recorded so far.
+
+        Returns:
+        --------
+        dict : ``{"stages": {name: {"calls", "total_seconds", "mean_seconds",
+            "max_seconds"}}, "counters": {name: value}}``
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    "calls": calls,
+                    "total_seconds": total,
+                    "mean_seconds": total / calls,
+                    "max_seconds": longest,
+                }
+                for name, (calls, total, longest) in self._stages.items()
+            }
+            counters = dict(self._counters)
+        return {"stages": stages, "counters": counters}
+
+    def reset(self) -> None:
+        """
+        Discard all recorded timings and counters.
+        """
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["callback"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,119 @@
+"""
+Chunked Monte Carlo helpers
+Author: Gabriel Demetrios Lafis
+Description: Fixed-memory accumulators for Monte Carlo runs split into chunks
+"""
+
+from typing import Optional
+
+import numpy as np
+
+# Default number of posterior draws per arm held in memory at once
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+class StreamingQuantiles:
+    """
+    Quantile estimates from a fixed-size histogram.
+
+    The bin range is given up front (e.g. from the quantiles of the
+    distribution being sampled) or taken from the first batch. When a later
+    value falls outside it, the range is doubled towards that value and
+    adjacent bins are merged, so no value is ever clamped into an edge bin.
+    Within a bin values are assumed to be uniformly spread, which bounds the
+    error by one bin width.
+    """
+
+    __slots__ = ("n_bins", "lower", "upper", "counts", "total")
+
+    def __init__(
+        self, n_bins: int = 8192, lower: Optional[float] = None, upper: Optional[float] = None
+    ):
+        """
+        Initialize the estimator.
+
+        Parameters:
+        -----------
+        n_bins : int
+            Number of histogram bins
+        lower, upper : float, optional
+            Initial bin range; taken from the first batch when omitted
+        """
+        if n_bins <= 0:
+            raise ValueError("n_bins must be greater than 0")
+        if (lower is None) != (upper is None):
+            raise ValueError("Provide both lower and upper, or neither")
+        if lower is not None and not (np.isfinite(lower) and np.isfinite(upper) and lower < upper):
+            raise ValueError("lower and upper must be finite with lower < upper")
+        self.n_bins = n_bins
+        self.lower = None if lower is None else float(lower)
+        self.upper = None if upper is None else float(upper)
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.total = 0
+
+    def update(self, values) -> None:
+        """
+        Ingest a batch of values.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        low, high = float(values.min()), float(values.max())
+        if not (np.isfinite(low) and np.isfinite(high)):
+            raise ValueError("values must be finite")
+        if self.lower is None:
+            self.lower = low
+            self.upper = high if high > low else low + 1.0
+        elif low < self.lower or high > self.upper:
+            self._widen(low, high)
+        scale = self.n_bins / (self.upper - self.lower)
+        index = ((values - self.lower) * scale).astype(np.int64)
+        np.clip(index, 0, self.n_bins - 1, out=index)
+        self.counts += np.bincount(index, minlength=self.n_bins)
+        self.total += values.size
+
+    def _widen(self, low: float, high: float) -> None:
+        """
+        Double the range towards ``low``/``high`` until both are covered.
+
+        Every old bin falls inside exactly one new bin of twice the width,
+        so the merged counts are exact.
+        """
+        index = np.arange(self.n_bins)
+        while low < self.lower or high > self.upper:
+            width = self.upper - self.lower
+            if low < self.lower:
+                # Keep the upper edge; bins are merged counting from the top
+                target = self.n_bins - 1 - (self.n_bins - 1 - index) // 2
+                self.lower -= width
+            else:
+                target = index // 2
+                self.upper += width
+            self.counts = np.bincount(
+                target, weights=self.counts, minlength=self.n_bins
+            ).astype(np.int64)
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Estimate quantiles.
+
+        Parameters:
+        -----------
+        q : float or array-like
+            Probabilities between 0 and 1
+
+        Returns:
+        --------
+        np.ndarray : Estimated quantiles
+        """
+        if self.total == 0:
+            raise ValueError("No values have been added")
+        q = np.asarray(q, dtype=np.float64)
+        cumulative = np.cumsum(self.counts)
+        target = q * self.total
+        index = np.minimum(np.searchsorted(cumulative, target, side="left"), self.n_bins - 1)
+        before = np.where(index > 0, cumulative[index - 1], 0)
+        in_bin = self.counts[index]
+        fraction = np.where(in_bin > 0, (target - before) / np.maximum(in_bin, 1), 0.0)
+        width = (self.upper - self.lower) / self.n_bins
+        return self.lower + (index + np.clip(fraction, 0.0, 1.0)) * width
@@ -0,0 +1,300 @@
+"""
+Experiment planning
+Author: Gabriel Demetrios Lafis
+Description: Vectorized sample-size, power, MDE and duration planning over parameter grids
+"""
+
+import numpy as np
+
+from ._distributions import norm_cdf, norm_ppf
+
+
+def _unique_quantiles(levels: np.ndarray, upper_tail: bool) -> np.ndarray:
+    """
+    Evaluate normal quantiles once per unique level and scatter them back.
+    """
+    unique, inverse = np.unique(levels, return_inverse=True)
+    quantiles = norm_ppf(1 - unique if upper_tail else unique)
+    return quantiles[inverse].reshape(levels.shape)
+
+
+def _required_z_gap(p1, p2, n, ratio, z_alpha, z_beta):
+    """
+    |p2 - p1| * sqrt(n) minus the z-weighted standard deviations of the
+    sample-size formula; zero exactly when n is the required sample size.
+    """
+    p_pooled = (p1 + ratio * p2) / (1 + ratio)
+    return (
+        np.abs(p2 - p1) * np.sqrt(n)
+        - z_alpha * np.sqrt(p_pooled * (1 - p_pooled) * (1 + 1 / ratio))
+        - z_beta * np.sqrt(p1 * (1 - p1) + p2 * (1 - p2) / ratio)
+    )
+
+
+def _solve_bracketed(func, lower: np.ndarray, upper: np.ndarray, ftol=1e-10, maxiter=100):
+    """
+    Vectorized Illinois (modified regula falsi) root finder.
+
+    ``func`` must change sign from negative at ``lower`` to positive at
+    ``upper`` for every element; all elements are iterated together.
+    """
+    f_lower = func(lower)
+    f_upper = func(upper)
+    retained = np.zeros(lower.shape, dtype=np.int8)
+    x = lower
+    for _ in range(maxiter):
+        x = (lower * f_upper - upper * f_lower) / (f_upper - f_lower)
+        fx = func(x)
+        if np.all(np.abs(fx) < ftol):
+            break
+        root_above = fx < 0
+        lower = np.where(root_above, x, lower)
+        f_lower = np.where(root_above, fx, f_lower)
+        upper = np.where(root_above, upper, x)
+        f_upper = np.where(root_above, f_upper, fx)
+        # Illinois step: halve the stale endpoint when the same side is kept twice
+        f_upper = np.where(root_above & (retained == 1), f_upper / 2, f_upper)
+        f_lower = np.where(~root_above & (retained == -1), f_lower / 2, f_lower)
+        retained = np.where(root_above, 1, -1).astype(np.int8)
+    return x
+
+
+def sample_size_grid(
+    baseline_rate, mde, ratio=1.0, alpha=0.05, power=0.80, variance_reduction=0.0
+) -> np.ma.MaskedArray:
+    """
+    Required sample size per group over broadcast parameter grids.
+
+    Uses the same formula as ``ABTest.calculate_sample_size``; every argument
+    may be a scalar or an array and all are broadcast together.
+
+    Parameters:
+    -----------
+    baseline_rate : float or array-like
+        Current conversion rate (between 0 and 1)
+    mde : float or array-like
+        Minimum detectable effect (relative change)
+    ratio : float or array-like
+        Ratio of treatment to control group size
+    alpha : float or array-like
+        Significance level
+    power : float or array-like
+        Statistical power
+    variance_reduction : float or array-like
+        Expected fraction of variance removed by CUPED (0 for no adjustment)
+
+    Returns:
+    --------
+    np.ma.MaskedArray : Integer sample sizes; combinations that
+        ``calculate_sample_size`` would reject (e.g. mde <= 0 or a treatment
+        rate >= 1) are masked
+    """
+    p1, mde, ratio, alpha, power, variance_reduction = np.broadcast_arrays(
+        np.asarray(baseline_rate, dtype=np.float64),
+        np.asarray(mde, dtype=np.float64),
+        np.asarray(ratio, dtype=np.float64),
+        np.asarray(alpha, dtype=np.float64),
+        np.asarray(power, dtype=np.float64),
+        np.asarray(variance_reduction, dtype=np.float64),
+    )
+    p2 = p1 * (1 + mde)
+
+    invalid = (
+        ~((p1 > 0) & (p1 < 1))
+        | ~(mde > 0)
+        | ~(ratio > 0)
+        | ~(p2 < 1)
+        | ~((alpha > 0) & (alpha < 1))
+        | ~((power > 0) & (power < 1))
+        | ~((variance_reduction >= 0) & (variance_reduction < 1))
+    )
+
+    # Replace invalid cells with harmless values so no warnings are raised
+    p1 = np.where(invalid, 0.5, p1)
+    p2 = np.where(invalid, 0.6, p2)
+    ratio = np.where(invalid, 1.0, ratio)
+    alpha = np.where(invalid, 0.05, alpha)
+    power = np.where(invalid, 0.8, power)
+    variance_reduction = np.where(invalid, 0.0, variance_reduction)
+
+    # Pooled proportion
+    p_pooled = (p1 + ratio * p2) / (1 + ratio)
+
+    # Z-scores, one ppf evaluation per unique alpha / power
+    z_alpha = _unique_quantiles(alpha / 2, upper_tail=True)
+    z_beta = _unique_quantiles(power, upper_tail=False)
+
+    numerator = (
+        z_alpha * np.sqrt(p_pooled * (1 - p_pooled) * (1 + 1 / ratio))
+        + z_beta * np.sqrt(p1 * (1 - p1) + p2 * (1 - p2) / ratio)
+    ) ** 2 * (1 - variance_reduction)
+    denominator = (p2 - p1) ** 2
+
+    n = np.ceil(numerator / denominator).astype(np.int64)
+
+    return np.ma.MaskedArray(n, mask=invalid)
+
+
+def power_grid(sample_size, baseline_rate, mde, ratio=1.0, alpha=0.05) -> np.ma.MaskedArray:
+    """
+    Statistical power achieved with a given sample size per group.
+
+    Inverts the ``sample_size_grid`` formula in closed form; all arguments
+    are broadcast together.
+
+    Parameters:
+    -----------
+    sample_size : int or array-like
+        Visitors in the control group (the treatment group gets
+        ``ratio`` times as many)
+    baseline_rate : float or array-like
+        Current conversion rate (between 0 and 1)
+    mde : float or array-like
+        Minimum detectable effect (relative change)
+    ratio : float or array-like
+        Ratio of treatment to control group size
+    alpha : float or array-like
+        Significance level
+
+    Returns:
+    --------
+    np.ma.MaskedArray : Power for every combination, invalid ones masked
+    """
+    n, p1, mde, ratio, alpha = np.broadcast_arrays(
+        np.asarray(sample_size, dtype=np.float64),
+        np.asarray(baseline_rate, dtype=np.float64),
+        np.asarray(mde, dtype=np.float64),
+        np.asarray(ratio, dtype=np.float64),
+        np.asarray(alpha, dtype=np.float64),
+    )
+    p2 = p1 * (1 + mde)
+
+    invalid = (
+        ~(n > 0)
+        | ~((p1 > 0) & (p1 < 1))
+        | ~(mde > 0)
+        | ~(ratio > 0)
+        | ~(p2 < 1)
+        | ~((alpha > 0) & (alpha < 1))
+    )
+    n = np.where(invalid, 1.0, n)
+    p1 = np.where(invalid, 0.5, p1)
+    p2 = np.where(invalid, 0.6, p2)
+    ratio = np.where(invalid, 1.0, ratio)
+    alpha = np.where(invalid, 0.05, alpha)
+
+    z_alpha = _unique_quantiles(alpha / 2, upper_tail=True)
+    # With z_beta = 0 the gap is d * sqrt(n) - z_alpha * sd_null; dividing
+    # by the alternative standard deviation gives the z_beta achieved.
+    gap = _required_z_gap(p1, p2, n, ratio, z_alpha, 0.0)
+    sd_alternative = np.sqrt(p1 * (1 - p1) + p2 * (1 - p2) / ratio)
+    power = norm_cdf(gap / sd_alternative)
+
+    return np.ma.MaskedArray(power, mask=invalid)
+
+
+def mde_grid(sample_size, baseline_rate, ratio=1.0, alpha=0.05, power=0.80) -> np.ma.MaskedArray:
+    """
+    Smallest relative effect detectable with a given sample size per group.
+
+    Solves the sample-size formula for the MDE with a vectorized bracketed
+    root finder; all arguments are broadcast together.
+
+    Parameters:
+    -----------
+    sample_size : int or array-like
+        Visitors in the control group
+    baseline_rate : float or array-like
+        Current conversion rate (between 0 and 1)
+    ratio : float or array-like
+        Ratio of treatment to control group size
+    alpha : float or array-like
+        Significance level
+    power : float or array-like
+        Statistical power
+
+    Returns:
+    --------
+    np.ma.MaskedArray : Relative MDE for every combination; combinations
+        where no effect keeping the treatment rate below 1 is detectable are
+        masked
+    """
+    n, p1, ratio, alpha, power = np.broadcast_arrays(
+        np.asarray(sample_size, dtype=np.float64),
+        np.asarray(baseline_rate, dtype=np.float64),
+        np.asarray(ratio, dtype=np.float64),
+        np.asarray(alpha, dtype=np.float64),
+        np.asarray(power, dtype=np.float64),
+    )
+    invalid = (
+        ~(n > 0)
+        | ~((p1 > 0) & (p1 < 1))
+        | ~(ratio > 0)
+        | ~((alpha > 0) & (alpha < 1))
+        | ~((power > 0) & (power < 1))
+    )
+    n = np.where(invalid, 1.0, n)
+    p1 = np.where(invalid, 0.5, p1)
+    ratio = np.where(invalid, 1.0, ratio)
+    alpha = np.where(invalid, 0.05, alpha)
+    power = np.where(invalid, 0.8, power)
+
+    z_alpha = _unique_quantiles(alpha / 2, upper_tail=True)
+    z_beta = _unique_quantiles(power, upper_tail=False)
+
+    def gap(mde):
+        return _required_z_gap(p1, p1 * (1 + mde), n, ratio, z_alpha, z_beta)
+
+    # Search relative effects whose treatment rate stays inside (p1, 1)
+    lower = np.full(p1.shape, 1e-12)
+    upper = (1 - 1e-12) / p1 - 1
+    undetectable = gap(upper) <= 0
+    invalid = invalid | undetectable
+    upper = np.where(invalid, 1.0, upper)
+    p1 = np.where(invalid, 0.1, p1)
+    n = np.where(invalid, 1e6, n)
+
+    mde = _solve_bracketed(gap, lower, upper)
+
+    return np.ma.MaskedArray(mde, mask=invalid)
+
+
+def duration_grid(
+    daily_traffic, baseline_rate, mde, ratio=1.0, alpha=0.05, power=0.80
+) -> np.ma.MaskedArray:
+    """
+    Number of days needed to reach the required sample size.
+
+    Parameters:
+    -----------
+    daily_traffic : float or array-like
+        Visitors entering the experiment per day, across both groups
+    baseline_rate : float or array-like
+        Current conversion rate (between 0 and 1)
+    mde : float or array-like
+        Minimum detectable effect (relative change)
+    ratio : float or array-like
+        Ratio of treatment to control group size (the allocation ratio)
+    alpha : float or array-like
+        Significance level
+    power : float or array-like
+        Statistical power
+
+    Returns:
+    --------
+    np.ma.MaskedArray : Whole days for every combination, invalid ones masked
+    """
+    daily_traffic, ratio = np.broadcast_arrays(
+        np.asarray(daily_traffic, dtype=np.float64), np.asarray(ratio, dtype=np.float64)
+    )
+    n = sample_size_grid(baseline_rate, mde, ratio, alpha, power)
+    daily_traffic, ratio, n_data, invalid = np.broadcast_arrays(
+        daily_traffic, ratio, n.filled(0), np.ma.getmaskarray(n)
+    )
+    invalid = invalid | ~(daily_traffic > 0)
+
+    # The control group gets n visitors and the treatment group ratio * n
+    total = n_data * (1 + ratio)
+    days = np.ceil(total / np.where(invalid, 1.0, daily_traffic)).astype(np.int64)
+
+    return np.ma.MaskedArray(days, mask=invalid)
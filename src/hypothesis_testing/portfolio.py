@@ -0,0 +1,161 @@
+"""
+Parallel portfolio runner
+Author: Gabriel Demetrios Lafis
+Description: Runs ABTest over large experiment portfolios on a process pool
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .ab_test import ABTest
+
+TESTS = ("bayesian_ab_test", "two_proportion_ztest")
+
+
+# ABTest of the current worker process, set once by the pool initializer
+_worker_ab_test: Optional[ABTest] = None
+
+
+def _init_worker(ab_test: ABTest) -> None:
+    """
+    Receive the ABTest once per worker instead of once per chunk.
+    """
+    global _worker_ab_test
+    _worker_ab_test = ab_test
+
+
+def _run_chunk(
+    test: str,
+    experiments: Sequence[Mapping],
+    seed_sequence: np.random.SeedSequence,
+    test_kwargs: Dict,
+    ab_test: Optional[ABTest] = None,
+):
+    """
+    Run one chunk of experiments inside a worker process.
+
+    Uses the worker's ABTest unless one is passed (serial runs). Returns the
+    results together with the compute time spent in the worker.
+    """
+    if ab_test is None:
+        ab_test = _worker_ab_test
+    start = time.perf_counter()
+    method = getattr(ab_test, test)
+    kwargs = dict(test_kwargs)
+    if test == "bayesian_ab_test":
+        kwargs["rng"] = ab_test.random_streams.make_generator(seed_sequence)
+    results = [method(**experiment, **kwargs) for experiment in experiments]
+    return results, time.perf_counter() - start
+
+
+class PortfolioRunner:
+    """
+    Shards a list of experiments across a process pool.
+
+    Every chunk gets its own ``np.random.Generator`` derived from a single
+    ``SeedSequence``, so a seeded run is reproducible regardless of how many
+    workers are used or in which order the chunks finish, and repeated runs
+    of the same runner return the same results.
+    """
+
+    def __init__(
+        self,
+        ab_test: ABTest,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 64,
+        seed=None,
+    ):
+        """
+        Initialize the runner.
+
+        Parameters:
+        -----------
+        ab_test : ABTest
+            Configured test framework, sent once to every worker process
+        max_workers : int, optional
+            Number of worker processes (defaults to the CPU count); 1 runs the
+            chunks in the current process
+        chunk_size : int
+            Number of experiments dispatched to a worker at a time
+        seed : int or np.random.SeedSequence, optional
+            Root seed for the per-chunk random streams (defaults to the
+            seed sequence of ``ab_test``)
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0")
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        self.ab_test = ab_test
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.chunk_timings: List[Dict] = []
+
+    def run(
+        self, experiments: Sequence[Mapping], test: str = "bayesian_ab_test", **test_kwargs
+    ) -> List[Dict]:
+        """
+        Run a test over every experiment of the portfolio.
+
+        Parameters:
+        -----------
+        experiments : sequence of mappings
+            Keyword arguments per experiment (conversions_a, visitors_a,
+            conversions_b, visitors_b)
+        test : str
+            "bayesian_ab_test" or "two_proportion_ztest"
+        **test_kwargs
+            Extra keyword arguments passed to every call (e.g. n_simulations)
+
+        Returns:
+        --------
+        list : One result dict per experiment, in the original order
+
+        After the run, ``chunk_timings`` holds one entry per chunk with its
+        index, size and worker compute time in seconds.
+        """
+        if test not in TESTS:
+            raise ValueError(f"test must be one of {TESTS}")
+
+        experiments = list(experiments)
+        chunks = [
+            experiments[start : start + self.chunk_size]
+            for start in range(0, len(experiments), self.chunk_size)
+        ]
+        if self.seed is None:
+            root = self.ab_test.random_streams.child_sequence("portfolio")
+        elif isinstance(self.seed, np.random.SeedSequence):
+            root = self.seed
+        else:
+            root = np.random.SeedSequence(self.seed)
+        # Children are derived from the spawn key rather than root.spawn(),
+        # which would advance the shared sequence and change the next run
+        seed_sequences = [
+            np.random.SeedSequence(
+                root.entropy, spawn_key=tuple(root.spawn_key) + (index,), pool_size=root.pool_size
+            )
+            for index in range(len(chunks))
+        ]
+
+        args = ([test] * len(chunks), chunks, seed_sequences, [test_kwargs] * len(chunks))
+        if self.max_workers == 1 or len(chunks) <= 1:
+            outputs = list(map(partial(_run_chunk, ab_test=self.ab_test), *args))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_worker, initargs=(self.ab_test,)
+            ) as executor:
+                outputs = list(executor.map(_run_chunk, *args))
+
+        results: List[Dict] = []
+        self.chunk_timings = []
+        for index, (chunk_results, elapsed) in enumerate(outputs):
+            results.extend(chunk_results)
+            self.chunk_timings.append(
+                {"chunk": index, "size": len(chunk_results), "seconds": elapsed}
+            )
+
+        return results
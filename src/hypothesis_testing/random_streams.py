@@ -0,0 +1,126 @@
+"""
+Random stream management
+Author: Gabriel Demetrios Lafis
+Description: Seedable, keyed random number streams for reproducible Monte Carlo
+"""
+
+import hashlib
+from typing import Hashable, Optional
+
+import numpy as np
+
+BIT_GENERATORS = {
+    "PCG64": np.random.PCG64,
+    "PCG64DXSM": np.random.PCG64DXSM,
+    "Philox": np.random.Philox,
+    "SFC64": np.random.SFC64,
+    "MT19937": np.random.MT19937,
+}
+
+
+def _plain_key(key: Hashable) -> Hashable:
+    """
+    Replace NumPy scalars (also inside tuples) by the equal Python values,
+    whose repr does not depend on the NumPy version or dtype.
+    """
+    if isinstance(key, np.generic):
+        return key.item()
+    if isinstance(key, tuple):
+        return tuple(_plain_key(part) for part in key)
+    return key
+
+
+def _key_to_int(key: Hashable) -> int:
+    """
+    Map an experiment key to a stable 64-bit integer.
+
+    Python's built-in ``hash`` is salted per process, so a digest of the key's
+    repr is used instead to keep streams identical across runs and workers.
+    Keys that compare equal, such as ``np.int64(5)`` and ``5``, map to the
+    same integer.
+    """
+    digest = hashlib.blake2b(repr(_plain_key(key)).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RandomStreams:
+    """
+    Owns the random streams used by ABTest.
+
+    A root ``SeedSequence`` drives a shared generator for ad-hoc draws and
+    derives an independent child stream for every experiment key, so the
+    same key always maps to the same stream for a given seed.
+    """
+
+    def __init__(self, seed=None, bit_generator: str = "PCG64"):
+        """
+        Initialize the stream manager.
+
+        Parameters:
+        -----------
+        seed : None, int, np.random.SeedSequence or np.random.Generator
+            Root seed. None draws fresh OS entropy. A Generator is used as the
+            shared stream, and its seed sequence drives the keyed streams.
+        bit_generator : str
+            Name of the bit generator ("PCG64", "PCG64DXSM", "Philox",
+            "SFC64" or "MT19937")
+        """
+        if bit_generator not in BIT_GENERATORS:
+            raise ValueError(f"bit_generator must be one of {tuple(BIT_GENERATORS)}")
+        self.bit_generator = bit_generator
+        self.seeded = seed is not None
+
+        if isinstance(seed, np.random.Generator):
+            seed_sequence = getattr(seed.bit_generator, "seed_seq", None)
+            if not isinstance(seed_sequence, np.random.SeedSequence):
+                seed_sequence = np.random.SeedSequence(int(seed.integers(2**63)))
+            self.seed_sequence = seed_sequence
+            self._generator = seed
+        else:
+            if isinstance(seed, np.random.SeedSequence):
+                self.seed_sequence = seed
+            else:
+                self.seed_sequence = np.random.SeedSequence(seed)
+            self._generator = self.make_generator(self.seed_sequence.spawn(1)[0])
+
+    def make_generator(self, seed_sequence: np.random.SeedSequence) -> np.random.Generator:
+        """
+        Build a Generator on the configured bit generator.
+        """
+        return np.random.Generator(BIT_GENERATORS[self.bit_generator](seed_sequence))
+
+    def child_sequence(self, key: Hashable) -> np.random.SeedSequence:
+        """
+        Return the seed sequence of the stream for an experiment key.
+        """
+        root = self.seed_sequence
+        return np.random.SeedSequence(
+            root.entropy,
+            spawn_key=tuple(root.spawn_key) + (_key_to_int(key),),
+            pool_size=root.pool_size,
+        )
+
+    def generator(self, key: Optional[Hashable] = None) -> np.random.Generator:
+        """
+        Return a random generator.
+
+        Parameters:
+        -----------
+        key : hashable, optional
+            Experiment key. Each call with the same key returns a fresh
+            generator positioned at the start of that key's stream; without a
+            key the shared generator is returned.
+
+        Returns:
+        --------
+        np.random.Generator
+        """
+        if key is None:
+            return self._generator
+        return self.make_generator(self.child_sequence(key))
+
+    def spawn(self, n: int):
+        """
+        Spawn ``n`` independent seed sequences from the root sequence.
+        """
+        return self.seed_sequence.spawn(n)
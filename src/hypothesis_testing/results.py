@@ -0,0 +1,359 @@
+"""
+Result containers
+Author: Gabriel Demetrios Lafis
+Description: Compact slotted result records and columnar result sets backed by NumPy arrays
+"""
+
+import json
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+
+class _Missing:
+    """
+    Marks optional fields a record does not carry (e.g. exact Bayesian
+    results); pickles by reference so the marker survives round trips.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return "_MISSING"
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+_MISSING = _Missing()
+
+
+def _python_scalar(value):
+    """
+    Unwrap NumPy scalars so records hold plain Python numbers.
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class _Record(Mapping):
+    """
+    Read-mostly mapping over a fixed set of slots.
+
+    Records behave like the dicts they replace (``record["p_value"]``,
+    ``in``, ``keys``, ``items``, ``get``) and existing fields can be
+    reassigned, but no new keys can be added. Interval fields are stored as
+    tuples of floats and returned as fresh arrays on item access.
+    """
+
+    __slots__ = ()
+
+    _fields = ()
+    _optional = ()
+    _interval_fields = ()
+
+    def __init__(self, **values):
+        for name in self._fields:
+            value = values.pop(name, _MISSING)
+            if value is _MISSING and name not in self._optional:
+                raise TypeError(f"{type(self).__name__} is missing the field '{name}'")
+            object.__setattr__(self, name, self._convert(name, value))
+        if values:
+            raise TypeError(f"Unknown {type(self).__name__} fields: {sorted(values)}")
+
+    def _convert(self, name, value):
+        if value is _MISSING:
+            return value
+        if name in self._interval_fields:
+            return tuple(float(bound) for bound in value)
+        return _python_scalar(value)
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is _MISSING:
+            raise KeyError(key)
+        if key in self._interval_fields:
+            return np.array(value)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        if key not in self._fields:
+            raise KeyError(f"{type(self).__name__} has no field '{key}'")
+        object.__setattr__(self, key, self._convert(key, value))
+
+    def __iter__(self):
+        return (name for name in self._fields if getattr(self, name) is not _MISSING)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping) or set(self) != set(other):
+            return False
+        return all(np.array_equal(self[name], other[name]) for name in self)
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def __setstate__(self, state) -> None:
+        for name, value in zip(self._fields, state):
+            object.__setattr__(self, name, value)
+
+    def to_dict(self) -> Dict:
+        """
+        Plain dict with the same keys and values as the pre-record results.
+        """
+        return {name: self[name] for name in self}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self)
+        return f"{type(self).__name__}({fields})"
+
+
+class ZTestResult(_Record):
+    """
+    Result of ``two_proportion_ztest``.
+    """
+
+    __slots__ = (
+        "conversion_rate_a",
+        "conversion_rate_b",
+        "absolute_difference",
+        "relative_lift",
+        "z_statistic",
+        "p_value",
+        "is_significant",
+        "confidence_interval",
+        "confidence_level",
+    )
+
+    _fields = __slots__
+    _interval_fields = ("confidence_interval",)
+
+    def __getitem__(self, key):
+        # The dict results returned the interval as a tuple
+        if key == "confidence_interval":
+            return self.confidence_interval
+        return super().__getitem__(key)
+
+
+class BayesianResult(_Record):
+    """
+    Result of ``bayesian_ab_test`` and ``compare_posteriors``.
+
+    ``n_simulations`` and ``monte_carlo_standard_error`` are only present
+    for Monte Carlo results.
+    """
+
+    __slots__ = (
+        "prob_b_better_than_a",
+        "prob_a_better_than_b",
+        "expected_loss_choosing_b",
+        "expected_loss_choosing_a",
+        "credible_interval_a",
+        "credible_interval_b",
+        "posterior_mean_a",
+        "posterior_mean_b",
+        "n_simulations",
+        "monte_carlo_standard_error",
+    )
+
+    _fields = __slots__
+    _optional = ("n_simulations", "monte_carlo_standard_error")
+    _interval_fields = ("credible_interval_a", "credible_interval_b")
+
+
+class ResultSet(MutableMapping):
+    """
+    Columnar results of a batch of tests.
+
+    Keys map to NumPy columns with one row per test (columns may have extra
+    trailing dimensions, e.g. intervals) or to constants shared by every row
+    (such as ``confidence_level``), so existing callers can treat a result
+    set like the dict of arrays it replaces. Columns are stored without
+    copying; slicing with a ``slice`` returns a result set of views, while
+    boolean masks and index arrays select copies. An integer returns one
+    row as a record (or dict).
+    """
+
+    __slots__ = ("_columns", "_constants", "_n_rows", "_record_type")
+
+    def __init__(self, columns: Mapping, record_type: Optional[type] = None):
+        """
+        Initialize the result set.
+
+        Parameters:
+        -----------
+        columns : mapping
+            Column name to array (one entry per row) or constant
+        record_type : type, optional
+            Record class used for single rows (plain dicts otherwise)
+        """
+        self._columns: Dict[str, np.ndarray] = {}
+        self._constants: Dict[str, object] = {}
+        self._n_rows = None
+        self._record_type = record_type
+        for name, value in columns.items():
+            self[name] = value
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping]) -> "ResultSet":
+        """
+        Stack single-call results (records or dicts with equal keys) into columns.
+        """
+        records = list(records)
+        if not records:
+            return cls({})
+        names = list(records[0])
+        for record in records:
+            if list(record) != names:
+                raise ValueError("All records must have the same fields")
+        columns = {name: np.array([record[name] for record in records]) for name in names}
+        record_type = type(records[0]) if isinstance(records[0], _Record) else None
+        return cls(columns, record_type)
+
+    @property
+    def n_rows(self) -> int:
+        return self._n_rows or 0
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        return dict(self._columns)
+
+    @property
+    def constants(self) -> Dict[str, object]:
+        return dict(self._constants)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key in self._columns:
+                return self._columns[key]
+            return self._constants[key]
+        if isinstance(key, (int, np.integer)):
+            return self.row(int(key))
+        subset = ResultSet({}, self._record_type)
+        for name, column in self._columns.items():
+            subset[name] = column[key]
+        subset._constants = dict(self._constants)
+        return subset
+
+    def __setitem__(self, key: str, value) -> None:
+        if isinstance(value, np.ndarray) and value.ndim > 0:
+            if self._n_rows is None:
+                self._n_rows = value.shape[0]
+            elif value.shape[0] != self._n_rows:
+                raise ValueError(
+                    f"Column '{key}' has {value.shape[0]} rows; expected {self._n_rows}"
+                )
+            self._constants.pop(key, None)
+            self._columns[key] = value
+        else:
+            if isinstance(value, np.ndarray):
+                value = value[()]
+            self._columns.pop(key, None)
+            self._constants[key] = _python_scalar(value)
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._columns:
+            del self._columns[key]
+        else:
+            del self._constants[key]
+
+    def __iter__(self):
+        yield from self._columns
+        yield from self._constants
+
+    def __len__(self) -> int:
+        return len(self._columns) + len(self._constants)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping) or set(self) != set(other):
+            return False
+        return all(np.array_equal(self[name], other[name]) for name in self)
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self._columns, self._constants, self._n_rows, self._record_type
+
+    def __setstate__(self, state) -> None:
+        self._columns, self._constants, self._n_rows, self._record_type = state
+
+    def row(self, index: int):
+        """
+        One row as a record (when the set was built from records) or a dict.
+        """
+        if not -self.n_rows <= index < self.n_rows:
+            raise IndexError(f"Row {index} is out of range for {self.n_rows} rows")
+        values = {}
+        for name, column in self._columns.items():
+            value = column[index]
+            values[name] = (
+                value.tolist() if isinstance(value, np.ndarray) else _python_scalar(value)
+            )
+        values.update(self._constants)
+        if self._record_type is not None:
+            return self._record_type(**values)
+        return values
+
+    def to_dict(self) -> Dict:
+        """
+        Plain dict of columns and constants, as returned before result sets.
+        """
+        return dict(self.items())
+
+    def save_npz(self, path, compressed: bool = False) -> None:
+        """
+        Write the columns to an ``.npz`` archive.
+
+        Constants are stored as JSON. Object columns (e.g. segment labels)
+        need ``allow_pickle=True`` when loading.
+        """
+        arrays = dict(self._columns)
+        arrays["__constants__"] = np.array(json.dumps(self._constants))
+        (np.savez_compressed if compressed else np.savez)(path, **arrays)
+
+    @classmethod
+    def load_npz(cls, path, allow_pickle: bool = False) -> "ResultSet":
+        """
+        Read a result set written by ``save_npz``.
+        """
+        with np.load(path, allow_pickle=allow_pickle) as archive:
+            constants = json.loads(str(archive["__constants__"]))
+            columns = {name: archive[name] for name in archive.files if name != "__constants__"}
+        columns.update(constants)
+        return cls(columns)
+
+    def to_arrow(self):
+        """
+        Convert to a ``pyarrow.Table`` (requires pyarrow).
+
+        Numeric columns are wrapped without copying where Arrow allows it;
+        columns with trailing dimensions become fixed-size lists and the
+        constants are kept in the schema metadata.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Arrow export requires pyarrow: pip install pyarrow") from None
+
+        arrays = {}
+        for name, column in self._columns.items():
+            if column.ndim == 1:
+                arrays[name] = pa.array(column)
+            else:
+                width = int(np.prod(column.shape[1:]))
+                flat = pa.array(np.ascontiguousarray(column).reshape(-1))
+                arrays[name] = pa.FixedSizeListArray.from_arrays(flat, width)
+        metadata = {"constants": json.dumps(self._constants)}
+        return pa.table(arrays, metadata=metadata)
+
+    def __repr__(self) -> str:
+        return (
+            f"ResultSet(n_rows={self.n_rows}, columns={list(self._columns)}, "
+            f"constants={self._constants})"
+        )
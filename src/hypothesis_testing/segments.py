@@ -0,0 +1,176 @@
+"""
+Segment aggregation
+Author: Gabriel Demetrios Lafis
+Description: One-pass per-slice conversion counts from per-unit arrays and segment codes
+"""
+
+from itertools import combinations
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Combined keys are re-compressed before their radix product can overflow int64
+_KEY_LIMIT = 2**62
+
+# Cross-products up to this size (or the number of units) use a lookup table
+_DENSE_LIMIT = 2**20
+
+
+def _factorize(values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integer-code a segment column; returns (levels, codes).
+    """
+    levels, codes = np.unique(np.asarray(values), return_inverse=True)
+    return levels, codes.ravel().astype(np.int64)
+
+
+def _group_slices(
+    n_units: int, codes: Sequence[np.ndarray], cardinalities: Sequence[int]
+) -> Tuple[np.ndarray, list]:
+    """
+    Map every unit to its slice of the grouping.
+
+    Codes are combined into one mixed-radix integer key per unit. When the
+    radix product is small the keys are compacted through a bincount lookup
+    table; otherwise (or when the product would overflow) observed keys are
+    found with ``np.unique``, so memory never depends on the size of the full
+    cross-product.
+
+    Returns:
+    --------
+    tuple : (slice index of each unit, level codes of each slice per dimension)
+    """
+    radix = int(np.prod(cardinalities, dtype=object)) if codes else 1
+    if radix <= max(n_units, _DENSE_LIMIT):
+        key = np.zeros(n_units, dtype=np.int64)
+        for code, cardinality in zip(codes, cardinalities):
+            key = key * cardinality + code
+        observed = np.flatnonzero(np.bincount(key, minlength=radix))
+        lookup = np.zeros(radix, dtype=np.int64)
+        lookup[observed] = np.arange(observed.size)
+        slice_codes = np.unravel_index(observed, cardinalities) if codes else ()
+        return lookup[key], list(slice_codes)
+
+    key = np.zeros(n_units, dtype=np.int64)
+    radix = 1
+    for code, cardinality in zip(codes, cardinalities):
+        if radix * cardinality >= _KEY_LIMIT:
+            uniques, key = np.unique(key, return_inverse=True)
+            key = key.ravel().astype(np.int64)
+            radix = uniques.size
+        key = key * cardinality + code
+        radix *= cardinality
+    _, first, group = np.unique(key, return_index=True, return_inverse=True)
+    return group.ravel(), [code[first] for code in codes]
+
+
+def default_groupings(dimensions: Sequence[str]) -> list:
+    """
+    Every non-empty combination of the segment dimensions.
+    """
+    return [
+        grouping
+        for size in range(1, len(dimensions) + 1)
+        for grouping in combinations(dimensions, size)
+    ]
+
+
+def segment_counts(
+    arms,
+    converted,
+    segments: Mapping[str, np.ndarray],
+    by: Optional[Sequence[Sequence[str]]] = None,
+) -> Dict:
+    """
+    Conversions and visitors per arm for every observed segment slice.
+
+    Parameters:
+    -----------
+    arms : array-like
+        Arm of each unit (0 = group A, 1 = group B)
+    converted : array-like
+        Whether each unit converted (0/1 or bool)
+    segments : mapping of str to array-like
+        Segment value of each unit per dimension (any dtype)
+    by : sequence of sequences of str, optional
+        Groupings to slice by, e.g. ``[("country",), ("country", "platform")]``.
+        An empty grouping is the overall experiment. Defaults to every
+        non-empty combination of the dimensions.
+
+    Returns:
+    --------
+    dict : Columnar counts with one entry per slice: ``grouping`` (tuple of
+        dimension names), one column per dimension with the slice's level
+        (None when the dimension is not part of the grouping),
+        ``conversions_a``, ``visitors_a``, ``conversions_b`` and
+        ``visitors_b``
+    """
+    arms = np.asarray(arms).ravel()
+    converted = np.asarray(converted, dtype=np.float64).ravel()
+    n_units = arms.size
+    if converted.size != n_units:
+        raise ValueError("arms and converted must have the same length")
+    if np.any((arms != 0) & (arms != 1)):
+        raise ValueError("arms must contain only 0 (group A) and 1 (group B)")
+    if np.any((converted != 0) & (converted != 1)):
+        raise ValueError("converted must contain only 0 and 1")
+    arms = arms.astype(np.int64)
+
+    dimensions = list(segments)
+    groupings = default_groupings(dimensions) if by is None else [tuple(g) for g in by]
+    for grouping in groupings:
+        unknown = set(grouping) - set(dimensions)
+        if unknown:
+            raise ValueError(f"Unknown segment dimensions: {sorted(unknown)}")
+
+    factorized = {}
+    for name in dimensions:
+        if any(name in grouping for grouping in groupings):
+            levels, codes = _factorize(segments[name])
+            if codes.size != n_units:
+                raise ValueError(f"Segment '{name}' must have one value per unit")
+            factorized[name] = (levels, codes)
+
+    grouping_column, level_columns = [], {name: [] for name in dimensions}
+    count_columns = {
+        name: [] for name in ("conversions_a", "visitors_a", "conversions_b", "visitors_b")
+    }
+
+    for grouping in groupings:
+        group, slice_codes = _group_slices(
+            n_units,
+            [factorized[name][1] for name in grouping],
+            [factorized[name][0].size for name in grouping],
+        )
+        n_groups = int(group.max()) + 1 if n_units else 0
+
+        cell = group * 2 + arms
+        visitors = np.bincount(cell, minlength=2 * n_groups).reshape(n_groups, 2)
+        conversions = np.bincount(cell, weights=converted, minlength=2 * n_groups).reshape(
+            n_groups, 2
+        )
+        count_columns["conversions_a"].append(conversions[:, 0])
+        count_columns["visitors_a"].append(visitors[:, 0])
+        count_columns["conversions_b"].append(conversions[:, 1])
+        count_columns["visitors_b"].append(visitors[:, 1])
+
+        labels = np.empty(n_groups, dtype=object)
+        labels.fill(grouping)
+        grouping_column.append(labels)
+        for name in dimensions:
+            if name in grouping:
+                levels = factorized[name][0]
+                code = slice_codes[grouping.index(name)]
+                level_columns[name].append(levels[code].astype(object))
+            else:
+                level_columns[name].append(np.full(n_groups, None, dtype=object))
+
+    def concat(parts, dtype):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    results = {"grouping": concat(grouping_column, object)}
+    for name in dimensions:
+        results[name] = concat(level_columns[name], object)
+    for name, parts in count_columns.items():
+        results[name] = concat(parts, np.float64).astype(np.int64)
+    return results
@@ -0,0 +1,325 @@
+"""
+Sequential A/B testing
+Author: Gabriel Demetrios Lafis
+Description: Group-sequential alpha-spending designs and mSPRT always-valid p-values
+"""
+
+import numpy as np
+from typing import Dict, Optional
+
+from ._distributions import norm_cdf, norm_ppf
+from .ab_test import ABTest
+
+SPENDING_FUNCTIONS = ("obrien_fleming", "pocock")
+
+
+def alpha_spent(spending: str, information_fraction, alpha: float):
+    """
+    Cumulative type I error spent at an information fraction (Lan-DeMets).
+
+    Parameters:
+    -----------
+    spending : str
+        "obrien_fleming" or "pocock"
+    information_fraction : float or array-like
+        Fraction of the maximum information observed so far (0 to 1)
+    alpha : float
+        Total two-sided significance level
+
+    Returns:
+    --------
+    float or np.ndarray : Cumulative alpha spent
+    """
+    t = np.clip(np.asarray(information_fraction, dtype=np.float64), 0.0, 1.0)
+    if spending == "obrien_fleming":
+        # Two-sided version: alpha / 2 spent on each side
+        with np.errstate(divide="ignore"):
+            spent = 4 * (1 - norm_cdf(norm_ppf(1 - alpha / 4) / np.sqrt(t)))
+    elif spending == "pocock":
+        spent = alpha * np.log(1 + (np.e - 1) * t)
+    else:
+        raise ValueError(f"spending must be one of {SPENDING_FUNCTIONS}")
+    return spent
+
+
+class GroupSequentialTest:
+    """
+    Group-sequential two-proportion test with Lan-DeMets alpha spending.
+
+    Boundaries are derived look by look, so looks do not have to be planned
+    in advance. Between looks only the sub-density of the test statistic on
+    the continuation region is kept (a fixed-size grid), so each update costs
+    the same regardless of how much data or how many looks came before.
+    """
+
+    def __init__(
+        self,
+        ab_test: ABTest,
+        max_sample_size: Optional[int] = None,
+        baseline_rate: Optional[float] = None,
+        mde: Optional[float] = None,
+        spending: str = "obrien_fleming",
+        inflation: float = 1.0,
+        grid_size: int = 401,
+    ):
+        """
+        Initialize the sequential design.
+
+        Parameters:
+        -----------
+        ab_test : ABTest
+            Framework supplying alpha (and power when the maximum sample size
+            is derived from baseline_rate and mde)
+        max_sample_size : int, optional
+            Maximum number of visitors per group
+        baseline_rate : float, optional
+            Baseline conversion rate used to size the test when
+            max_sample_size is omitted
+        mde : float, optional
+            Relative minimum detectable effect used to size the test
+        spending : str
+            Alpha-spending function: "obrien_fleming" or "pocock"
+        inflation : float
+            Factor applied to the fixed-horizon sample size to compensate
+            for the power lost to interim looks
+        grid_size : int
+            Number of grid points used for the continuation-region density
+        """
+        if spending not in SPENDING_FUNCTIONS:
+            raise ValueError(f"spending must be one of {SPENDING_FUNCTIONS}")
+        if max_sample_size is None:
+            if baseline_rate is None or mde is None:
+                raise ValueError("Provide max_sample_size or both baseline_rate and mde")
+            max_sample_size = int(
+                np.ceil(ab_test.calculate_sample_size(baseline_rate, mde) * inflation)
+            )
+        if max_sample_size <= 0:
+            raise ValueError("max_sample_size must be greater than 0")
+
+        self.ab_test = ab_test
+        self.max_sample_size = max_sample_size
+        self.spending = spending
+        self.grid_size = grid_size
+
+        self.look = 0
+        self.stopped = False
+        self.information_fraction = 0.0
+        self.alpha_spent = 0.0
+        # Sub-density of the Brownian score B(t) on the continuation region,
+        # stored as grid points and quadrature weights. B(0) = 0.
+        self._points = np.zeros(1)
+        self._weights = np.ones(1)
+
+    def _crossing_probability(self, boundary: float, variance: float) -> float:
+        """
+        Probability of first crossing +/- boundary at the next look.
+        """
+        sd = np.sqrt(variance)
+        stay = norm_cdf((boundary - self._points) / sd) - norm_cdf(
+            (-boundary - self._points) / sd
+        )
+        return float(np.sum(self._weights * (1 - stay)))
+
+    def _advance(self, t: float, target_spend: float) -> float:
+        """
+        Compute the score-scale boundary for the look at information ``t`` and
+        move the continuation-region density forward.
+        """
+        variance = t - self.information_fraction
+        increment = target_spend - self.alpha_spent
+        sd_total = np.sqrt(t)
+
+        if increment <= 0:
+            boundary = np.inf
+        else:
+            remaining = self._crossing_probability(0.0, variance)
+            if increment >= remaining:
+                boundary = 0.0
+            else:
+                from scipy import optimize
+
+                boundary = optimize.brentq(
+                    lambda b: self._crossing_probability(b, variance) - increment,
+                    0.0,
+                    12 * sd_total,
+                    xtol=1e-10,
+                )
+
+        # New density on the continuation region (-boundary, boundary)
+        half_width = min(boundary, 8 * sd_total)
+        points = np.linspace(-half_width, half_width, self.grid_size)
+        sd = np.sqrt(variance)
+        scaled = (points[:, None] - self._points[None, :]) / sd
+        kernel = np.exp(-0.5 * scaled**2) / (sd * np.sqrt(2 * np.pi))
+        density = kernel @ self._weights
+        step = points[1] - points[0] if self.grid_size > 1 else 0.0
+        # Trapezoidal quadrature weights
+        weights = density * step
+        weights[[0, -1]] *= 0.5
+
+        self._points = points
+        self._weights = weights
+        return boundary
+
+    def update(
+        self, conversions_a: int, visitors_a: int, conversions_b: int, visitors_b: int
+    ) -> Dict:
+        """
+        Evaluate an interim look on cumulative counts.
+
+        Parameters:
+        -----------
+        conversions_a : int
+            Cumulative conversions in group A
+        visitors_a : int
+            Cumulative visitors in group A
+        conversions_b : int
+            Cumulative conversions in group B
+        visitors_b : int
+            Cumulative visitors in group B
+
+        Returns:
+        --------
+        dict : z-statistic, z-scale boundary, alpha spent so far and whether
+            the experiment can stop
+        """
+        if self.stopped:
+            raise ValueError("The experiment has already stopped")
+
+        results = self.ab_test.two_proportion_ztest(
+            conversions_a, visitors_a, conversions_b, visitors_b
+        )
+
+        # Information for a difference in proportions is proportional to
+        # 1 / (1 / n_a + 1 / n_b); its maximum is max_sample_size / 2.
+        information = 1 / (1 / visitors_a + 1 / visitors_b)
+        t = min(information / (self.max_sample_size / 2), 1.0)
+        if t <= self.information_fraction:
+            raise ValueError("Each look must add information")
+
+        final = t >= 1.0
+        target_spend = (
+            self.ab_test.alpha
+            if final
+            else float(alpha_spent(self.spending, t, self.ab_test.alpha))
+        )
+        boundary = self._advance(t, target_spend) / np.sqrt(t)
+
+        self.look += 1
+        self.information_fraction = t
+        self.alpha_spent = target_spend
+
+        z_stat = results["z_statistic"]
+        reject = bool(abs(z_stat) >= boundary)
+        self.stopped = reject or final
+
+        return {
+            "look": self.look,
+            "information_fraction": t,
+            "z_statistic": z_stat,
+            "boundary": float(boundary),
+            "nominal_alpha": float(2 * (1 - norm_cdf(boundary))),
+            "alpha_spent": self.alpha_spent,
+            "p_value": results["p_value"],
+            "reject_null": reject,
+            "stop": self.stopped,
+        }
+
+
+class MSPRTTest:
+    """
+    Mixture sequential probability ratio test with always-valid p-values.
+
+    The p-value may be checked after every observation without inflating
+    the type I error. Only the running p-value is kept between updates.
+    """
+
+    def __init__(
+        self,
+        ab_test: ABTest,
+        tau: Optional[float] = None,
+        baseline_rate: Optional[float] = None,
+        mde: Optional[float] = None,
+    ):
+        """
+        Initialize the test.
+
+        Parameters:
+        -----------
+        ab_test : ABTest
+            Framework supplying alpha
+        tau : float, optional
+            Standard deviation of the normal mixing distribution over the
+            absolute difference in conversion rates
+        baseline_rate : float, optional
+            Used with mde to set tau = baseline_rate * mde when tau is omitted
+        mde : float, optional
+            Relative minimum detectable effect
+        """
+        if tau is None:
+            if baseline_rate is None or mde is None:
+                raise ValueError("Provide tau or both baseline_rate and mde")
+            tau = baseline_rate * mde
+        if tau <= 0:
+            raise ValueError("tau must be greater than 0")
+
+        self.ab_test = ab_test
+        self.tau = tau
+        self.p_value = 1.0
+        self.confidence_interval = (-np.inf, np.inf)
+        self.stopped = False
+
+    def update(
+        self, conversions_a: int, visitors_a: int, conversions_b: int, visitors_b: int
+    ) -> Dict:
+        """
+        Update the always-valid p-value with cumulative counts.
+
+        Returns:
+        --------
+        dict : Mixture likelihood ratio, always-valid p-value and confidence
+            interval, and whether the null hypothesis can be rejected
+        """
+        results = self.ab_test.two_proportion_ztest(
+            conversions_a, visitors_a, conversions_b, visitors_b
+        )
+        diff = results["absolute_difference"]
+        tau2 = self.tau**2
+
+        p_pooled = (conversions_a + conversions_b) / (visitors_a + visitors_b)
+        variance = p_pooled * (1 - p_pooled) * (1 / visitors_a + 1 / visitors_b)
+        if variance > 0:
+            likelihood_ratio = np.sqrt(variance / (variance + tau2)) * np.exp(
+                tau2 * diff**2 / (2 * variance * (variance + tau2))
+            )
+            self.p_value = min(self.p_value, 1 / likelihood_ratio)
+        else:
+            likelihood_ratio = 1.0
+
+        p_a = results["conversion_rate_a"]
+        p_b = results["conversion_rate_b"]
+        variance_diff = p_a * (1 - p_a) / visitors_a + p_b * (1 - p_b) / visitors_b
+        if variance_diff > 0:
+            half_width = np.sqrt(
+                variance_diff
+                * (variance_diff + tau2)
+                / tau2
+                * (np.log((variance_diff + tau2) / variance_diff) - 2 * np.log(self.ab_test.alpha))
+            )
+            # Always-valid intervals may be intersected across looks
+            self.confidence_interval = (
+                max(self.confidence_interval[0], diff - half_width),
+                min(self.confidence_interval[1], diff + half_width),
+            )
+
+        reject = bool(self.p_value <= self.ab_test.alpha)
+        self.stopped = self.stopped or reject
+
+        return {
+            "absolute_difference": diff,
+            "likelihood_ratio": float(likelihood_ratio),
+            "p_value": float(self.p_value),
+            "confidence_interval": self.confidence_interval,
+            "reject_null": reject,
+            "stop": self.stopped,
+        }
@@ -0,0 +1,585 @@
+"""
+Asyncio readout service
+Author: Gabriel Demetrios Lafis
+Description: Local HTTP/JSON front-end for ABTest with micro-batching and request coalescing
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ab_test import ABTest
+
+_COUNT_FIELDS = ("conversions_a", "visitors_a", "conversions_b", "visitors_b")
+_BAYESIAN_OPTIONS = ("n_simulations", "method", "seed", "key", "tolerance")
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+def _to_json(value):
+    """
+    Convert result mappings, NumPy scalars and arrays to JSON-compatible values.
+
+    Non-finite floats (e.g. the z statistic when both arms convert fully)
+    become None, since NaN and Infinity are not valid JSON.
+    """
+    if isinstance(value, Mapping):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return _to_json(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _parse_counts(payload: Dict) -> Tuple[int, int, int, int]:
+    """
+    Extract and validate the four counts of a request body.
+    """
+    try:
+        counts = tuple(int(payload[name]) for name in _COUNT_FIELDS)
+    except KeyError as exc:
+        raise ValueError(f"Missing field: {exc.args[0]}") from None
+    except (TypeError, ValueError):
+        raise ValueError("Counts must be integers") from None
+    conversions_a, visitors_a, conversions_b, visitors_b = counts
+    if visitors_a <= 0 or visitors_b <= 0:
+        raise ValueError("Number of visitors must be greater than 0")
+    if conversions_a < 0 or conversions_b < 0:
+        raise ValueError("Number of conversions cannot be negative")
+    if conversions_a > visitors_a or conversions_b > visitors_b:
+        raise ValueError("Conversions cannot exceed visitors")
+    return counts
+
+
+def _parse_options(payload: Dict) -> Dict:
+    """
+    Extract and validate the Bayesian options of a request body.
+    """
+    options = {name: payload[name] for name in _BAYESIAN_OPTIONS if name in payload}
+    n_simulations = options.get("n_simulations")
+    if n_simulations is not None and (
+        not isinstance(n_simulations, int) or isinstance(n_simulations, bool) or n_simulations <= 0
+    ):
+        raise ValueError("n_simulations must be a positive integer")
+    if options.get("method", "monte_carlo") not in ("monte_carlo", "exact"):
+        raise ValueError("method must be 'monte_carlo' or 'exact'")
+    seed = options.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+        raise ValueError("seed must be a non-negative integer")
+    if not isinstance(options.get("key"), (str, int, float, type(None))):
+        raise ValueError("key must be a string or a number")
+    tolerance = options.get("tolerance")
+    if tolerance is not None and (
+        not isinstance(tolerance, (int, float)) or isinstance(tolerance, bool) or not tolerance > 0
+    ):
+        raise ValueError("tolerance must be a positive number")
+    return options
+
+
+def _response(status: int, payload: Dict, keep_alive: bool) -> bytes:
+    """
+    Encode one HTTP/1.1 JSON response.
+    """
+    data = json.dumps(_to_json(payload), allow_nan=False).encode("utf-8")
+    return (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    ).encode("latin-1") + data
+
+
+class ABTestService:
+    """
+    Serves ``ABTest`` readouts over a minimal HTTP/JSON interface.
+
+    Endpoints:
+      - POST /ztest: two-proportion z-test. Concurrent requests are collected
+        for up to ``batch_window`` seconds and evaluated with one
+        ``two_proportion_ztest_batch`` call.
+      - POST /bayesian: Bayesian A/B test. Requests with ``method="exact"``
+        are micro-batched like z-tests and evaluated together; Monte Carlo
+        requests run one by one on the executor so they never block the
+        event loop.
+      - GET /stats: queue depth, in-flight work, counters and p50/p99 latency.
+
+    Identical requests that arrive while an equal one is still pending share
+    its result instead of being computed again.
+    """
+
+    def __init__(
+        self,
+        ab_test: Optional[ABTest] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        batch_window: float = 0.002,
+        max_batch_size: int = 4096,
+        executor: Optional[Executor] = None,
+        latency_window: int = 10000,
+    ):
+        """
+        Initialize the service.
+
+        Parameters:
+        -----------
+        ab_test : ABTest, optional
+            Framework used for every readout (defaults to ``ABTest()``)
+        host : str
+            Interface to bind
+        port : int
+            Port to bind (0 picks a free port; see ``port`` after ``start``)
+        batch_window : float
+            Seconds to wait for more batched requests after the first one
+        max_batch_size : int
+            Largest number of requests evaluated in one batch
+        executor : concurrent.futures.Executor, optional
+            Executor for CPU-heavy work (defaults to a thread pool)
+        latency_window : int
+            Number of recent request latencies kept for the percentiles
+        """
+        if batch_window < 0:
+            raise ValueError("batch_window cannot be negative")
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be greater than 0")
+        self.ab_test = ab_test if ab_test is not None else ABTest()
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._executor = executor
+        self._owns_executor = executor is None
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._batchers: List[asyncio.Task] = []
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+        self._latencies = deque(maxlen=latency_window)
+        self._in_flight = 0
+        self.counters = {"requests": 0, "errors": 0, "batches": 0, "batched": 0, "coalesced": 0}
+
+    async def start(self) -> None:
+        """
+        Bind the socket and start the micro-batchers.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor()
+        for name, run in (("ztest", _run_ztest_batch), ("bayesian_exact", _run_exact_batch)):
+            self._queues[name] = asyncio.Queue()
+            self._batchers.append(asyncio.create_task(self._run_batcher(self._queues[name], run)))
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stop accepting connections and shut the batchers down.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for batcher in self._batchers:
+            batcher.cancel()
+            try:
+                await batcher
+            except asyncio.CancelledError:
+                pass
+        self._batchers = []
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def serve_forever(self) -> None:
+        """
+        Start the service and run until cancelled.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self) -> "ABTestService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def stats(self) -> Dict:
+        """
+        Queue depth, in-flight work, counters and latency percentiles (ms).
+        """
+        latencies = np.array(self._latencies) * 1e3
+        return {
+            "queue_depth": sum(queue.qsize() for queue in self._queues.values()),
+            "in_flight": self._in_flight,
+            "pending_keys": len(self._pending),
+            **self.counters,
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies.size else None,
+            "latency_p99_ms": float(np.percentile(latencies, 99)) if latencies.size else None,
+        }
+
+    async def _coalesce(self, key: Tuple, compute) -> Dict:
+        """
+        Share one pending computation among identical requests.
+        """
+        future = self._pending.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await compute()
+        except BaseException as exc:
+            if isinstance(exc, Exception):
+                future.set_exception(exc)
+            else:
+                # The leading request was cancelled; waiters fail instead of hanging
+                future.set_exception(RuntimeError("The shared computation was cancelled"))
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._pending[key]
+
+    async def _batched(self, name: str, counts: Tuple[int, int, int, int]) -> Dict:
+        """
+        Queue one request for the next micro-batch of ``name``.
+        """
+
+        async def compute():
+            future = asyncio.get_running_loop().create_future()
+            await self._queues[name].put((counts, future))
+            return await future
+
+        return await self._coalesce((name,) + counts, compute)
+
+    async def ztest(self, counts: Tuple[int, int, int, int]) -> Dict:
+        """
+        Queue one z-test for the next micro-batch.
+        """
+        return await self._batched("ztest", counts)
+
+    async def bayesian(self, counts: Tuple[int, int, int, int], options: Dict) -> Dict:
+        """
+        Run one Bayesian A/B test: exact tests join the next micro-batch,
+        Monte Carlo tests run on the executor.
+        """
+        if options.get("method") == "exact":
+            # The simulation options do not affect exact results
+            return await self._batched("bayesian_exact", counts)
+
+        async def compute():
+            loop = asyncio.get_running_loop()
+            self._in_flight += 1
+            try:
+                result = await loop.run_in_executor(
+                    self._executor, _run_bayesian, self.ab_test, counts, options
+                )
+            finally:
+                self._in_flight -= 1
+            return result
+
+        key = ("bayesian",) + counts + tuple(sorted((k, repr(v)) for k, v in options.items()))
+        return await self._coalesce(key, compute)
+
+    async def _run_batcher(self, queue: asyncio.Queue, run) -> None:
+        """
+        Collect queued requests into batches and evaluate them on the executor.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            counts = np.array([item[0] for item in batch], dtype=np.int64)
+            self._in_flight += 1
+            try:
+                results = await loop.run_in_executor(self._executor, run, self.ab_test, counts)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            finally:
+                self._in_flight -= 1
+            self.counters["batches"] += 1
+            self.counters["batched"] += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer) -> None:
+        """
+        Serve HTTP/1.1 requests on one (keep-alive) connection.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                    if length < 0:
+                        raise ValueError
+                except ValueError:
+                    # The body cannot be delimited, so the connection is unusable
+                    self.counters["errors"] += 1
+                    writer.write(_response(400, {"error": "Invalid Content-Length"}, False))
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length)
+
+                start = time.perf_counter()
+                status, payload = await self._dispatch(method, path, body)
+                self._latencies.append(time.perf_counter() - start)
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        """
+        Route one request and turn errors into JSON responses.
+        """
+        if path == "/stats":
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            return 200, self.stats()
+        if path not in ("/ztest", "/bayesian"):
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+
+        self.counters["requests"] += 1
+        try:
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            counts = _parse_counts(payload)
+            if path == "/ztest":
+                result = await self.ztest(counts)
+            else:
+                result = await self.bayesian(counts, _parse_options(payload))
+        except ValueError as exc:
+            self.counters["errors"] += 1
+            return 400, {"error": str(exc)}
+        except Exception as exc:
+            # Never drop the connection without an answer
+            self.counters["errors"] += 1
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+        return 200, result
+
+
+def _run_ztest_batch(ab_test: ABTest, counts: np.ndarray) -> List[Dict]:
+    """
+    Evaluate a batch of z-tests and split the columns into per-request dicts.
+    """
+    columns = ab_test.two_proportion_ztest_batch(*counts.T)
+    n = counts.shape[0]
+    rows = {
+        name: values.tolist()
+        for name, values in columns.items()
+        if isinstance(values, np.ndarray) and name not in ("ci_lower", "ci_upper")
+    }
+    ci_lower = columns["ci_lower"].tolist()
+    ci_upper = columns["ci_upper"].tolist()
+    return [
+        {
+            **{name: values[i] for name, values in rows.items()},
+            "confidence_interval": [ci_lower[i], ci_upper[i]],
+            "confidence_level": columns["confidence_level"],
+        }
+        for i in range(n)
+    ]
+
+
+def _run_exact_batch(ab_test: ABTest, counts: np.ndarray) -> List[Dict]:
+    """
+    Evaluate a batch of exact Bayesian A/B tests.
+    """
+    return [_to_json(result) for result in ab_test._bayesian_exact_batch(*counts.T)]
+
+
+def _run_bayesian(ab_test: ABTest, counts: Tuple[int, int, int, int], options: Dict) -> Dict:
+    return _to_json(ab_test.bayesian_ab_test(*counts, **options))
+
+
+async def _request(
+    reader: asyncio.StreamReader, writer, path: str, payload: Optional[Dict]
+) -> Tuple[int, Dict]:
+    """
+    Send one keep-alive request and read the response.
+    """
+    method = "GET" if payload is None else "POST"
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    writer.write(
+        (
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def load_test(
+    host: str,
+    port: int,
+    payloads: Sequence[Dict],
+    path: str = "/ztest",
+    n_requests: int = 10000,
+    concurrency: int = 64,
+) -> Dict:
+    """
+    Drive a running service with concurrent keep-alive clients.
+
+    Parameters:
+    -----------
+    host : str
+        Service host
+    port : int
+        Service port
+    payloads : sequence of dict
+        Request bodies, used round-robin
+    path : str
+        Endpoint to call
+    n_requests : int
+        Total number of requests
+    concurrency : int
+        Number of concurrent connections
+
+    Returns:
+    --------
+    dict : Throughput, client-side p50/p99 latency (ms), error count and the
+        service's own /stats after the run
+    """
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(n_requests))
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for i in counter:
+                start = time.perf_counter()
+                status, _ = await _request(reader, writer, path, payloads[i % len(payloads)])
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, server_stats = await _request(reader, writer, "/stats", None)
+    finally:
+        writer.close()
+
+    latencies_ms = np.array(latencies) * 1e3
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "latency_p50_ms": float(np.percentile(latencies_ms, 50)),
+        "latency_p99_ms": float(np.percentile(latencies_ms, 99)),
+        "server": server_stats,
+    }
+
+
+async def _local_load_test(n_requests: int, concurrency: int, distinct: int) -> Dict:
+    rng = np.random.default_rng(0)
+    visitors = rng.integers(1000, 100000, (distinct, 2))
+    conversions = rng.binomial(visitors, 0.1)
+    payloads = [
+        dict(zip(_COUNT_FIELDS, map(int, (c[0], v[0], c[1], v[1]))))
+        for c, v in zip(conversions, visitors)
+    ]
+    async with ABTestService() as service:
+        return await load_test(
+            service.host, service.port, payloads, n_requests=n_requests, concurrency=concurrency
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve ABTest readouts over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--load-test", type=int, metavar="N", help="Run N requests against a local instance"
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--distinct", type=int, default=1000, help="Distinct request bodies")
+    args = parser.parse_args()
+
+    if args.load_test:
+        report = asyncio.run(_local_load_test(args.load_test, args.concurrency, args.distinct))
+        print(json.dumps(report, indent=2))
+    else:
+        try:
+            asyncio.run(ABTestService(host=args.host, port=args.port).serve_forever())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,427 @@
+"""
+Experiment state store
+Author: Gabriel Demetrios Lafis
+Description: Persistent per-experiment arm counts and priors with a snapshot, write-ahead log and mmap reads
+"""
+
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .posteriors import BetaPosterior
+
+# One row per (experiment, arm); arm PRIOR_ARM holds the experiment's prior
+STATE_DTYPE = np.dtype(
+    [
+        ("experiment_id", "<i8"),
+        ("arm", "<i8"),
+        ("conversions", "<i8"),
+        ("visitors", "<i8"),
+        ("prior_alpha", "<f8"),
+        ("prior_beta", "<f8"),
+    ]
+)
+PRIOR_ARM = -1
+
+# Write-ahead log frame: magic, row count, CRC32 of the payload
+_FRAME_HEADER = struct.Struct("<4sII")
+_FRAME_MAGIC = b"ABW1"
+
+# Log size past which the store compacts itself
+DEFAULT_MAX_LOG_BYTES = 64 * 1024 * 1024
+
+
+def _aggregate(rows: np.ndarray) -> np.ndarray:
+    """
+    Collapse rows to one per (experiment, arm), sorted by key.
+
+    Counts are summed; the prior is the last one set (rows with NaN priors
+    leave it unchanged).
+    """
+    if rows.size == 0:
+        return np.empty(0, dtype=STATE_DTYPE)
+    order = np.lexsort((rows["arm"], rows["experiment_id"]))
+    ordered = rows[order]
+    new_group = np.empty(ordered.size, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = (np.diff(ordered["experiment_id"]) != 0) | (np.diff(ordered["arm"]) != 0)
+    starts = np.flatnonzero(new_group)
+
+    merged = np.empty(starts.size, dtype=STATE_DTYPE)
+    merged["experiment_id"] = ordered["experiment_id"][starts]
+    merged["arm"] = ordered["arm"][starts]
+    merged["conversions"] = np.add.reduceat(ordered["conversions"], starts)
+    merged["visitors"] = np.add.reduceat(ordered["visitors"], starts)
+
+    # lexsort is stable, so later writes come later within each group
+    group = np.cumsum(new_group) - 1
+    has_prior = np.flatnonzero(~np.isnan(ordered["prior_alpha"]))
+    last = np.full(starts.size, -1)
+    last[group[has_prior]] = has_prior
+    merged["prior_alpha"] = np.where(last >= 0, ordered["prior_alpha"][last], np.nan)
+    merged["prior_beta"] = np.where(last >= 0, ordered["prior_beta"][last], np.nan)
+    return merged
+
+
+class ExperimentStore:
+    """
+    Durable on-disk store of per-experiment arm counters and priors.
+
+    State lives in a directory holding one snapshot (``snapshot-<gen>.npy``,
+    a sorted structured array) and the write-ahead log of the same
+    generation (``wal-<gen>.log``). Every batch of writes is appended to the
+    log as one checksummed frame, so a crash loses at most the frame being
+    written. Opening the store memory-maps the snapshot and replays only the
+    log, so loading does not depend on reading the snapshot eagerly;
+    ``compact`` folds the log into a new snapshot generation; it also runs
+    on open and after a write once the log exceeds ``max_log_bytes``, which
+    bounds the log and the rows replayed on the next open.
+
+    The store is single-writer: a lock serializes threads of one process,
+    but there is no file lock, so only one process may open a directory for
+    writing at a time.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        prior: Optional[BetaPosterior] = None,
+        sync: bool = True,
+        max_log_bytes: Optional[int] = DEFAULT_MAX_LOG_BYTES,
+    ):
+        """
+        Open (or create) a store.
+
+        Parameters:
+        -----------
+        path : str
+            Directory of the store
+        prior : BetaPosterior, optional
+            Prior of experiments without a stored prior (defaults to Beta(1, 1))
+        sync : bool
+            Whether every batch is fsync'ed to disk before the write returns
+        max_log_bytes : int, optional
+            Log size that triggers an automatic compaction (None disables it)
+        """
+        if max_log_bytes is not None and max_log_bytes <= 0:
+            raise ValueError("max_log_bytes must be positive")
+        self.path = path
+        self.prior = prior if prior is not None else BetaPosterior()
+        self.sync = sync
+        self.max_log_bytes = max_log_bytes
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+        generations = [
+            int(name[len("snapshot-") : -len(".npy")])
+            for name in os.listdir(path)
+            if name.startswith("snapshot-") and name.endswith(".npy")
+        ]
+        self.generation = max(generations, default=0)
+        snapshot = self._file("snapshot", self.generation)
+        if os.path.exists(snapshot):
+            self._base = np.load(snapshot, mmap_mode="r")
+        else:
+            self._base = np.empty(0, dtype=STATE_DTYPE)
+        self._cleanup()
+
+        self._pending: List[np.ndarray] = self._replay()
+        self._merged: Optional[np.ndarray] = None
+        self._wal = open(self._file("wal", self.generation), "ab")
+        self._log_bytes = self._wal.tell()
+        if self._log_full():
+            self.compact()
+
+    def _file(self, kind: str, generation: int) -> str:
+        extension = "npy" if kind == "snapshot" else "log"
+        return os.path.join(self.path, f"{kind}-{generation}.{extension}")
+
+    def _cleanup(self) -> None:
+        """
+        Remove files of older generations left behind by an interrupted compaction.
+        """
+        for name in os.listdir(self.path):
+            stem, _, extension = name.rpartition(".")
+            kind, _, generation = stem.partition("-")
+            if kind in ("snapshot", "wal") and generation.isdigit():
+                if int(generation) < self.generation:
+                    os.remove(os.path.join(self.path, name))
+            elif extension == "tmp":
+                os.remove(os.path.join(self.path, name))
+
+    def _replay(self) -> List[np.ndarray]:
+        """
+        Read the log of the current generation, truncating a torn last frame.
+        """
+        path = self._file("wal", self.generation)
+        if not os.path.exists(path):
+            return []
+        with open(path, "rb") as log:
+            data = log.read()
+
+        frames, offset = [], 0
+        while offset + _FRAME_HEADER.size <= len(data):
+            magic, n_rows, checksum = _FRAME_HEADER.unpack_from(data, offset)
+            start = offset + _FRAME_HEADER.size
+            end = start + n_rows * STATE_DTYPE.itemsize
+            if magic != _FRAME_MAGIC or end > len(data):
+                break
+            payload = data[start:end]
+            if zlib.crc32(payload) != checksum:
+                break
+            frames.append(np.frombuffer(payload, dtype=STATE_DTYPE))
+            offset = end
+        if offset < len(data):
+            with open(path, "r+b") as log:
+                log.truncate(offset)
+        return frames
+
+    def _append(self, rows: np.ndarray) -> None:
+        """
+        Write one batch of rows as a single log frame (lock held).
+        """
+        payload = rows.tobytes()
+        self._wal.write(_FRAME_HEADER.pack(_FRAME_MAGIC, rows.size, zlib.crc32(payload)) + payload)
+        self._wal.flush()
+        if self.sync:
+            os.fsync(self._wal.fileno())
+        self._log_bytes += _FRAME_HEADER.size + len(payload)
+        self._pending.append(rows)
+        self._merged = None
+        if self._log_full():
+            self._compact()
+
+    def _log_full(self) -> bool:
+        return self.max_log_bytes is not None and self._log_bytes >= self.max_log_bytes
+
+    def add_batch(self, experiment_ids, arms, conversions, visitors) -> None:
+        """
+        Add counts for many (experiment, arm) pairs in one durable write.
+
+        Parameters:
+        -----------
+        experiment_ids : array-like of int
+            Experiment of each record
+        arms : array-like of int
+            Arm index (0 for control) of each record
+        conversions : array-like of int
+            Conversions to add
+        visitors : array-like of int
+            Visitors to add
+        """
+        experiment_ids, arms, conversions, visitors = np.broadcast_arrays(
+            np.asarray(experiment_ids, dtype=np.int64),
+            np.asarray(arms, dtype=np.int64),
+            np.asarray(conversions, dtype=np.int64),
+            np.asarray(visitors, dtype=np.int64),
+        )
+        if np.any(arms < 0):
+            raise ValueError("arms must be non-negative")
+        if np.any((conversions < 0) | (conversions > visitors)):
+            raise ValueError("Counts must satisfy 0 <= conversions <= visitors")
+        rows = np.empty(experiment_ids.size, dtype=STATE_DTYPE)
+        rows["experiment_id"] = experiment_ids.ravel()
+        rows["arm"] = arms.ravel()
+        rows["conversions"] = conversions.ravel()
+        rows["visitors"] = visitors.ravel()
+        rows["prior_alpha"] = np.nan
+        rows["prior_beta"] = np.nan
+        with self._lock:
+            self._append(rows)
+
+    def add(self, experiment_id: int, arm: int, conversions: int, visitors: int) -> None:
+        """
+        Add counts for one arm of one experiment.
+        """
+        self.add_batch([experiment_id], [arm], [conversions], [visitors])
+
+    def set_priors(self, experiment_ids, priors) -> None:
+        """
+        Store the prior of each experiment in one durable write.
+
+        Parameters:
+        -----------
+        experiment_ids : array-like of int
+            Experiments to update
+        priors : BetaPosterior or sequence of BetaPosterior
+            Prior per experiment (or one prior for all of them)
+        """
+        experiment_ids = np.atleast_1d(np.asarray(experiment_ids, dtype=np.int64))
+        if isinstance(priors, BetaPosterior):
+            priors = [priors] * experiment_ids.size
+        if len(priors) != experiment_ids.size:
+            raise ValueError("Provide one prior per experiment")
+        rows = np.zeros(experiment_ids.size, dtype=STATE_DTYPE)
+        rows["experiment_id"] = experiment_ids
+        rows["arm"] = PRIOR_ARM
+        rows["prior_alpha"] = [prior.alpha for prior in priors]
+        rows["prior_beta"] = [prior.beta for prior in priors]
+        with self._lock:
+            self._append(rows)
+
+    def table(self) -> np.ndarray:
+        """
+        Current state as a structured array sorted by (experiment_id, arm).
+
+        Without pending log entries this is the memory-mapped snapshot itself
+        (read-only, no copy). Prior rows have ``arm == PRIOR_ARM``.
+        """
+        with self._lock:
+            if not self._pending:
+                return self._base
+            if self._merged is None:
+                self._merged = _aggregate(np.concatenate([self._base, *self._pending]))
+            return self._merged
+
+    def experiment_ids(self) -> np.ndarray:
+        """
+        Ids of every stored experiment.
+        """
+        return np.unique(self.table()["experiment_id"])
+
+    def __len__(self) -> int:
+        return self.experiment_ids().size
+
+    def _rows(self, experiment_id: int) -> np.ndarray:
+        table = self.table()
+        ids = table["experiment_id"]
+        start, end = np.searchsorted(ids, [experiment_id, experiment_id + 1])
+        return table[start:end]
+
+    def counts(self, experiment_id: int) -> Dict[str, np.ndarray]:
+        """
+        Per-arm counts of one experiment.
+
+        Returns:
+        --------
+        dict : {"arms", "conversions", "visitors"} arrays ordered by arm
+        """
+        rows = self._rows(experiment_id)
+        rows = rows[rows["arm"] != PRIOR_ARM]
+        if rows.size == 0:
+            raise KeyError(experiment_id)
+        return {
+            "arms": np.array(rows["arm"]),
+            "conversions": np.array(rows["conversions"]),
+            "visitors": np.array(rows["visitors"]),
+        }
+
+    def get_prior(self, experiment_id: int) -> BetaPosterior:
+        """
+        Stored prior of an experiment (the store default when none was set).
+        """
+        rows = self._rows(experiment_id)
+        rows = rows[(rows["arm"] == PRIOR_ARM) & ~np.isnan(rows["prior_alpha"])]
+        if rows.size == 0:
+            return self.prior.copy()
+        return BetaPosterior(rows["prior_alpha"][0], rows["prior_beta"][0])
+
+    def posterior(self, experiment_id: int, arm: int) -> BetaPosterior:
+        """
+        Posterior of one arm: the experiment's prior updated with its counts.
+        """
+        counts = self.counts(experiment_id)
+        index = np.flatnonzero(counts["arms"] == arm)
+        if index.size == 0:
+            raise KeyError((experiment_id, arm))
+        return self.get_prior(experiment_id).update(
+            int(counts["conversions"][index[0]]), int(counts["visitors"][index[0]])
+        )
+
+    def ab_counts(self, control: int = 0, treatment: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Columnar counts of every experiment that has both arms.
+
+        Returns:
+        --------
+        dict : ``experiment_id``, ``conversions_a``, ``visitors_a``,
+            ``conversions_b`` and ``visitors_b`` arrays, ready for
+            ``ABTest.two_proportion_ztest_batch``
+        """
+        table = self.table()
+        rows_a = table[table["arm"] == control]
+        rows_b = table[table["arm"] == treatment]
+        experiment_ids, index_a, index_b = np.intersect1d(
+            rows_a["experiment_id"], rows_b["experiment_id"], assume_unique=True,
+            return_indices=True,
+        )
+        return {
+            "experiment_id": experiment_ids,
+            "conversions_a": rows_a["conversions"][index_a],
+            "visitors_a": rows_a["visitors"][index_a],
+            "conversions_b": rows_b["conversions"][index_b],
+            "visitors_b": rows_b["visitors"][index_b],
+        }
+
+    def compact(self) -> None:
+        """
+        Fold the write-ahead log into a new snapshot generation.
+
+        The new snapshot is written to a temporary file, synced and renamed
+        before the old generation is removed, so a crash at any point leaves
+        either the old snapshot with its log or the new snapshot.
+        """
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        """
+        Body of ``compact`` (lock held).
+        """
+        if not self._pending:
+            return
+        merged = (
+            self._merged
+            if self._merged is not None
+            else _aggregate(np.concatenate([self._base, *self._pending]))
+        )
+        generation = self.generation + 1
+        target = self._file("snapshot", generation)
+        temporary = target + ".tmp"
+        with open(temporary, "wb") as snapshot:
+            np.save(snapshot, merged)
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temporary, target)
+        self._sync_directory()
+
+        self._wal.close()
+        self.generation = generation
+        self._cleanup()
+        self._wal = open(self._file("wal", generation), "ab")
+        self._base = np.load(target, mmap_mode="r")
+        self._pending = []
+        self._merged = None
+        self._log_bytes = 0
+
+    def _sync_directory(self) -> None:
+        if hasattr(os, "O_DIRECTORY"):
+            descriptor = os.open(self.path, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(descriptor)
+            finally:
+                os.close(descriptor)
+
+    def close(self) -> None:
+        """
+        Close the write-ahead log.
+        """
+        with self._lock:
+            if not self._wal.closed:
+                self._wal.close()
+
+    def __enter__(self) -> "ExperimentStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"ExperimentStore(path={self.path!r}, generation={self.generation}, "
+            f"pending_batches={len(self._pending)})"
+        )
@@ -0,0 +1,210 @@
+"""
+Streaming accumulators for A/B testing
+Author: Gabriel Demetrios Lafis
+Description: O(1) incremental counters that feed ABTest without re-scanning event history
+"""
+
+import numpy as np
+from typing import Dict, Iterable, Optional
+
+from .ab_test import ABTest
+
+
+class ArmAccumulator:
+    """
+    Running conversion and visitor counts for a single experiment arm.
+    """
+
+    __slots__ = ("conversions", "visitors")
+
+    def __init__(self, conversions: int = 0, visitors: int = 0):
+        """
+        Initialize the accumulator.
+
+        Parameters:
+        -----------
+        conversions : int
+            Initial number of conversions
+        visitors : int
+            Initial number of visitors
+        """
+        if conversions < 0 or visitors < 0:
+            raise ValueError("Counts cannot be negative")
+        if conversions > visitors:
+            raise ValueError("Conversions cannot exceed visitors")
+        self.conversions = int(conversions)
+        self.visitors = int(visitors)
+
+    def update(self, converted: bool) -> None:
+        """
+        Ingest a single visitor event.
+
+        Parameters:
+        -----------
+        converted : bool
+            Whether the visitor converted
+        """
+        self.visitors += 1
+        if converted:
+            self.conversions += 1
+
+    def update_batch(self, converted) -> None:
+        """
+        Ingest a micro-batch of visitor events.
+
+        Parameters:
+        -----------
+        converted : array-like of bool
+            One entry per visitor, truthy when the visitor converted
+        """
+        converted = np.asarray(converted)
+        self.visitors += int(converted.size)
+        self.conversions += int(np.count_nonzero(converted))
+
+    def add(self, conversions: int, visitors: int) -> None:
+        """
+        Ingest pre-aggregated counts.
+
+        Parameters:
+        -----------
+        conversions : int
+            Number of conversions to add
+        visitors : int
+            Number of visitors to add
+        """
+        if conversions < 0 or visitors < 0:
+            raise ValueError("Counts cannot be negative")
+        if conversions > visitors:
+            raise ValueError("Conversions cannot exceed visitors")
+        self.conversions += int(conversions)
+        self.visitors += int(visitors)
+
+    def merge(self, other: "ArmAccumulator") -> "ArmAccumulator":
+        """
+        Fold the counts of another accumulator into this one.
+        """
+        self.conversions += other.conversions
+        self.visitors += other.visitors
+        return self
+
+    def __add__(self, other: "ArmAccumulator") -> "ArmAccumulator":
+        return ArmAccumulator(self.conversions + other.conversions, self.visitors + other.visitors)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ArmAccumulator):
+            return NotImplemented
+        return self.conversions == other.conversions and self.visitors == other.visitors
+
+    def __repr__(self) -> str:
+        return f"ArmAccumulator(conversions={self.conversions}, visitors={self.visitors})"
+
+
+class ExperimentAccumulator:
+    """
+    Per-arm accumulators for one experiment, readable at any point in time.
+    """
+
+    __slots__ = ("arms",)
+
+    def __init__(self, arms: Iterable[str] = ("A", "B")):
+        """
+        Initialize the accumulator.
+
+        Parameters:
+        -----------
+        arms : iterable of str
+            Names of the experiment arms
+        """
+        self.arms: Dict[str, ArmAccumulator] = {name: ArmAccumulator() for name in arms}
+        if len(self.arms) < 2:
+            raise ValueError("An experiment needs at least two distinct arms")
+
+    def _arm(self, arm: str) -> ArmAccumulator:
+        try:
+            return self.arms[arm]
+        except KeyError:
+            raise KeyError(f"Unknown arm: {arm!r}") from None
+
+    def update(self, arm: str, converted: bool) -> None:
+        """
+        Ingest a single visitor event for an arm.
+        """
+        self._arm(arm).update(converted)
+
+    def update_batch(self, arm: str, converted) -> None:
+        """
+        Ingest a micro-batch of visitor events for an arm.
+        """
+        self._arm(arm).update_batch(converted)
+
+    def add(self, arm: str, conversions: int, visitors: int) -> None:
+        """
+        Ingest pre-aggregated counts for an arm.
+        """
+        self._arm(arm).add(conversions, visitors)
+
+    def merge(self, other: "ExperimentAccumulator") -> "ExperimentAccumulator":
+        """
+        Fold another accumulator (e.g. from another consumer worker) into this one.
+
+        Arms only present in ``other`` are added.
+        """
+        for name, counts in other.arms.items():
+            if name in self.arms:
+                self.arms[name].merge(counts)
+            else:
+                self.arms[name] = ArmAccumulator(counts.conversions, counts.visitors)
+        return self
+
+    def counts(self, control: Optional[str] = None, treatment: Optional[str] = None) -> Dict:
+        """
+        Return the counts of two arms as keyword arguments for ABTest methods.
+
+        Parameters:
+        -----------
+        control : str, optional
+            Arm used as group A (defaults to the first arm)
+        treatment : str, optional
+            Arm used as group B (defaults to the second arm)
+
+        Returns:
+        --------
+        dict : conversions_a, visitors_a, conversions_b and visitors_b
+        """
+        names = list(self.arms)
+        arm_a = self._arm(names[0] if control is None else control)
+        arm_b = self._arm(names[1] if treatment is None else treatment)
+        return {
+            "conversions_a": arm_a.conversions,
+            "visitors_a": arm_a.visitors,
+            "conversions_b": arm_b.conversions,
+            "visitors_b": arm_b.visitors,
+        }
+
+    def two_proportion_ztest(
+        self,
+        ab_test: ABTest,
+        control: Optional[str] = None,
+        treatment: Optional[str] = None,
+    ) -> Dict:
+        """
+        Run ``ABTest.two_proportion_ztest`` on the current counts.
+        """
+        return ab_test.two_proportion_ztest(**self.counts(control, treatment))
+
+    def bayesian_ab_test(
+        self,
+        ab_test: ABTest,
+        control: Optional[str] = None,
+        treatment: Optional[str] = None,
+        **kwargs,
+    ) -> Dict:
+        """
+        Run ``ABTest.bayesian_ab_test`` on the current counts.
+
+        Extra keyword arguments are passed through (e.g. ``method="exact"``).
+        """
+        return ab_test.bayesian_ab_test(**self.counts(control, treatment), **kwargs)
+
+    def __repr__(self) -> str:
+        return f"ExperimentAccumulator(arms={self.arms!r})"
@@ -3,9 +3,11 @@ Comprehensive test suite for A/B Testing Framework
 Author: Gabriel Demetrios Lafis
 """
 
+from collections.abc import Mapping
+
 import pytest
 import numpy as np
-from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.ab_test import ABTest, _prob_beta_greater
 
 
 class TestABTestInitialization:
@@ -73,6 +75,81 @@ class TestSampleSizeCalculation:
         assert sample_size_90 > sample_size_80
 
 
+class TestSampleSizeGrid:
+    """Test vectorized sample size planning"""
+
+    def test_grid_matches_scalar(self):
+        """Test that every grid cell matches calculate_sample_size"""
+        ab_test = ABTest(alpha=0.05, power=0.80)
+        baseline = np.array([0.01, 0.05, 0.10, 0.30])[:, None]
+        mde = np.array([0.05, 0.10, 0.20])[None, :]
+
+        grid = ab_test.calculate_sample_size_grid(baseline, mde, ratio=2.0)
+
+        assert grid.shape == (4, 3)
+        for i in range(4):
+            for j in range(3):
+                expected = ab_test.calculate_sample_size(baseline[i, 0], mde[0, j], ratio=2.0)
+                assert grid[i, j] == expected
+
+    def test_grid_over_alpha_and_power(self):
+        """Test broadcasting over alpha and power"""
+        grid = ABTest().calculate_sample_size_grid(
+            0.10, 0.20, alpha=np.array([0.01, 0.05])[:, None], power=np.array([0.8, 0.9])
+        )
+
+        assert grid[0, 1] == ABTest(alpha=0.01, power=0.9).calculate_sample_size(0.10, 0.20)
+        assert grid[1, 0] == ABTest(alpha=0.05, power=0.8).calculate_sample_size(0.10, 0.20)
+
+    def test_invalid_combinations_masked(self):
+        """Test that invalid cells are masked instead of raising"""
+        grid = ABTest().calculate_sample_size_grid(0.9, np.array([-0.1, 0.0, 0.05, 0.2]))
+
+        np.testing.assert_array_equal(grid.mask, [True, True, False, True])
+        assert grid[2] == ABTest().calculate_sample_size(0.9, 0.05)
+
+
+class TestInversePlanning:
+    """Test power, MDE and duration solvers"""
+
+    def test_power_round_trip(self):
+        """Test that the required sample size achieves the target power"""
+        ab_test = ABTest(alpha=0.05, power=0.80)
+        n = ab_test.calculate_sample_size(baseline_rate=0.10, mde=0.20)
+
+        power = ab_test.calculate_power(n, baseline_rate=0.10, mde=0.20)
+
+        assert float(power) == pytest.approx(0.80, abs=1e-3)
+        assert float(power) >= 0.80
+
+    def test_mde_round_trip(self):
+        """Test that solving for the MDE inverts the sample size formula"""
+        ab_test = ABTest(alpha=0.05, power=0.80)
+        mdes = np.array([0.05, 0.10, 0.20, 0.50])
+        sizes = ab_test.calculate_sample_size_grid(0.10, mdes, ratio=1.5)
+
+        solved = ab_test.calculate_mde(sizes, baseline_rate=0.10, ratio=1.5)
+
+        np.testing.assert_allclose(solved, mdes, rtol=1e-3)
+        assert np.all(solved <= mdes)
+
+    def test_mde_undetectable_masked(self):
+        """Test that impossible effects are masked"""
+        mde = ABTest().calculate_mde(np.array([2, 100000]), baseline_rate=0.90)
+
+        np.testing.assert_array_equal(np.ma.getmaskarray(mde), [True, False])
+
+    def test_duration_table(self):
+        """Test days needed for a table of daily traffic"""
+        ab_test = ABTest()
+        n = ab_test.calculate_sample_size(baseline_rate=0.10, mde=0.20)
+
+        days = ab_test.calculate_duration(np.array([500, 1000, 2 * n]), 0.10, 0.20)
+
+        expected = [int(np.ceil(2 * n / 500)), int(np.ceil(2 * n / 1000)), 1]
+        np.testing.assert_array_equal(days, expected)
+
+
 class TestTwoProportionZTest:
     """Test two-proportion z-test functionality"""
 
@@ -184,6 +261,78 @@ class TestTwoProportionZTest:
         assert results["relative_lift"] == 0  # As per code logic
 
 
+class TestTwoProportionZTestBatch:
+    """Test vectorized batch z-test functionality"""
+
+    def test_batch_matches_scalar(self):
+        """Test that every batch element matches the scalar z-test"""
+        ab_test = ABTest(alpha=0.05, power=0.80)
+        counts = [
+            (120, 1500, 145, 1500),
+            (100, 1000, 200, 1000),
+            (0, 1000, 10, 1000),
+            (0, 500, 0, 700),
+            (1, 10, 2, 10),
+        ]
+        conv_a, vis_a, conv_b, vis_b = (np.array(col) for col in zip(*counts))
+
+        batch = ab_test.two_proportion_ztest_batch(conv_a, vis_a, conv_b, vis_b)
+
+        for i, row in enumerate(counts):
+            scalar = ab_test.two_proportion_ztest(*row)
+            assert batch["conversion_rate_a"][i] == pytest.approx(scalar["conversion_rate_a"])
+            assert batch["conversion_rate_b"][i] == pytest.approx(scalar["conversion_rate_b"])
+            assert batch["relative_lift"][i] == pytest.approx(scalar["relative_lift"])
+            assert batch["z_statistic"][i] == pytest.approx(scalar["z_statistic"])
+            assert batch["p_value"][i] == pytest.approx(scalar["p_value"])
+            assert batch["is_significant"][i] == scalar["is_significant"]
+            assert batch["ci_lower"][i] == pytest.approx(scalar["confidence_interval"][0])
+            assert batch["ci_upper"][i] == pytest.approx(scalar["confidence_interval"][1])
+
+        assert batch["confidence_level"] == 0.95
+
+    def test_batch_edge_cases_masked(self):
+        """Test zero-conversion edge cases are handled element-wise"""
+        ab_test = ABTest()
+
+        batch = ab_test.two_proportion_ztest_batch([0, 0], [100, 100], [0, 5], [100, 100])
+
+        assert batch["z_statistic"][0] == 0.0
+        assert batch["p_value"][0] == 1.0
+        assert batch["is_significant"][0] == False
+        assert batch["relative_lift"][1] == 0.0
+        assert batch["p_value"][1] < 0.05
+
+    def test_batch_accepts_structured_array(self):
+        """Test batch z-test with a structured array of counts"""
+        ab_test = ABTest()
+        table = np.array(
+            [(120, 1500, 145, 1500), (100, 1000, 100, 1000)],
+            dtype=[
+                ("conversions_a", "i8"),
+                ("visitors_a", "i8"),
+                ("conversions_b", "i8"),
+                ("visitors_b", "i8"),
+            ],
+        )
+
+        batch = ab_test.two_proportion_ztest_batch(table)
+
+        assert batch["p_value"].shape == (2,)
+        assert batch["absolute_difference"][1] == pytest.approx(0.0)
+
+    def test_batch_validation(self):
+        """Test that invalid counts raise like the scalar test"""
+        ab_test = ABTest()
+
+        with pytest.raises(ValueError):
+            ab_test.two_proportion_ztest_batch([10, 5], [100, 0], [10, 5], [100, 100])
+        with pytest.raises(ValueError):
+            ab_test.two_proportion_ztest_batch([10, 200], [100, 100], [10, 5], [100, 100])
+        with pytest.raises(ValueError):
+            ab_test.two_proportion_ztest_batch([10], [100])
+
+
 class TestBayesianABTest:
     """Test Bayesian A/B test functionality"""
 
@@ -307,6 +456,137 @@ class TestBayesianABTest:
         )
 
 
+class TestBayesianExact:
+    """Test closed-form Bayesian A/B test functionality"""
+
+    def test_exact_matches_monte_carlo(self):
+        """Test that exact results agree with a large Monte Carlo run"""
+        ab_test = ABTest()
+
+        exact = ab_test.bayesian_ab_test(120, 1500, 145, 1500, method="exact")
+        mc = ab_test.bayesian_ab_test(120, 1500, 145, 1500, n_simulations=400000)
+
+        assert exact["prob_b_better_than_a"] == pytest.approx(mc["prob_b_better_than_a"], abs=0.005)
+        assert exact["expected_loss_choosing_a"] == pytest.approx(
+            mc["expected_loss_choosing_a"], rel=0.02
+        )
+        assert exact["expected_loss_choosing_b"] == pytest.approx(
+            mc["expected_loss_choosing_b"], rel=0.05
+        )
+        assert exact["posterior_mean_a"] == pytest.approx(121 / 1502)
+        np.testing.assert_allclose(exact["credible_interval_a"], mc["credible_interval_a"], rtol=0.01)
+
+    def test_exact_is_deterministic(self):
+        """Test that repeated exact calls return identical results"""
+        ab_test = ABTest()
+
+        results1 = ab_test.bayesian_ab_test(120, 1500, 145, 1500, method="exact")
+        results2 = ab_test.bayesian_ab_test(120, 1500, 145, 1500, method="exact")
+
+        assert results1["prob_b_better_than_a"] == results2["prob_b_better_than_a"]
+        assert results1["expected_loss_choosing_b"] == results2["expected_loss_choosing_b"]
+
+    def test_exact_symmetry(self):
+        """Test that identical groups give a probability of one half"""
+        ab_test = ABTest()
+
+        results = ab_test.bayesian_ab_test(100, 1000, 100, 1000, method="exact")
+
+        assert results["prob_b_better_than_a"] == pytest.approx(0.5, abs=1e-9)
+        assert results["expected_loss_choosing_a"] == pytest.approx(
+            results["expected_loss_choosing_b"], rel=1e-9
+        )
+
+    def test_exact_large_counts_use_quadrature(self):
+        """Test that counts beyond the closed-form sum limit still work"""
+        ab_test = ABTest()
+
+        results = ab_test.bayesian_ab_test(60000, 1000000, 60500, 1000000, method="exact")
+
+        assert results["prob_b_better_than_a"] == pytest.approx(0.9313, abs=0.002)
+        assert 0 <= results["expected_loss_choosing_b"] < results["expected_loss_choosing_a"]
+
+    def test_large_fractional_shapes_match_adaptive_quadrature(self):
+        """Test the fixed quadrature rule against scipy's adaptive one"""
+        from scipy import integrate, stats
+
+        cases = [(60000.5, 940000.5, 60500.5, 939500.5), (70000.5, 3e5, 5.5, 20.5)]
+        for alpha_x, beta_x, alpha_y, beta_y in cases:
+            expected, _ = integrate.quad(
+                lambda x: stats.beta.pdf(x, alpha_x, beta_x) * stats.beta.cdf(x, alpha_y, beta_y),
+                stats.beta.ppf(1e-12, alpha_x, beta_x),
+                stats.beta.isf(1e-12, alpha_x, beta_x),
+                points=[alpha_x / (alpha_x + beta_x), alpha_y / (alpha_y + beta_y)],
+                limit=200,
+                epsabs=1e-12,
+            )
+
+            assert _prob_beta_greater(alpha_x, beta_x, alpha_y, beta_y) == pytest.approx(
+                expected, abs=1e-7
+            )
+
+    def test_invalid_method(self):
+        """Test that an unknown method raises"""
+        ab_test = ABTest()
+
+        with pytest.raises(ValueError):
+            ab_test.bayesian_ab_test(10, 100, 12, 100, method="magic")
+
+
+class TestMultiArm:
+    """Test A/B/n pairwise and Bayesian functionality"""
+
+    def test_pairwise_matches_two_arm_test(self):
+        """Test that each pair matches the two-arm z-test"""
+        ab_test = ABTest()
+        conversions = [100, 120, 150, 101]
+        visitors = [1000, 1000, 1000, 1000]
+
+        results = ab_test.multi_arm_ztest(conversions, visitors, correction="none")
+
+        assert len(results["p_value"]) == 6
+        for k, (i, j) in enumerate(zip(results["arm_a"], results["arm_b"])):
+            expected = ab_test.two_proportion_ztest(
+                conversions[i], visitors[i], conversions[j], visitors[j]
+            )
+            assert results["p_value"][k] == pytest.approx(expected["p_value"])
+
+    def test_pairwise_correction(self):
+        """Test that corrected p-values are never smaller than raw ones"""
+        ab_test = ABTest()
+
+        results = ab_test.multi_arm_ztest(
+            [100, 120, 150, 101, 90, 130], [1000] * 6, correction="bonferroni"
+        )
+
+        assert len(results["p_value"]) == 15
+        assert np.all(results["p_value_adjusted"] >= results["p_value"])
+        assert np.all(results["is_significant"] == (results["p_value_adjusted"] < 0.05))
+
+    def test_bayesian_multi_arm(self):
+        """Test P(best) and expected loss for every arm at once"""
+        ab_test = ABTest()
+
+        results = ab_test.bayesian_multi_arm_test(
+            [100, 120, 200], [1000, 1000, 1000], n_simulations=20000
+        )
+
+        assert results["prob_best"].sum() == pytest.approx(1.0)
+        assert np.argmax(results["prob_best"]) == 2
+        assert np.argmin(results["expected_loss"]) == 2
+        assert results["credible_intervals"].shape == (3, 2)
+        assert results["posterior_means"][0] == pytest.approx(101 / 1002, abs=0.002)
+
+    def test_multi_arm_validation(self):
+        """Test that mismatched or single-arm inputs raise"""
+        ab_test = ABTest()
+
+        with pytest.raises(ValueError):
+            ab_test.multi_arm_ztest([10], [100])
+        with pytest.raises(ValueError):
+            ab_test.bayesian_multi_arm_test([10, 20], [100])
+
+
 class TestPrintResults:
     """Test result printing functionality"""
 
@@ -358,8 +638,9 @@ class TestEdgeCases:
             conversions_a=1, visitors_a=10, conversions_b=2, visitors_b=10
         )
 
-        assert isinstance(results, dict)
+        assert isinstance(results, Mapping)
         assert "p_value" in results
+        assert isinstance(results.to_dict(), dict)
 
     def test_all_conversions(self):
         """Test with 100% conversion rate"""
@@ -0,0 +1,114 @@
+"""
+Tests for the Thompson-sampling allocator
+Author: Gabriel Demetrios Lafis
+"""
+
+import threading
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.bandit import ThompsonSamplingAllocator
+from src.hypothesis_testing.posteriors import BetaPosterior
+
+
+@pytest.fixture
+def allocator():
+    allocator = ThompsonSamplingAllocator(3, seed=4, refresh_interval=0.0)
+    allocator.update_batch([0, 1, 2], [100, 130, 90], [1000, 1000, 1000])
+    return allocator
+
+
+class TestThompsonSamplingAllocator:
+    """Test allocation weights and arm choices"""
+
+    def test_weights_favor_best_arm(self, allocator):
+        """Test that weights are P(arm is best) and sum to one"""
+        weights = allocator.allocation()
+
+        assert weights.sum() == pytest.approx(1.0)
+        assert np.argmax(weights) == 1
+        assert weights[1] > 0.9
+
+    def test_choices_follow_weights(self, allocator):
+        """Test that served choices match the allocation"""
+        weights = allocator.allocation()
+        choices = allocator.choose(50000)
+
+        np.testing.assert_allclose(np.bincount(choices, minlength=3) / 50000, weights, atol=0.01)
+        assert isinstance(allocator.choose(), int)
+
+    def test_refresh_only_when_stale(self):
+        """Test that unchanged posteriors are not re-sampled"""
+        allocator = ThompsonSamplingAllocator(2, seed=1, refresh_interval=0.0, batch_size=16)
+        allocator.choose(100)
+        assert allocator.refreshes == 1
+
+        allocator.update(0, 5, 10)
+        allocator.choose()
+        assert allocator.refreshes == 2
+
+    def test_refresh_interval_delays_updates(self):
+        """Test that new data waits for the refresh interval"""
+        allocator = ThompsonSamplingAllocator(2, seed=1, refresh_interval=3600)
+        before = allocator.allocation()
+        allocator.update(0, 100, 1000)
+        allocator.update(1, 900, 1000)
+
+        np.testing.assert_array_equal(allocator.allocation(), before)
+        assert allocator.refresh()[1] > 0.99
+
+    def test_min_weight_floor(self, allocator):
+        """Test the exploration floor"""
+        floored = ThompsonSamplingAllocator(3, seed=4, min_weight=0.05, refresh_interval=0.0)
+        floored.update_batch([0, 1, 2], [100, 130, 90], [1000, 1000, 1000])
+
+        assert floored.allocation().min() >= 0.05
+
+    def test_prior_and_posteriors(self):
+        """Test that arms start from the prior and accumulate counts"""
+        allocator = ThompsonSamplingAllocator(2, prior=BetaPosterior(2, 8))
+        allocator.update(1, 3, 10)
+
+        assert allocator.posteriors() == [BetaPosterior(2, 8), BetaPosterior(5, 15)]
+
+    def test_concurrent_updates(self):
+        """Test that concurrent choose/update calls lose no counts"""
+        allocator = ThompsonSamplingAllocator(
+            3, seed=2, refresh_interval=0.0, n_simulations=500, batch_size=64
+        )
+
+        def worker():
+            for i in range(500):
+                arm = allocator.choose()
+                allocator.update(arm, i % 5 == 0, 1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        visitors = sum(p.alpha + p.beta - 2 for p in allocator.posteriors())
+        conversions = sum(p.alpha - 1 for p in allocator.posteriors())
+        assert visitors == 8 * 500
+        assert conversions == 8 * 100
+
+    def test_invalid_inputs(self, allocator):
+        """Test argument validation"""
+        with pytest.raises(ValueError):
+            ThompsonSamplingAllocator(1)
+        with pytest.raises(ValueError):
+            ThompsonSamplingAllocator(2, min_weight=0.6)
+        with pytest.raises(ValueError):
+            allocator.update(3, 1, 1)
+        with pytest.raises(ValueError):
+            allocator.update_batch([0], [5], [4])
+        with pytest.raises(ValueError):
+            allocator.choose(-1)
+
+    def test_choose_zero(self, allocator):
+        """Test that asking for no decisions returns an empty array"""
+        chosen = allocator.choose(0)
+
+        assert chosen.shape == (0,)
+        assert chosen.dtype == np.int64
@@ -0,0 +1,47 @@
+"""
+Tests for the benchmark harness
+Author: Gabriel Demetrios Lafis
+"""
+
+import json
+
+from benchmarks.harness import compare_results, measure, run_benchmarks, save_results
+
+
+def _run(median, peak):
+    return {"results": {"case": {"median": median, "peak_memory_bytes": peak}}}
+
+
+class TestHarness:
+    """Test measurement, storage and comparison"""
+
+    def test_measure_reports_timings_and_memory(self):
+        """Test that a measurement has timing and peak-memory fields"""
+        result = measure(lambda: bytearray(1 << 20), repeat=2, min_time=0.001)
+
+        assert result["min"] <= result["median"]
+        assert result["number"] >= 1
+        assert result["peak_memory_bytes"] >= 1 << 20
+
+    def test_run_and_save(self, tmp_path):
+        """Test a filtered quick run round-tripping through JSON"""
+        results = run_benchmarks("two_proportion_ztest_batch", quick=True, repeat=1, min_time=0.0)
+        path = tmp_path / "bench.json"
+        save_results(results, str(path))
+        loaded = json.loads(path.read_text())
+
+        assert list(loaded["results"]) == ["two_proportion_ztest_batch[10000]"]
+        assert loaded["results"]["two_proportion_ztest_batch[10000]"]["throughput"] > 0
+        assert loaded["metadata"]["quick"] is True
+
+    def test_compare_flags_regressions(self):
+        """Test the regression threshold on time and memory"""
+        baseline = _run(1.0, 1000)
+
+        assert not compare_results(baseline, _run(1.05, 1000), threshold=0.1)[0]["regression"]
+        assert compare_results(baseline, _run(1.2, 1000), threshold=0.1)[0]["regression"]
+        assert compare_results(baseline, _run(1.0, 2000), threshold=0.1)[0]["regression"]
+
+    def test_compare_skips_new_cases(self):
+        """Test that cases missing from the baseline are not compared"""
+        assert compare_results({"results": {}}, _run(1.0, 1)) == []
@@ -0,0 +1,114 @@
+"""
+Tests for the Poisson bootstrap
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.bootstrap import PoissonBootstrap
+
+
+@pytest.fixture
+def revenue():
+    rng = np.random.default_rng(11)
+    return rng.lognormal(0, 1, 1500), rng.lognormal(0.3, 1, 1500)
+
+
+def _bootstrap(values_a, values_b, parts=1, **kwargs):
+    bootstrap = PoissonBootstrap(1200, seed=5, block_size=500, **kwargs)
+    for chunk in np.array_split(values_a, parts):
+        bootstrap.update("a", chunk)
+    bootstrap.update("b", values_b)
+    return bootstrap
+
+
+class TestPoissonBootstrap:
+    """Test streaming replicate accumulation and intervals"""
+
+    def test_chunking_does_not_change_replicates(self, revenue):
+        """Test that streamed chunks draw the same weights as one batch"""
+        whole = _bootstrap(*revenue).replicates()
+        chunked = _bootstrap(*revenue, parts=7).replicates()
+
+        assert whole.size == 1200
+        np.testing.assert_allclose(chunked, whole)
+
+    def test_process_pool_matches_serial(self, revenue):
+        """Test that worker processes reproduce the serial replicates"""
+        serial = _bootstrap(*revenue).replicates()
+        parallel = _bootstrap(*revenue, max_workers=2).replicates()
+
+        np.testing.assert_array_equal(parallel, serial)
+
+    def test_pool_is_reused_across_updates(self, revenue):
+        """Test that streamed parallel updates share one worker pool"""
+        serial = _bootstrap(*revenue, parts=4).replicates()
+        with PoissonBootstrap(1200, seed=5, block_size=500, max_workers=2) as bootstrap:
+            for chunk in np.array_split(revenue[0], 4):
+                bootstrap.update("a", chunk)
+                pool = bootstrap._executor
+            bootstrap.update("b", revenue[1])
+
+            assert bootstrap._executor is pool is not None
+        assert bootstrap._executor is None
+        np.testing.assert_array_equal(bootstrap.replicates(), serial)
+
+    def test_standard_error_matches_analytic(self, revenue):
+        """Test the replicate spread against the analytic standard error"""
+        values_a, values_b = revenue
+        replicates = _bootstrap(values_a, values_b).replicates()
+        analytic = np.sqrt(
+            values_a.var(ddof=1) / values_a.size + values_b.var(ddof=1) / values_b.size
+        )
+
+        assert replicates.std() == pytest.approx(analytic, rel=0.1)
+
+    def test_streamed_moments(self, revenue):
+        """Test the running third moment used for the BCa acceleration"""
+        values_a, _ = revenue
+        bootstrap = _bootstrap(*revenue, parts=5)
+        state = bootstrap._arms["a"]
+
+        assert state.m3 == pytest.approx(np.sum((values_a - values_a.mean()) ** 3))
+        assert bootstrap.estimate == pytest.approx(revenue[1].mean() - values_a.mean())
+
+    @pytest.mark.parametrize("method", ["percentile", "bca"])
+    def test_interval_covers_estimate(self, revenue, method):
+        """Test that the interval brackets the observed difference"""
+        bootstrap = _bootstrap(*revenue)
+        lower, upper = bootstrap.confidence_interval(0.95, method)
+
+        assert lower < bootstrap.estimate < upper
+
+    def test_bca_shifts_for_skewed_data(self, revenue):
+        """Test that BCa moves the interval relative to the percentile one"""
+        bootstrap = _bootstrap(*revenue)
+
+        assert bootstrap.confidence_interval(method="bca") != bootstrap.confidence_interval(
+            method="percentile"
+        )
+
+    def test_invalid_inputs(self, revenue):
+        """Test argument validation"""
+        bootstrap = PoissonBootstrap(100, seed=1)
+        with pytest.raises(ValueError):
+            bootstrap.update("c", revenue[0])
+        bootstrap.update("a", revenue[0])
+        with pytest.raises(ValueError):
+            bootstrap.replicates()
+        with pytest.raises(ValueError):
+            PoissonBootstrap(0)
+
+
+class TestBootstrapTest:
+    """Test the ABTest bootstrap comparison"""
+
+    def test_seeded_framework_is_reproducible(self, revenue):
+        """Test that a seeded framework repeats the same interval"""
+        first = ABTest(seed=9).bootstrap_test(*revenue, n_replicates=500)
+        second = ABTest(seed=9).bootstrap_test(*revenue, n_replicates=500)
+
+        assert first["confidence_interval"] == second["confidence_interval"]
+        assert first["is_significant"]
+        assert first["confidence_level"] == pytest.approx(0.95)
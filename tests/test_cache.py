@@ -0,0 +1,116 @@
+"""
+Tests for the result cache
+Author: Gabriel Demetrios Lafis
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.cache import ResultCache
+
+
+class TestResultCache:
+    """Test LRU cache behaviour"""
+
+    def test_hits_and_misses(self):
+        """Test hit/miss counters"""
+        cache = ResultCache(maxsize=2)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"value": 1}
+
+        cache.get_or_compute("a", compute)
+        cache.get_or_compute("a", compute)
+
+        assert len(calls) == 1
+        assert cache.info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = ResultCache(maxsize=2)
+        cache.get_or_compute("a", lambda: {"v": "a"})
+        cache.get_or_compute("b", lambda: {"v": "b"})
+        cache.get_or_compute("a", lambda: {"v": "a"})
+        cache.get_or_compute("c", lambda: {"v": "c"})
+
+        result = cache.get_or_compute("b", lambda: {"v": "recomputed"})
+
+        assert result["v"] == "recomputed"
+        assert len(cache) == 2
+
+    def test_invalidate(self):
+        """Test explicit invalidation"""
+        cache = ResultCache()
+        cache.get_or_compute(("exp", 1), lambda: {})
+        cache.get_or_compute(("exp", 2), lambda: {})
+
+        assert cache.invalidate(lambda key: key[1] == 1) == 1
+        assert len(cache) == 1
+        assert cache.invalidate() == 1
+        assert len(cache) == 0
+
+    def test_picklable(self):
+        """Test that a cache survives pickling (e.g. to worker processes)"""
+        cache = ResultCache()
+        cache.get_or_compute("a", lambda: {"v": 1})
+
+        restored = pickle.loads(pickle.dumps(cache))
+
+        assert restored.get_or_compute("a", lambda: {"v": 2}) == {"v": 1}
+
+    def test_invalid_maxsize(self):
+        """Test that a non-positive size raises"""
+        with pytest.raises(ValueError):
+            ResultCache(maxsize=0)
+
+
+class TestABTestCache:
+    """Test caching inside ABTest"""
+
+    def test_ztest_cached(self):
+        """Test that repeated z-tests hit the cache"""
+        ab_test = ABTest(cache_size=16)
+
+        ab_test.two_proportion_ztest(120, 1500, 145, 1500)
+        ab_test.two_proportion_ztest(120, 1500, 145, 1500)
+
+        assert ab_test.cache.hits == 1
+        assert ab_test.cache.misses == 1
+
+    def test_cache_keyed_on_configuration(self):
+        """Test that changing alpha is a cache miss"""
+        ab_test = ABTest(cache_size=16)
+
+        ab_test.two_proportion_ztest(120, 1500, 145, 1500)
+        ab_test.alpha = 0.01
+        results = ab_test.two_proportion_ztest(120, 1500, 145, 1500)
+
+        assert ab_test.cache.misses == 2
+        assert results["confidence_level"] == 0.99
+
+    def test_bayesian_results_not_aliased(self):
+        """Test that mutating a returned result does not change the cache"""
+        ab_test = ABTest(seed=1, cache_size=16)
+
+        first = ab_test.bayesian_ab_test(120, 1500, 145, 1500, n_simulations=5000)
+        original_ci = first["credible_interval_a"].copy()
+        first["credible_interval_a"][0] = -1.0
+        first["prob_b_better_than_a"] = -1.0
+
+        second = ab_test.bayesian_ab_test(120, 1500, 145, 1500, n_simulations=5000)
+
+        assert ab_test.cache.hits == 1
+        np.testing.assert_array_equal(second["credible_interval_a"], original_ci)
+        assert second["prob_b_better_than_a"] >= 0
+
+    def test_explicit_rng_bypasses_cache(self):
+        """Test that calls with an explicit generator are not cached"""
+        ab_test = ABTest(cache_size=16)
+
+        ab_test.bayesian_ab_test(10, 100, 12, 100, n_simulations=1000, rng=np.random.default_rng(0))
+
+        assert len(ab_test.cache) == 0
@@ -0,0 +1,137 @@
+"""
+Tests for continuous-metric tests and sufficient statistics
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from scipy import stats
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.continuous import SufficientStats
+
+
+@pytest.fixture
+def revenue():
+    rng = np.random.default_rng(1)
+    return rng.lognormal(0, 1, 500).round(1), rng.lognormal(0.1, 1, 700).round(1)
+
+
+class TestSufficientStats:
+    """Test streaming moment accumulation"""
+
+    def test_welford_matches_numpy(self, revenue):
+        """Test single-value updates against NumPy"""
+        values, _ = revenue
+        acc = SufficientStats()
+        for value in values:
+            acc.update(value)
+
+        assert acc.count == values.size
+        assert acc.mean == pytest.approx(values.mean())
+        assert acc.variance == pytest.approx(values.var(ddof=1))
+
+    def test_chan_merge(self, revenue):
+        """Test that merged partials equal statistics over all values"""
+        values, _ = revenue
+        parts = [SufficientStats.from_values(chunk) for chunk in np.array_split(values, 7)]
+        merged = SufficientStats()
+        for part in parts:
+            merged.merge(part)
+
+        assert merged.mean == pytest.approx(values.mean())
+        assert merged.m2 == pytest.approx(np.sum((values - values.mean()) ** 2))
+
+    def test_from_sums(self, revenue):
+        """Test construction from count, sum and sum of squares"""
+        values, _ = revenue
+        acc = SufficientStats.from_sums(values.size, values.sum(), np.sum(values**2))
+
+        assert acc.variance == pytest.approx(values.var(ddof=1))
+
+
+class TestWelchTTest:
+    """Test Welch's t-test"""
+
+    def test_matches_scipy(self, revenue):
+        """Test p-value against scipy"""
+        values_a, values_b = revenue
+        results = ABTest().welch_ttest(
+            SufficientStats.from_values(values_a), SufficientStats.from_values(values_b)
+        )
+
+        expected = stats.ttest_ind(values_b, values_a, equal_var=False)
+        assert results["t_statistic"] == pytest.approx(expected.statistic)
+        assert results["p_value"] == pytest.approx(expected.pvalue)
+
+    def test_result_shape_mirrors_ztest(self, revenue):
+        """Test that the result has the same core keys as the z-test"""
+        results = ABTest().welch_ttest(*revenue)
+
+        for key in (
+            "absolute_difference",
+            "relative_lift",
+            "p_value",
+            "is_significant",
+            "confidence_interval",
+            "confidence_level",
+        ):
+            assert key in results
+        lower, upper = results["confidence_interval"]
+        assert lower < results["absolute_difference"] < upper
+
+    def test_requires_two_observations(self):
+        """Test that tiny groups raise"""
+        with pytest.raises(ValueError):
+            ABTest().welch_ttest([1.0], [1.0, 2.0])
+
+
+class TestMannWhitneyTest:
+    """Test the histogram-based Mann-Whitney U test"""
+
+    def test_matches_scipy(self, revenue):
+        """Test U and p-value against scipy on the raw values"""
+        values_a, values_b = revenue
+        bins = np.unique(np.concatenate([values_a, values_b]))
+        counts_a = np.searchsorted(bins, values_a)
+        counts_b = np.searchsorted(bins, values_b)
+        hist_a = np.bincount(counts_a, minlength=bins.size)
+        hist_b = np.bincount(counts_b, minlength=bins.size)
+
+        results = ABTest().mann_whitney_test(hist_a, hist_b, bin_values=bins)
+
+        expected = stats.mannwhitneyu(values_b, values_a, method="asymptotic")
+        assert results["u_statistic"] == pytest.approx(expected.statistic)
+        assert results["p_value"] == pytest.approx(expected.pvalue)
+        assert results["mean_b"] == pytest.approx(values_b.mean())
+
+    def test_superiority_interval_uses_delong_variance(self):
+        """Test the superiority standard error against DeLong on the raw values"""
+        rng = np.random.default_rng(4)
+        values_a = rng.integers(0, 6, 300)
+        values_b = rng.integers(2, 8, 200)
+        hist_a = np.bincount(values_a, minlength=8)
+        hist_b = np.bincount(values_b, minlength=8)
+
+        results = ABTest(alpha=0.05).mann_whitney_test(hist_a, hist_b)
+
+        above = values_b[None, :] > values_a[:, None]
+        wins = above + 0.5 * (values_b[None, :] == values_a[:, None])
+        theta = wins.mean()
+        se = np.sqrt(
+            wins.mean(1).var(ddof=1) / values_a.size + wins.mean(0).var(ddof=1) / values_b.size
+        )
+        z = stats.norm.ppf(0.975)
+        assert results["probability_of_superiority"] == pytest.approx(theta)
+        np.testing.assert_allclose(results["confidence_interval"], (theta - z * se, theta + z * se))
+
+    def test_identical_histograms(self):
+        """Test that identical groups are not significant"""
+        results = ABTest().mann_whitney_test([10, 20, 30], [10, 20, 30])
+
+        assert results["probability_of_superiority"] == pytest.approx(0.5)
+        assert results["is_significant"] == False
+
+    def test_invalid_histograms(self):
+        """Test that mismatched histograms raise"""
+        with pytest.raises(ValueError):
+            ABTest().mann_whitney_test([1, 2], [1, 2, 3])
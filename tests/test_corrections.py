@@ -0,0 +1,41 @@
+"""
+Tests for multiple-comparison corrections
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.corrections import adjust_pvalues
+
+
+class TestAdjustPValues:
+    """Test p-value adjustment methods"""
+
+    P_VALUES = [0.01, 0.04, 0.03, 0.005]
+
+    def test_bonferroni(self):
+        """Test Bonferroni adjustment"""
+        np.testing.assert_allclose(
+            adjust_pvalues(self.P_VALUES, "bonferroni"), [0.04, 0.16, 0.12, 0.02]
+        )
+
+    def test_holm(self):
+        """Test Holm step-down adjustment"""
+        np.testing.assert_allclose(adjust_pvalues(self.P_VALUES, "holm"), [0.03, 0.06, 0.06, 0.02])
+
+    def test_benjamini_hochberg(self):
+        """Test Benjamini-Hochberg step-up adjustment"""
+        np.testing.assert_allclose(
+            adjust_pvalues(self.P_VALUES, "fdr_bh"), [0.02, 0.04, 0.04, 0.02]
+        )
+
+    def test_nan_is_ignored(self):
+        """Test that NaN p-values stay NaN and are not counted"""
+        adjusted = adjust_pvalues([0.01, np.nan, 0.02], "bonferroni")
+        assert np.isnan(adjusted[1])
+        np.testing.assert_allclose(adjusted[[0, 2]], [0.02, 0.04])
+
+    def test_invalid_method(self):
+        """Test that an unknown method raises"""
+        with pytest.raises(ValueError):
+            adjust_pvalues([0.01], "sidak")
@@ -0,0 +1,119 @@
+"""
+Tests for CUPED variance reduction
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.cuped import CovariateStats, cuped_theta
+
+
+@pytest.fixture
+def ab_test():
+    return ABTest(alpha=0.05, power=0.80)
+
+
+@pytest.fixture
+def correlated():
+    rng = np.random.default_rng(3)
+    x_a = rng.normal(10, 2, 4000)
+    x_b = rng.normal(10, 2, 4000)
+    y_a = 0.9 * x_a + rng.normal(0, 1, 4000)
+    y_b = 0.9 * x_b + rng.normal(0.1, 1, 4000)
+    return (y_a, x_a), (y_b, x_b)
+
+
+class TestCovariateStats:
+    """Test single-pass joint moments"""
+
+    def test_merge_matches_single_pass(self, correlated):
+        """Test that merged chunks equal statistics over all values"""
+        y, x = correlated[0]
+        merged = CovariateStats()
+        for y_chunk, x_chunk in zip(np.array_split(y, 9), np.array_split(x, 9)):
+            merged.update_batch(y_chunk, x_chunk)
+        full = CovariateStats.from_values(y, x)
+
+        assert merged.count == full.count
+        assert merged.mean_y == pytest.approx(full.mean_y)
+        assert merged.c_xy == pytest.approx(full.c_xy)
+        assert merged.m2_x == pytest.approx(full.m2_x)
+
+    def test_theta_matches_regression_slope(self, correlated):
+        """Test theta against the pooled least-squares slope"""
+        (y_a, x_a), (y_b, x_b) = correlated
+        theta = cuped_theta(
+            CovariateStats.from_values(y_a, x_a), CovariateStats.from_values(y_b, x_b)
+        )
+        slope = np.polyfit(np.concatenate([x_a, x_b]), np.concatenate([y_a, y_b]), 1)[0]
+
+        assert theta == pytest.approx(slope)
+
+    def test_length_mismatch(self):
+        """Test that unpaired arrays are rejected"""
+        with pytest.raises(ValueError):
+            CovariateStats.from_values([1.0, 2.0], [1.0])
+
+
+class TestCupedTest:
+    """Test the CUPED-adjusted comparison"""
+
+    def test_adjusted_metric_matches_welch(self, ab_test, correlated):
+        """Test against Welch's t-test on explicitly adjusted values"""
+        (y_a, x_a), (y_b, x_b) = correlated
+        results = ab_test.cuped_test((y_a, x_a), (y_b, x_b))
+
+        mean_x = np.concatenate([x_a, x_b]).mean()
+        theta = results["theta"]
+        expected = ab_test.welch_ttest(
+            y_a - theta * (x_a - mean_x), y_b - theta * (x_b - mean_x)
+        )
+
+        assert results["t_statistic"] == pytest.approx(expected["t_statistic"])
+        assert results["p_value"] == pytest.approx(expected["p_value"])
+
+    def test_variance_reduction(self, ab_test, correlated):
+        """Test that a correlated covariate narrows the interval"""
+        (y_a, x_a), (y_b, x_b) = correlated
+        adjusted = ab_test.cuped_test((y_a, x_a), (y_b, x_b))
+        raw = ab_test.welch_ttest(y_a, y_b)
+
+        lower, upper = adjusted["confidence_interval"]
+        raw_lower, raw_upper = raw["confidence_interval"]
+        assert adjusted["variance_reduction"] > 0.7
+        assert upper - lower < 0.6 * (raw_upper - raw_lower)
+
+    def test_constant_covariate(self, ab_test):
+        """Test that an uninformative covariate leaves the test unchanged"""
+        y_a, y_b = np.arange(10.0), np.arange(10.0) + 1
+        results = ab_test.cuped_test((y_a, np.ones(10)), (y_b, np.ones(10)))
+
+        assert results["theta"] == 0.0
+        assert results["variance_reduction"] == pytest.approx(0.0)
+        assert results["p_value"] == pytest.approx(ab_test.welch_ttest(y_a, y_b)["p_value"])
+
+
+class TestCupedSampleSize:
+    """Test variance-reduced sample sizes"""
+
+    def test_sample_size_shrinks(self, ab_test):
+        """Test that the sample size scales by 1 - variance_reduction"""
+        base = ab_test.calculate_sample_size(0.10, 0.10)
+        reduced = ab_test.calculate_sample_size(0.10, 0.10, variance_reduction=0.5)
+
+        assert reduced == pytest.approx(base / 2, abs=1)
+
+    def test_grid_matches_scalar(self, ab_test):
+        """Test the grid planner against the scalar planner"""
+        reductions = np.array([0.0, 0.3, 0.6])
+        grid = ab_test.calculate_sample_size_grid(0.10, 0.10, variance_reduction=reductions)
+
+        for r, n in zip(reductions, grid):
+            assert n == ab_test.calculate_sample_size(0.10, 0.10, variance_reduction=r)
+
+    def test_invalid_variance_reduction(self, ab_test):
+        """Test that impossible reductions are rejected"""
+        with pytest.raises(ValueError):
+            ab_test.calculate_sample_size(0.10, 0.10, variance_reduction=1.0)
+        assert ab_test.calculate_sample_size_grid(0.10, 0.10, variance_reduction=1.2).mask
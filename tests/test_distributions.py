@@ -0,0 +1,68 @@
+"""
+Tests for the lightweight normal distribution helpers and lazy imports
+Author: Gabriel Demetrios Lafis
+"""
+
+import subprocess
+import sys
+
+import pytest
+import numpy as np
+from scipy import stats
+from src.hypothesis_testing._distributions import norm_cdf, norm_ppf, norm_sf
+
+
+class TestNormalHelpers:
+    """Test the scalar and array normal paths against scipy.stats"""
+
+    def test_ppf_matches_scipy(self):
+        """Test quantiles across the body and both tails"""
+        levels = np.concatenate(
+            [np.logspace(-300, -2, 300), np.linspace(0.01, 0.99, 500), 1 - np.logspace(-15, -2, 100)]
+        )
+        expected = stats.norm.ppf(levels)
+
+        for level, value in zip(levels, expected):
+            assert norm_ppf(level) == pytest.approx(value, rel=1e-14, abs=1e-14)
+        np.testing.assert_allclose(norm_ppf(levels), expected, rtol=1e-14)
+
+    def test_cdf_and_sf_match_scipy(self):
+        """Test the CDF and survival function, including far tails"""
+        points = np.linspace(-30, 30, 601)
+
+        for point in points:
+            assert norm_cdf(point) == pytest.approx(stats.norm.cdf(point), rel=1e-10)
+            assert norm_sf(point) == pytest.approx(stats.norm.sf(point), rel=1e-10)
+        np.testing.assert_allclose(norm_sf(points), stats.norm.sf(points), rtol=1e-14)
+
+    def test_scalars_return_floats_and_edges(self):
+        """Test return types and the boundaries of the quantile"""
+        assert type(norm_cdf(np.float64(1.0))) is float
+        assert norm_ppf(0.0) == -np.inf
+        assert norm_ppf(1.0) == np.inf
+        assert np.isnan(norm_ppf(1.5))
+
+
+class TestLazyImports:
+    """Test that the package defers heavy imports"""
+
+    def test_package_import_skips_scipy(self):
+        """Test that importing and running a z-test does not load scipy"""
+        code = (
+            "import sys\n"
+            "from src.hypothesis_testing import ABTest\n"
+            "ABTest().two_proportion_ztest(120, 1500, 145, 1500)\n"
+            "ABTest().calculate_sample_size(0.1, 0.05)\n"
+            "assert 'scipy' not in sys.modules, 'scipy was imported'\n"
+            "assert 'asyncio' not in sys.modules, 'asyncio was imported'\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_lazy_exports(self):
+        """Test that every exported name resolves"""
+        import src.hypothesis_testing as package
+
+        for name in package.__all__:
+            assert getattr(package, name) is not None
+        with pytest.raises(AttributeError):
+            package.missing_name
@@ -0,0 +1,174 @@
+"""
+Tests for event-log ingestion
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.ingestion import (
+    CONVERSION,
+    EVENT_DTYPE,
+    EXPOSURE,
+    UNASSIGNED,
+    EventCounter,
+    _encode_chunk,
+    assign_arms,
+    count_events,
+)
+
+
+def make_events():
+    """Two experiments with duplicated exposures and conversions"""
+    return np.array(
+        [
+            (1, 10, EXPOSURE, 0),
+            (1, 10, EXPOSURE, 0),  # duplicate exposure
+            (1, 11, EXPOSURE, 0),
+            (1, 12, EXPOSURE, 1),
+            (1, 13, EXPOSURE, 1),
+            (1, 10, CONVERSION, -1),
+            (1, 10, CONVERSION, -1),  # duplicate conversion
+            (1, 12, CONVERSION, -1),
+            (1, 13, CONVERSION, -1),
+            (1, 99, CONVERSION, -1),  # converted without exposure
+            (2, 10, EXPOSURE, 1),
+            (2, 20, EXPOSURE, 0),
+        ],
+        dtype=EVENT_DTYPE,
+    )
+
+
+EXPECTED = {
+    1: {"conversions_a": 1, "visitors_a": 2, "conversions_b": 2, "visitors_b": 2},
+    2: {"conversions_a": 0, "visitors_a": 1, "conversions_b": 0, "visitors_b": 1},
+}
+
+
+class TestAssignArms:
+    """Test hash-based arm assignment"""
+
+    def test_deterministic_and_balanced(self):
+        """Test that assignment is stable and roughly balanced"""
+        users = np.arange(100000)
+
+        arms_1 = assign_arms(7, users)
+        arms_2 = assign_arms(7, users)
+
+        np.testing.assert_array_equal(arms_1, arms_2)
+        assert abs(arms_1.mean() - 0.5) < 0.01
+
+    def test_salt_changes_assignment(self):
+        """Test that a different salt re-randomizes"""
+        users = np.arange(1000)
+        assert not np.array_equal(assign_arms(7, users), assign_arms(7, users, salt=1))
+
+
+class TestEventCounter:
+    """Test deduplication and counting"""
+
+    def test_chunked_counts(self):
+        """Test that counts are identical for any chunking"""
+        events = make_events()
+        for chunk_size in (1, 3, len(events)):
+            counter = EventCounter()
+            for start in range(0, len(events), chunk_size):
+                chunk = events[start : start + chunk_size]
+                counter.update(chunk["experiment_id"], chunk["user_id"], chunk["event"], chunk["arm"])
+            assert counter.counts() == EXPECTED
+
+    def test_counts_feed_ab_test(self):
+        """Test that counts unpack straight into ABTest"""
+        counter = EventCounter()
+        events = make_events()
+        counter.update(events["experiment_id"], events["user_id"], events["event"], events["arm"])
+
+        results = ABTest().two_proportion_ztest(**counter.counts()[1])
+
+        assert results["conversion_rate_a"] == pytest.approx(0.5)
+
+    def test_hash_assignment_when_arm_missing(self):
+        """Test that arms are assigned by hash when not logged"""
+        counter = EventCounter()
+        users = np.arange(1000)
+        counter.update(np.zeros(1000), users, np.full(1000, EXPOSURE))
+
+        counts = counter.counts()[0]
+
+        assert counts["visitors_a"] + counts["visitors_b"] == 1000
+        assert counts["visitors_b"] == int(assign_arms(0, users).sum())
+
+
+class TestReaders:
+    """Test file readers"""
+
+    def test_binary_memmap(self, tmp_path):
+        """Test reading a raw binary dump through a memory map"""
+        path = tmp_path / "events.bin"
+        make_events().tofile(path)
+
+        counter = count_events(str(path), chunk_size=4)
+
+        assert counter.counts() == EXPECTED
+
+    def test_npy(self, tmp_path):
+        """Test reading a .npy dump"""
+        path = tmp_path / "events.npy"
+        np.save(path, make_events())
+
+        assert count_events(str(path), chunk_size=5).counts() == EXPECTED
+
+    def test_csv(self, tmp_path):
+        """Test reading a CSV log with named events and letter arms"""
+        path = tmp_path / "events.csv"
+        names = {EXPOSURE: "exposure", CONVERSION: "conversion"}
+        lines = ["experiment_id,user_id,event,arm"]
+        for exp, user, event, arm in make_events().tolist():
+            arm_label = "" if arm < 0 else "AB"[arm]
+            lines.append(f"{exp},{user},{names[event]},{arm_label}")
+        path.write_text("\n".join(lines) + "\n")
+
+        assert count_events(str(path), chunk_size=4).counts() == EXPECTED
+
+    def test_label_codes_shared_by_readers(self):
+        """Test the column coding used by both the CSV and Parquet readers"""
+        chunk = _encode_chunk(
+            {
+                "experiment_id": np.array([1, 1, 1]),
+                "user_id": np.array([5, 6, 7]),
+                "event": np.array(["exposure", "Conversion", "0"], dtype=object),
+                "arm": np.array(["b", None, "1"], dtype=object),
+            }
+        )
+        numeric = _encode_chunk(
+            {"experiment_id": [1], "user_id": [5], "event": [1.0], "arm": np.array([np.nan])}
+        )
+
+        np.testing.assert_array_equal(chunk["event"], [EXPOSURE, CONVERSION, EXPOSURE])
+        np.testing.assert_array_equal(chunk["arm"], [1, UNASSIGNED, 1])
+        assert numeric["arm"].tolist() == [UNASSIGNED]
+        assert numeric["event"].dtype == np.int8
+
+    def test_parquet_string_labels(self, tmp_path):
+        """Test that Parquet logs with text labels are coded like CSV logs"""
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        names = {EXPOSURE: "exposure", CONVERSION: "conversion"}
+        events = make_events().tolist()
+        table = pa.table(
+            {
+                "experiment_id": [row[0] for row in events],
+                "user_id": [row[1] for row in events],
+                "event": [names[row[2]] for row in events],
+                "arm": [None if row[3] < 0 else "AB"[row[3]] for row in events],
+            }
+        )
+        path = tmp_path / "events.parquet"
+        pq.write_table(table, path)
+
+        assert count_events(str(path), chunk_size=4).counts() == EXPECTED
+
+    def test_unknown_format(self, tmp_path):
+        """Test that an unknown format raises"""
+        with pytest.raises(ValueError):
+            count_events(str(tmp_path / "x"), file_format="xml")
@@ -0,0 +1,137 @@
+"""
+Tests for hot-path instrumentation
+Author: Gabriel Demetrios Lafis
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.instrumentation import Instrumentation
+
+
+class TestInstrumentation:
+    """Test the stage and counter collector"""
+
+    def test_stage_and_counter_snapshot(self):
+        """Test that stages and counters are aggregated"""
+        instrumentation = Instrumentation()
+        for _ in range(3):
+            with instrumentation.stage("work"):
+                pass
+        instrumentation.count("items", 5)
+        instrumentation.count("items", 2)
+        snapshot = instrumentation.snapshot()
+
+        assert snapshot["stages"]["work"]["calls"] == 3
+        assert snapshot["stages"]["work"]["total_seconds"] >= 0
+        assert snapshot["counters"] == {"items": 7}
+
+    def test_disabled_records_nothing(self):
+        """Test that a disabled collector is a no-op"""
+        instrumentation = Instrumentation(enabled=False)
+        with instrumentation.stage("work"):
+            instrumentation.count("items")
+
+        assert instrumentation.snapshot() == {"stages": {}, "counters": {}}
+
+    def test_callback_receives_events(self):
+        """Test hand-off of every event to a user callback"""
+        events = []
+        instrumentation = Instrumentation(callback=lambda *event: events.append(event))
+        with instrumentation.stage("work"):
+            instrumentation.count("items", 3)
+
+        assert events[0] == ("counter", "items", 3)
+        assert events[1][:2] == ("timing", "work")
+
+    def test_reset_and_pickle(self):
+        """Test reset and that pickling drops the lock and callback"""
+        instrumentation = Instrumentation(callback=print)
+        instrumentation.count("items")
+        restored = pickle.loads(pickle.dumps(instrumentation))
+        instrumentation.reset()
+
+        assert restored.snapshot()["counters"] == {"items": 1}
+        assert restored.callback is None
+        assert instrumentation.snapshot()["counters"] == {}
+
+
+class TestABTestInstrumentation:
+    """Test the instrumented ABTest methods"""
+
+    def test_off_by_default(self):
+        """Test that ABTest does not record unless enabled"""
+        ab_test = ABTest()
+        ab_test.two_proportion_ztest(100, 1000, 120, 1000)
+
+        assert ab_test.instrumentation.snapshot()["counters"] == {}
+
+    def test_monte_carlo_stages(self):
+        """Test stage timings and sample counts of a Monte Carlo readout"""
+        ab_test = ABTest(seed=1, instrumentation=Instrumentation())
+        ab_test.bayesian_ab_test(100, 1000, 120, 1000, n_simulations=5000)
+        snapshot = ab_test.instrumentation.snapshot()
+
+        assert set(snapshot["stages"]) == {"validation", "rng", "percentile"}
+        assert snapshot["counters"]["samples_drawn"] == 10000
+        assert snapshot["counters"]["calls.bayesian_ab_test"] == 1
+
+    def test_cache_hits_and_misses(self):
+        """Test cache hit and miss counters"""
+        ab_test = ABTest(cache_size=8, instrumentation=Instrumentation())
+        for _ in range(3):
+            ab_test.two_proportion_ztest(100, 1000, 120, 1000)
+        counters = ab_test.instrumentation.snapshot()["counters"]
+
+        assert counters["cache_misses"] == 1
+        assert counters["cache_hits"] == 2
+        assert ab_test.instrumentation.snapshot()["stages"]["distribution"]["calls"] == 1
+
+    def test_enable_later(self):
+        """Test switching the default collector on after construction"""
+        ab_test = ABTest()
+        ab_test.instrumentation.enabled = True
+        ab_test.two_proportion_ztest_batch([10, 20], [100, 200], [12, 25], [100, 200])
+
+        assert ab_test.instrumentation.snapshot()["counters"]["tests_evaluated"] == 2
+        with pytest.raises(ValueError):
+            ab_test.two_proportion_ztest(10, 0, 1, 1)
+        assert ab_test.instrumentation.snapshot()["stages"]["validation"]["calls"] == 2
+
+    def test_continuous_tests_are_instrumented(self):
+        """Test call counters and stages of the CUPED and Mann-Whitney tests"""
+        ab_test = ABTest(instrumentation=Instrumentation())
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=(2, 200))
+        ab_test.cuped_test((x[0] + rng.normal(size=200), x[0]), (x[1] + 1, x[1]))
+        ab_test.mann_whitney_test([5, 10, 3], [2, 9, 8])
+        with pytest.raises(ValueError):
+            ab_test.mann_whitney_test([1, 2], [1])
+        snapshot = ab_test.instrumentation.snapshot()
+
+        assert snapshot["counters"]["calls.cuped_test"] == 1
+        assert snapshot["counters"]["calls.welch_ttest"] == 1
+        assert snapshot["counters"]["calls.mann_whitney_test"] == 2
+        assert snapshot["stages"]["validation"]["calls"] == 3
+        assert snapshot["stages"]["distribution"]["calls"] == 2
+
+    def test_remaining_entry_points_are_instrumented(self):
+        """Test call counters and stages of the bootstrap, posterior and A/B/n tests"""
+        from src.hypothesis_testing.posteriors import BetaPosterior
+
+        ab_test = ABTest(seed=2, instrumentation=Instrumentation())
+        rng = np.random.default_rng(0)
+        ab_test.bootstrap_test(rng.normal(size=100), rng.normal(size=100), n_replicates=200)
+        ab_test.compare_posteriors(BetaPosterior(10, 90), BetaPosterior(12, 88), n_simulations=1000)
+        ab_test.multi_arm_ztest([10, 12, 15], [100] * 3)
+        with pytest.raises(ValueError):
+            ab_test.bootstrap_test([1.0, 2.0], [1.0, 3.0], method="unknown")
+        snapshot = ab_test.instrumentation.snapshot()
+
+        assert snapshot["counters"]["calls.bootstrap_test"] == 2
+        assert snapshot["counters"]["calls.compare_posteriors"] == 1
+        assert snapshot["counters"]["calls.multi_arm_ztest"] == 1
+        assert snapshot["stages"]["validation"]["calls"] == 5
+        assert {"rng", "percentile", "correction"} <= set(snapshot["stages"])
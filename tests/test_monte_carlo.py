@@ -0,0 +1,154 @@
+"""
+Tests for chunked Monte Carlo
+Author: Gabriel Demetrios Lafis
+"""
+
+import tracemalloc
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.monte_carlo import StreamingQuantiles
+from src.hypothesis_testing.posteriors import BetaPosterior
+
+
+@pytest.fixture
+def ab_test():
+    return ABTest(seed=3)
+
+
+class TestStreamingQuantiles:
+    """Test histogram-based quantile estimation"""
+
+    def test_matches_exact_quantiles(self):
+        """Test estimates against NumPy on streamed batches"""
+        rng = np.random.default_rng(0)
+        values = rng.beta(120, 1380, 200000)
+        estimator = StreamingQuantiles()
+        for chunk in np.array_split(values, 10):
+            estimator.update(chunk)
+        width = (estimator.upper - estimator.lower) / estimator.n_bins
+
+        np.testing.assert_allclose(
+            estimator.quantile([0.025, 0.5, 0.975]),
+            np.quantile(values, [0.025, 0.5, 0.975]),
+            atol=width,
+        )
+
+    def test_values_outside_first_range(self):
+        """Test that later out-of-range values widen the range exactly"""
+        estimator = StreamingQuantiles(n_bins=10)
+        estimator.update([0.05, 0.15, 0.95])
+        estimator.update([-5.0, 7.0])
+
+        assert estimator.total == 5
+        assert estimator.lower <= -5.0 and estimator.upper >= 7.0
+        assert estimator.counts.sum() == 5
+        assert estimator.quantile(0.0) == pytest.approx(-5.0, abs=1.6)
+        assert estimator.quantile(1.0) == pytest.approx(7.0, abs=1.6)
+
+    def test_widening_keeps_later_tails(self):
+        """Test that a narrow first batch does not clamp later batches"""
+        rng = np.random.default_rng(1)
+        values = rng.normal(0.0, 1.0, 100000)
+        estimator = StreamingQuantiles()
+        estimator.update(values[:10])
+        estimator.update(values[10:])
+
+        np.testing.assert_allclose(
+            estimator.quantile([0.025, 0.975]), np.quantile(values, [0.025, 0.975]), atol=0.01
+        )
+
+    def test_empty(self):
+        """Test that quantiles need data"""
+        with pytest.raises(ValueError):
+            StreamingQuantiles().quantile(0.5)
+
+
+class TestChunkedBayesian:
+    """Test the chunked Monte Carlo path of bayesian_ab_test"""
+
+    def test_single_chunk_keeps_exact_percentiles(self, ab_test):
+        """Test that a run fitting in one chunk is unchanged by chunk_size"""
+        small = ab_test.bayesian_ab_test(120, 1500, 145, 1500, n_simulations=20000)
+        large = ab_test.bayesian_ab_test(
+            120, 1500, 145, 1500, n_simulations=20000, chunk_size=10**6
+        )
+
+        np.testing.assert_array_equal(small["credible_interval_a"], large["credible_interval_a"])
+        assert small["n_simulations"] == 20000
+
+    def test_chunked_matches_exact(self, ab_test):
+        """Test that chunked estimates agree with the exact posterior"""
+        exact = ab_test.bayesian_ab_test(120, 1500, 145, 1500, method="exact")
+        chunked = ab_test.bayesian_ab_test(
+            120, 1500, 145, 1500, n_simulations=400000, chunk_size=50000
+        )
+
+        assert chunked["prob_b_better_than_a"] == pytest.approx(
+            exact["prob_b_better_than_a"], abs=5 * chunked["monte_carlo_standard_error"]
+        )
+        assert chunked["expected_loss_choosing_b"] == pytest.approx(
+            exact["expected_loss_choosing_b"], rel=0.05
+        )
+        np.testing.assert_allclose(
+            chunked["credible_interval_b"], exact["credible_interval_b"], atol=1e-3
+        )
+
+    def test_small_chunks_match_exact_interval(self, ab_test):
+        """Test credible intervals against betaincinv with tiny chunks"""
+        from scipy import special
+
+        results = ab_test.bayesian_ab_test(
+            120, 1500, 145, 1500, n_simulations=200000, chunk_size=10
+        )
+        exact = special.betaincinv(121, 1381, [0.025, 0.975])
+
+        np.testing.assert_allclose(results["credible_interval_a"], exact, atol=5e-4)
+
+    def test_skewed_posterior_interval_is_exact(self, ab_test):
+        """Test that chunked runs keep the exact tails of a posterior near 0"""
+        from scipy import special
+
+        posterior = BetaPosterior(0.5, 10.5)
+        results = ab_test.compare_posteriors(
+            posterior, BetaPosterior(2, 20), n_simulations=50000, chunk_size=1000
+        )
+        exact = special.betaincinv(0.5, 10.5, [0.025, 0.975])
+
+        np.testing.assert_allclose(results["credible_interval_a"], exact, rtol=1e-10)
+
+    def test_memory_is_bounded_by_chunk(self, ab_test):
+        """Test that peak memory follows the chunk size, not n_simulations"""
+        tracemalloc.start()
+        ab_test.bayesian_ab_test(
+            120, 1500, 145, 1500, n_simulations=2_000_000, chunk_size=20000
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Two million draws per arm would need 32 MB for the samples alone
+        assert peak < 4 * 2**20
+
+    def test_early_stop(self, ab_test):
+        """Test stopping once the standard error reaches the tolerance"""
+        results = ab_test.bayesian_ab_test(
+            120, 1500, 145, 1500, n_simulations=10**8, chunk_size=10000, tolerance=0.005
+        )
+
+        assert results["n_simulations"] < 10**6
+        assert results["n_simulations"] % 10000 == 0
+        assert results["monte_carlo_standard_error"] <= 0.005
+
+    def test_invalid_settings(self, ab_test):
+        """Test simulation count, chunk size and tolerance validation"""
+        with pytest.raises(ValueError):
+            ab_test.bayesian_ab_test(10, 100, 12, 100, chunk_size=0)
+        with pytest.raises(ValueError):
+            ab_test.bayesian_ab_test(10, 100, 12, 100, tolerance=-1.0)
+        with pytest.raises(ValueError):
+            ab_test.bayesian_ab_test(10, 100, 12, 100, n_simulations=0)
+        with pytest.raises(ValueError):
+            ab_test.compare_posteriors(
+                BetaPosterior(11, 89), BetaPosterior(13, 87), n_simulations=-5
+            )
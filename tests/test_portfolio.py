@@ -0,0 +1,80 @@
+"""
+Tests for the parallel portfolio runner
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.portfolio import PortfolioRunner
+
+
+def make_portfolio(n):
+    return [
+        {
+            "conversions_a": 100 + i,
+            "visitors_a": 1000,
+            "conversions_b": 100 + 2 * i,
+            "visitors_b": 1000,
+        }
+        for i in range(n)
+    ]
+
+
+class TestPortfolioRunner:
+    """Test process-pool portfolio execution"""
+
+    def test_results_in_original_order(self):
+        """Test that results come back in input order"""
+        runner = PortfolioRunner(ABTest(), max_workers=2, chunk_size=3, seed=1)
+        portfolio = make_portfolio(10)
+
+        results = runner.run(portfolio, n_simulations=2000)
+
+        assert len(results) == 10
+        for experiment, result in zip(portfolio, results):
+            expected_mean = (experiment["conversions_b"] + 1) / 1002
+            assert result["posterior_mean_b"] == pytest.approx(expected_mean, abs=0.005)
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test that the same seed gives the same results for any worker count"""
+        portfolio = make_portfolio(8)
+
+        serial = PortfolioRunner(ABTest(), max_workers=1, chunk_size=2, seed=42)
+        parallel = PortfolioRunner(ABTest(), max_workers=2, chunk_size=2, seed=42)
+
+        results_serial = serial.run(portfolio, n_simulations=1000)
+        results_parallel = parallel.run(portfolio, n_simulations=1000)
+
+        for r1, r2 in zip(results_serial, results_parallel):
+            assert r1["prob_b_better_than_a"] == r2["prob_b_better_than_a"]
+
+    def test_repeated_runs_match(self):
+        """Test that running twice does not advance the seed sequence"""
+        portfolio = make_portfolio(6)
+        ab_test = ABTest(seed=7)
+        default_seed = PortfolioRunner(ab_test, max_workers=1, chunk_size=2)
+        explicit_seed = PortfolioRunner(ABTest(), max_workers=1, chunk_size=2, seed=7)
+
+        for runner in (default_seed, explicit_seed):
+            first = runner.run(portfolio, n_simulations=1000)
+            second = runner.run(portfolio, n_simulations=1000)
+            assert [r["prob_b_better_than_a"] for r in first] == [
+                r["prob_b_better_than_a"] for r in second
+            ]
+        assert ab_test.random_streams.seed_sequence.n_children_spawned == 1
+
+    def test_chunk_timings(self):
+        """Test that per-chunk timings are reported"""
+        runner = PortfolioRunner(ABTest(), max_workers=1, chunk_size=4)
+
+        runner.run(make_portfolio(10), test="two_proportion_ztest")
+
+        assert [t["size"] for t in runner.chunk_timings] == [4, 4, 2]
+        assert all(t["seconds"] >= 0 for t in runner.chunk_timings)
+
+    def test_invalid_arguments(self):
+        """Test that invalid configuration raises"""
+        with pytest.raises(ValueError):
+            PortfolioRunner(ABTest(), chunk_size=0)
+        with pytest.raises(ValueError):
+            PortfolioRunner(ABTest()).run(make_portfolio(2), test="welch")
@@ -0,0 +1,181 @@
+"""
+Tests for conjugate posterior objects
+Author: Gabriel Demetrios Lafis
+"""
+
+import pickle
+
+import pytest
+import numpy as np
+from scipy import stats
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.continuous import SufficientStats
+from src.hypothesis_testing.posteriors import (
+    BetaPosterior,
+    GammaPosterior,
+    NormalInverseGammaPosterior,
+    posterior_from_dict,
+)
+
+
+@pytest.fixture
+def ab_test():
+    return ABTest(seed=7)
+
+
+class TestBetaPosterior:
+    """Test the conversion-rate posterior"""
+
+    def test_update_and_moments(self):
+        """Test O(1) updates against the Beta distribution"""
+        posterior = BetaPosterior().update(30, 100).update(20, 100)
+
+        assert (posterior.alpha, posterior.beta) == (51.0, 151.0)
+        assert posterior.mean == pytest.approx(stats.beta.mean(51, 151))
+        assert posterior.variance == pytest.approx(stats.beta.var(51, 151))
+        np.testing.assert_allclose(
+            posterior.credible_interval(0.9), stats.beta.ppf([0.05, 0.95], 51, 151)
+        )
+
+    def test_from_baseline(self):
+        """Test an informative prior built from a historical rate"""
+        prior = BetaPosterior.from_baseline(0.1, 500)
+
+        assert prior.mean == pytest.approx(0.1)
+        assert prior.alpha + prior.beta == pytest.approx(500)
+
+    def test_invalid(self):
+        """Test parameter and count validation"""
+        with pytest.raises(ValueError):
+            BetaPosterior(0, 1)
+        with pytest.raises(ValueError):
+            BetaPosterior().update(5, 3)
+
+
+class TestGammaPosterior:
+    """Test the event-rate posterior"""
+
+    def test_update_and_quantiles(self):
+        """Test moments and quantiles against the Gamma distribution"""
+        posterior = GammaPosterior(2.0, 1.0).update(40, 10)
+        expected = stats.gamma(42, scale=1 / 11)
+
+        assert posterior.mean == pytest.approx(expected.mean())
+        assert posterior.variance == pytest.approx(expected.var())
+        assert posterior.quantile(0.3) == pytest.approx(expected.ppf(0.3))
+
+
+class TestNormalInverseGammaPosterior:
+    """Test the continuous-metric posterior"""
+
+    def test_reference_prior_matches_t_interval(self):
+        """Test that the improper prior gives a t interval for the mean"""
+        values = np.random.default_rng(0).normal(5, 2, 200)
+        posterior = NormalInverseGammaPosterior().update(values)
+        n = values.size
+        scale = np.sqrt(values.var() / n)
+
+        assert posterior.mean == pytest.approx(values.mean())
+        np.testing.assert_allclose(
+            posterior.credible_interval(),
+            stats.t.interval(0.95, n, loc=values.mean(), scale=scale),
+        )
+
+    def test_batched_updates_match_single_update(self):
+        """Test that sequential sufficient-statistic updates compose"""
+        values = np.random.default_rng(1).lognormal(0, 1, 300)
+        prior = NormalInverseGammaPosterior(mu=1.0, kappa=5.0, alpha=2.0, beta=3.0)
+        once = prior.copy().update(SufficientStats.from_values(values))
+        chunked = prior.copy()
+        for chunk in np.array_split(values, 4):
+            chunked.update(chunk)
+
+        for name in ("mu", "kappa", "alpha", "beta"):
+            assert getattr(chunked, name) == pytest.approx(getattr(once, name))
+
+    def test_improper_posterior(self):
+        """Test that quantiles need data or an informative prior"""
+        with pytest.raises(ValueError):
+            NormalInverseGammaPosterior().quantile(0.5)
+
+
+class TestSerialization:
+    """Test compact serialization"""
+
+    @pytest.mark.parametrize(
+        "posterior",
+        [
+            BetaPosterior(3, 4),
+            GammaPosterior(5, 2),
+            NormalInverseGammaPosterior(1.0, 2.0, 3.0, 4.0),
+        ],
+    )
+    def test_round_trip(self, posterior):
+        """Test dict and pickle round trips"""
+        assert posterior_from_dict(posterior.to_dict()) == posterior
+        assert pickle.loads(pickle.dumps(posterior)) == posterior
+
+    def test_unknown_family(self):
+        """Test that unknown families are rejected"""
+        with pytest.raises(ValueError):
+            posterior_from_dict({"family": "dirichlet"})
+
+
+class TestABTestPriors:
+    """Test priors and stored posteriors in ABTest"""
+
+    def test_default_prior_is_uniform(self, ab_test):
+        """Test that the default matches an explicit Beta(1, 1) prior"""
+        default = ab_test.bayesian_ab_test(120, 1500, 145, 1500, method="exact")
+        explicit = ab_test.bayesian_ab_test(
+            120, 1500, 145, 1500, method="exact", prior=BetaPosterior(1, 1)
+        )
+
+        assert default["prob_b_better_than_a"] == explicit["prob_b_better_than_a"]
+
+    def test_informative_prior_shrinks(self, ab_test):
+        """Test that a strong prior pulls posterior means to the baseline"""
+        prior = BetaPosterior.from_baseline(0.08, 10000)
+        results = ab_test.bayesian_ab_test(120, 1500, 145, 1500, method="exact", prior=prior)
+
+        assert abs(results["posterior_mean_b"] - 0.08) < abs(145 / 1500 - 0.08) / 2
+
+    def test_prior_is_part_of_cache_key(self):
+        """Test that cached results are not shared across priors"""
+        ab_test = ABTest(cache_size=8)
+        flat = ab_test.bayesian_ab_test(10, 100, 12, 100, method="exact")
+        strong = ab_test.bayesian_ab_test(
+            10, 100, 12, 100, method="exact", prior=BetaPosterior(100, 100)
+        )
+
+        assert flat["posterior_mean_a"] != strong["posterior_mean_a"]
+
+    def test_compare_stored_beta_posteriors(self, ab_test):
+        """Test that stored posteriors reproduce the count-based readout"""
+        posterior_a = BetaPosterior().update(120, 1500)
+        posterior_b = BetaPosterior().update(145, 1500)
+        stored = ab_test.compare_posteriors(posterior_a, posterior_b, method="exact")
+        counts = ab_test.bayesian_ab_test(120, 1500, 145, 1500, method="exact")
+
+        assert stored["prob_b_better_than_a"] == pytest.approx(counts["prob_b_better_than_a"])
+
+    def test_compare_gamma_posteriors(self, ab_test):
+        """Test Monte Carlo comparison against the closed-form probability"""
+        posterior_a = GammaPosterior(1, 1e-6).update(200, 100)
+        posterior_b = GammaPosterior(1, 1e-6).update(230, 100)
+        results = ab_test.compare_posteriors(posterior_a, posterior_b, n_simulations=200000)
+
+        # P(rate_b > rate_a) via the Beta representation of Gamma ratios
+        exact = stats.beta.sf(
+            posterior_a.rate / (posterior_a.rate + posterior_b.rate),
+            posterior_b.shape,
+            posterior_a.shape,
+        )
+        assert results["prob_b_better_than_a"] == pytest.approx(exact, abs=0.01)
+
+    def test_compare_requires_same_family(self, ab_test):
+        """Test family and method validation"""
+        with pytest.raises(ValueError):
+            ab_test.compare_posteriors(BetaPosterior(), GammaPosterior())
+        with pytest.raises(ValueError):
+            ab_test.compare_posteriors(GammaPosterior(), GammaPosterior(), method="exact")
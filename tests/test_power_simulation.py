@@ -0,0 +1,113 @@
+"""
+Tests for simulation-based power analysis
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest, _prob_beta_greater
+from src.hypothesis_testing.posteriors import BetaPosterior
+from src.hypothesis_testing.power_simulation import PowerSimulator, prob_b_better_batch
+
+
+@pytest.fixture
+def simulator():
+    return PowerSimulator(ABTest(seed=5), n_replicates=8000, block_size=3000)
+
+
+def larger_b(conversions_a, visitors_a, conversions_b, visitors_b, look):
+    return conversions_b / visitors_b > conversions_a / visitors_a
+
+
+class TestProbBBetterBatch:
+    """Test the batched P(B > A)"""
+
+    def test_matches_exact(self):
+        """Test against the exact single-pair computation"""
+        pairs = [(1, 1, 1, 1), (3, 998, 8, 1993), (101, 901, 131, 871), (2, 19, 300, 2701)]
+        probs = prob_b_better_batch(*np.array(pairs, dtype=float).T)
+
+        for prob, (aa, ba, ab, bb) in zip(probs, pairs):
+            assert prob == pytest.approx(_prob_beta_greater(ab, bb, aa, ba), abs=1e-6)
+
+
+class TestPowerSimulator:
+    """Test simulated power and false-positive rates"""
+
+    def test_ztest_matches_analytic_power(self, simulator):
+        """Test that simulated power agrees with the normal approximation"""
+        n = simulator.ab_test.calculate_sample_size(0.1, 0.1)
+        results = simulator.power(0.1, 0.1, n)
+
+        assert results["power"] == pytest.approx(0.8, abs=4 * results["power_standard_error"])
+        assert results["false_positive_rate"] == pytest.approx(0.05, abs=0.012)
+        low, high = results["power_interval"]
+        assert low < results["power"] < high
+
+    def test_peeking_inflates_false_positives(self, simulator):
+        """Test that naive peeking inflates the FPR and spending controls it"""
+        peeking = simulator.simulate(0.1, 0.1, 5000, looks=5)
+        sequential = simulator.simulate(0.1, 0.1, 5000, decision="sequential", looks=5)
+
+        assert peeking["rejection_rate"] > 0.1
+        assert sequential["rejection_rate"] == pytest.approx(0.05, abs=0.012)
+        assert np.all(np.diff(peeking["rejection_rate_by_look"]) >= 0)
+        assert peeking["expected_visitors"] < 10000
+
+    def test_bayesian_and_custom_rules(self, simulator):
+        """Test the Bayesian rule and a user-supplied batched rule"""
+        bayesian = simulator.simulate(0.05, 0.05, 2000, 6000, decision="bayesian", threshold=0.9)
+        custom = simulator.simulate(0.05, 0.05, 2000, decision=larger_b)
+
+        assert bayesian["rejection_rate"] == pytest.approx(0.1, abs=0.015)
+        assert custom["rejection_rate"] == pytest.approx(0.5, abs=0.03)
+        assert custom["decision"] == "custom"
+
+    def test_bayesian_prior(self, simulator):
+        """Test that the Bayesian rule uses the given prior of both arms"""
+        uniform = simulator.simulate(0.05, 0.05, 500, decision="bayesian", prior=BetaPosterior())
+        default = simulator.simulate(0.05, 0.05, 500, decision="bayesian")
+        sceptical = simulator.simulate(
+            0.05, 0.05, 500, decision="bayesian", prior=BetaPosterior(100, 1900)
+        )
+
+        assert uniform == default
+        assert sceptical["rejection_rate"] < 0.5 * default["rejection_rate"]
+        with pytest.raises(ValueError):
+            simulator.simulate(0.05, 0.05, 500, decision="bayesian", prior=(1, 1))
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test that seeds fix the results regardless of the worker count"""
+        serial = PowerSimulator(n_replicates=4000, block_size=1000, seed=9)
+        parallel = PowerSimulator(n_replicates=4000, block_size=1000, seed=9, max_workers=2)
+
+        assert serial.simulate(0.1, 0.12, 3000) == pytest.approx(parallel.simulate(0.1, 0.12, 3000))
+
+    def test_power_curve_increases(self, simulator):
+        """Test that power grows with sample size"""
+        curve = simulator.power_curve(0.1, 0.1, [2000, 8000, 20000])
+
+        assert np.all(np.diff(curve["power"]) > 0)
+        assert curve["false_positive_rate"].shape == (3,)
+
+    def test_invalid_input(self, simulator):
+        """Test that invalid designs raise errors"""
+        with pytest.raises(ValueError):
+            simulator.simulate(0.1, 1.2, 1000)
+        with pytest.raises(ValueError):
+            simulator.simulate(0.1, 0.1, 1000, looks=[0.5, 0.4, 1.0])
+        with pytest.raises(ValueError):
+            simulator.simulate(0.1, 0.1, 1000, decision="unknown")
+        with pytest.raises(ValueError):
+            PowerSimulator(n_replicates=0)
+
+    def test_unknown_rule_options(self, simulator):
+        """Test that options the decision rule does not accept raise errors"""
+        with pytest.raises(ValueError):
+            simulator.simulate(0.1, 0.1, 1000, threshold=0.9)
+        with pytest.raises(ValueError):
+            simulator.simulate(0.1, 0.1, 1000, decision="bayesian", treshold=0.9)
+        with pytest.raises(ValueError):
+            simulator.simulate(0.1, 0.1, 1000, decision="sequential", prior=None)
+        with pytest.raises(ValueError):
+            simulator.simulate(0.1, 0.1, 1000, decision=larger_b, threshold=0.9)
@@ -0,0 +1,110 @@
+"""
+Tests for seedable random stream management
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.random_streams import RandomStreams
+
+
+class TestRandomStreams:
+    """Test keyed stream derivation"""
+
+    def test_same_key_same_stream(self):
+        """Test that a key always maps to the same stream for a seed"""
+        streams_1 = RandomStreams(seed=7)
+        streams_2 = RandomStreams(seed=7)
+
+        draws_1 = streams_1.generator("exp-1").random(5)
+        draws_2 = streams_2.generator("exp-1").random(5)
+
+        np.testing.assert_array_equal(draws_1, draws_2)
+
+    def test_different_keys_are_independent(self):
+        """Test that different keys give different streams"""
+        streams = RandomStreams(seed=7)
+
+        draws_1 = streams.generator("exp-1").random(5)
+        draws_2 = streams.generator("exp-2").random(5)
+
+        assert not np.array_equal(draws_1, draws_2)
+
+    def test_bit_generator_choice(self):
+        """Test that the configured bit generator is used"""
+        streams = RandomStreams(seed=1, bit_generator="Philox")
+
+        assert isinstance(streams.generator().bit_generator, np.random.Philox)
+        assert isinstance(streams.generator("key").bit_generator, np.random.Philox)
+
+    def test_generator_seed(self):
+        """Test that an existing Generator can be supplied"""
+        rng = np.random.default_rng(3)
+        streams = RandomStreams(seed=rng)
+
+        assert streams.generator() is rng
+        assert streams.seeded
+
+    def test_invalid_bit_generator(self):
+        """Test that an unknown bit generator raises"""
+        with pytest.raises(ValueError):
+            RandomStreams(bit_generator="LCG")
+
+
+class TestABTestSeeding:
+    """Test reproducible Monte Carlo in ABTest"""
+
+    def test_seeded_calls_repeat(self):
+        """Test that a seeded framework gives identical results on identical data"""
+        ab_test = ABTest(seed=123)
+
+        results1 = ab_test.bayesian_ab_test(120, 1500, 145, 1500, n_simulations=5000)
+        results2 = ab_test.bayesian_ab_test(120, 1500, 145, 1500, n_simulations=5000)
+
+        assert results1["prob_b_better_than_a"] == results2["prob_b_better_than_a"]
+        np.testing.assert_array_equal(
+            results1["credible_interval_a"], results2["credible_interval_a"]
+        )
+
+    def test_seed_reproducible_across_instances(self):
+        """Test that two frameworks with the same seed agree"""
+        results1 = ABTest(seed=5).bayesian_ab_test(10, 100, 12, 100, n_simulations=5000)
+        results2 = ABTest(seed=5).bayesian_ab_test(10, 100, 12, 100, n_simulations=5000)
+
+        assert results1["expected_loss_choosing_b"] == results2["expected_loss_choosing_b"]
+
+    def test_per_call_seed_and_key(self):
+        """Test per-call seeds and experiment keys"""
+        ab_test = ABTest()
+
+        by_seed_1 = ab_test.bayesian_ab_test(10, 100, 12, 100, n_simulations=5000, seed=9)
+        by_seed_2 = ab_test.bayesian_ab_test(10, 100, 12, 100, n_simulations=5000, seed=9)
+        by_key_1 = ab_test.bayesian_ab_test(10, 100, 12, 100, n_simulations=5000, key="exp")
+        by_key_2 = ab_test.bayesian_ab_test(10, 100, 12, 100, n_simulations=5000, key="exp")
+
+        assert by_seed_1["prob_b_better_than_a"] == by_seed_2["prob_b_better_than_a"]
+        assert by_key_1["prob_b_better_than_a"] == by_key_2["prob_b_better_than_a"]
+
+    def test_multi_arm_seeded(self):
+        """Test that the multi-arm Bayesian test honours the seed"""
+        ab_test = ABTest(seed=11, bit_generator="PCG64DXSM")
+
+        results1 = ab_test.bayesian_multi_arm_test([10, 12, 15], [100] * 3, n_simulations=5000)
+        results2 = ab_test.bayesian_multi_arm_test([10, 12, 15], [100] * 3, n_simulations=5000)
+
+        np.testing.assert_array_equal(results1["prob_best"], results2["prob_best"])
+
+    def test_numpy_counts_share_python_stream(self):
+        """Test that NumPy integer counts reuse the stream of equal Python ints"""
+        ab_test = ABTest(seed=3)
+
+        native = ab_test.bayesian_ab_test(10, 100, 12, 100, n_simulations=5000)
+        numpy = ab_test.bayesian_ab_test(
+            np.int64(10), np.int64(100), np.int32(12), np.int64(100), n_simulations=5000
+        )
+        keyed = ab_test.random_streams.generator(("exp", np.int64(1)))
+        plain = ab_test.random_streams.generator(("exp", 1))
+
+        assert native["prob_b_better_than_a"] == numpy["prob_b_better_than_a"]
+        assert keyed.random() == plain.random()
@@ -0,0 +1,148 @@
+"""
+Tests for result records and result sets
+Author: Gabriel Demetrios Lafis
+"""
+
+import copy
+import pickle
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.results import BayesianResult, ResultSet, ZTestResult
+
+
+@pytest.fixture
+def ab_test():
+    return ABTest(seed=2)
+
+
+@pytest.fixture
+def batch(ab_test):
+    rng = np.random.default_rng(2)
+    conversions = rng.integers(50, 150, (1000, 2))
+    return ab_test.two_proportion_ztest_batch(
+        conversions[:, 0], 1000, conversions[:, 1], 1000
+    )
+
+
+class TestRecords:
+    """Test slotted single-call results"""
+
+    def test_ztest_record_behaves_like_dict(self, ab_test):
+        """Test mapping access, plain Python values and to_dict"""
+        results = ab_test.two_proportion_ztest(120, 1500, 145, 1500)
+
+        assert isinstance(results, ZTestResult)
+        assert not hasattr(results, "__dict__")
+        assert type(results["p_value"]) is float
+        assert type(results["is_significant"]) is bool
+        assert isinstance(results["confidence_interval"], tuple)
+        assert results.get("missing") is None
+        assert list(results.to_dict()) == list(ZTestResult.__slots__)
+
+    def test_bayesian_optional_fields(self, ab_test):
+        """Test that exact results omit the Monte Carlo fields"""
+        monte_carlo = ab_test.bayesian_ab_test(120, 1500, 145, 1500, n_simulations=2000)
+        exact = ab_test.bayesian_ab_test(120, 1500, 145, 1500, method="exact")
+
+        assert isinstance(exact, BayesianResult)
+        assert "n_simulations" in monte_carlo
+        assert "n_simulations" not in exact
+        assert len(exact) == len(monte_carlo) - 2
+        assert isinstance(exact["credible_interval_a"], np.ndarray)
+
+    def test_fields_are_fixed(self, ab_test):
+        """Test that existing fields can be reassigned but not added"""
+        results = ab_test.two_proportion_ztest(120, 1500, 145, 1500)
+        results["p_value"] = 0.5
+
+        assert results["p_value"] == 0.5
+        with pytest.raises(KeyError):
+            results["extra"] = 1
+        with pytest.raises(TypeError):
+            ZTestResult(p_value=0.1)
+
+    def test_pickle_and_copy_round_trip(self, ab_test):
+        """Test that records survive pickling and deep copies"""
+        results = ab_test.bayesian_ab_test(120, 1500, 145, 1500, method="exact")
+
+        assert pickle.loads(pickle.dumps(results)) == results
+        assert copy.deepcopy(results) == results
+
+
+class TestResultSet:
+    """Test columnar batch results"""
+
+    def test_slicing_is_zero_copy(self, batch):
+        """Test that slices are views and masks select rows"""
+        head = batch[:100]
+        significant = batch[batch["is_significant"]]
+
+        assert isinstance(batch, ResultSet)
+        assert head.n_rows == 100
+        assert np.shares_memory(head["p_value"], batch["p_value"])
+        assert np.all(significant["p_value"] < 0.05)
+        assert head["confidence_level"] == batch["confidence_level"] == 0.95
+
+    def test_rows_and_dict_compatibility(self, batch):
+        """Test single rows and the dict of columns path"""
+        row = batch[3]
+        as_dict = batch.to_dict()
+
+        assert row["p_value"] == batch["p_value"][3]
+        assert type(row["p_value"]) is float
+        assert set(as_dict) == set(batch)
+        assert as_dict["p_value"] is batch["p_value"]
+        with pytest.raises(ValueError):
+            batch["short"] = np.zeros(3)
+
+    def test_rows_of_object_columns(self, ab_test):
+        """Test single rows of segment results with label columns"""
+        rng = np.random.default_rng(0)
+        arms = rng.integers(0, 2, 2000)
+        converted = rng.random(2000) < 0.1
+        segments = {"country": rng.choice(["BR", "US"], 2000)}
+        results = ab_test.segment_ztest(arms, converted, segments)
+        row = results[0]
+
+        assert row["grouping"] == results["grouping"][0]
+        assert isinstance(row["country"], str)
+        assert row["correction"] == results["correction"]
+
+    def test_scalar_batch_is_one_row(self, ab_test):
+        """Test that scalar counts give a one-row result set"""
+        results = ab_test.two_proportion_ztest_batch(100, 1000, 140, 1000)
+
+        assert results.n_rows == 1
+        assert set(results.constants) == {"confidence_level"}
+        single = ab_test.two_proportion_ztest(100, 1000, 140, 1000)
+        assert results[0]["p_value"] == pytest.approx(single["p_value"])
+        assert results[0]["relative_lift"] == pytest.approx(single["relative_lift"])
+
+    def test_from_records(self, ab_test):
+        """Test stacking single results into columns"""
+        records = [ab_test.two_proportion_ztest(100 + i, 1000, 110, 1000) for i in range(5)]
+        stacked = ResultSet.from_records(records)
+
+        assert stacked["confidence_interval"].shape == (5, 2)
+        assert stacked[2] == records[2]
+        with pytest.raises(ValueError):
+            ResultSet.from_records(
+                [records[0], ab_test.bayesian_ab_test(1, 10, 2, 10, method="exact")]
+            )
+
+    def test_npz_round_trip(self, batch, tmp_path):
+        """Test npz serialization of columns and constants"""
+        path = tmp_path / "results.npz"
+        batch.save_npz(path)
+
+        assert ResultSet.load_npz(path) == batch
+
+    def test_arrow_export(self, batch):
+        """Test conversion to an Arrow table"""
+        pytest.importorskip("pyarrow")
+        table = batch.to_arrow()
+
+        assert table.num_rows == batch.n_rows
+        np.testing.assert_array_equal(table.column("p_value").to_numpy(), batch["p_value"])
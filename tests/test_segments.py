@@ -0,0 +1,109 @@
+"""
+Tests for segment slicing
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from src.hypothesis_testing import segments as segments_module
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.segments import segment_counts
+
+
+@pytest.fixture
+def units():
+    rng = np.random.default_rng(11)
+    n = 20000
+    arms = rng.integers(0, 2, n)
+    converted = rng.random(n) < 0.1 + 0.02 * arms
+    segments = {
+        "country": rng.choice(["BR", "US", "DE", "IN"], n),
+        "platform": rng.choice(["ios", "android"], n),
+        "returning": rng.random(n) < 0.4,
+    }
+    return arms, converted, segments
+
+
+def slice_mask(segments, row, results):
+    mask = np.ones(len(next(iter(segments.values()))), dtype=bool)
+    for name in results["grouping"][row]:
+        mask &= segments[name] == results[name][row]
+    return mask
+
+
+class TestSegmentCounts:
+    """Test one-pass aggregation of slice counts"""
+
+    def test_counts_match_boolean_masks(self, units):
+        """Test every slice against a direct filter of the units"""
+        arms, converted, segments = units
+        counts = segment_counts(arms, converted, segments)
+
+        # 4 + 2 + 2 + 8 + 8 + 4 + 16 slices over the 7 default groupings
+        assert counts["grouping"].size == 44
+        for row in range(counts["grouping"].size):
+            mask = slice_mask(segments, row, counts)
+            assert counts["visitors_a"][row] == np.sum(mask & (arms == 0))
+            assert counts["conversions_b"][row] == np.sum(mask & (arms == 1) & converted)
+
+    def test_overall_and_missing_levels(self, units):
+        """Test the empty grouping and None levels for unused dimensions"""
+        arms, converted, segments = units
+        counts = segment_counts(arms, converted, segments, by=[(), ("platform",)])
+
+        assert counts["grouping"][0] == ()
+        assert counts["visitors_a"][0] + counts["visitors_b"][0] == arms.size
+        assert counts["country"][0] is None
+        assert set(counts["platform"][1:]) == {"ios", "android"}
+
+    def test_sparse_path_matches_dense(self, units, monkeypatch):
+        """Test that high-cardinality keys give the same slices as the lookup table"""
+        arms, converted, segments = units
+        dense = segment_counts(arms, converted, segments, by=[("country", "platform")])
+        monkeypatch.setattr(segments_module, "_DENSE_LIMIT", 0)
+        monkeypatch.setattr(segments_module, "_KEY_LIMIT", 5)
+        sparse = segment_counts(arms, converted, segments, by=[("country", "platform")])
+
+        for name in ("country", "platform", "visitors_a", "conversions_b"):
+            assert list(sparse[name]) == list(dense[name])
+
+    def test_invalid_input(self, units):
+        """Test that invalid input raises errors"""
+        arms, converted, segments = units
+        with pytest.raises(ValueError):
+            segment_counts(arms + 1, converted, segments)
+        with pytest.raises(ValueError):
+            segment_counts(arms, converted, segments, by=[("city",)])
+        with pytest.raises(ValueError):
+            segment_counts(arms, converted, {"country": segments["country"][:10]})
+
+
+class TestSegmentZTest:
+    """Test vectorized slice tests with FDR correction"""
+
+    def test_matches_scalar_tests(self, units):
+        """Test that slice results equal individual z-tests"""
+        arms, converted, segments = units
+        ab_test = ABTest()
+        results = ab_test.segment_ztest(arms, converted, segments, by=[("country",)])
+
+        for row in range(results["grouping"].size):
+            expected = ab_test.two_proportion_ztest(
+                results["conversions_a"][row],
+                results["visitors_a"][row],
+                results["conversions_b"][row],
+                results["visitors_b"][row],
+            )
+            assert results["p_value"][row] == pytest.approx(expected["p_value"])
+        assert results["correction"] == "fdr_bh"
+        assert np.all(results["p_value_adjusted"] >= results["p_value"])
+
+    def test_small_slices_are_not_tested(self, units):
+        """Test that slices below min_visitors get NaN and stay insignificant"""
+        arms, converted, segments = units
+        results = ABTest().segment_ztest(arms, converted, segments, min_visitors=700)
+
+        assert not results["tested"].all()
+        assert np.all(np.isnan(results["p_value"][~results["tested"]]))
+        assert not results["is_significant"][~results["tested"]].any()
+        assert not np.isnan(results["p_value_adjusted"][results["tested"]]).any()
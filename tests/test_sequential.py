@@ -0,0 +1,100 @@
+"""
+Tests for sequential testing
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.sequential import GroupSequentialTest, MSPRTTest, alpha_spent
+
+
+class TestAlphaSpending:
+    """Test alpha-spending functions"""
+
+    @pytest.mark.parametrize("spending", ["obrien_fleming", "pocock"])
+    def test_full_alpha_spent_at_end(self, spending):
+        """Test that all alpha is spent at full information"""
+        assert alpha_spent(spending, 1.0, 0.05) == pytest.approx(0.05)
+        assert alpha_spent(spending, 0.0, 0.05) == pytest.approx(0.0)
+
+    def test_obrien_fleming_is_conservative_early(self):
+        """Test that O'Brien-Fleming spends less alpha early than Pocock"""
+        assert alpha_spent("obrien_fleming", 0.2, 0.05) < alpha_spent("pocock", 0.2, 0.05)
+
+
+class TestGroupSequentialTest:
+    """Test group-sequential boundaries and stopping"""
+
+    def run_equal_looks(self, spending):
+        design = GroupSequentialTest(ABTest(), max_sample_size=10000, spending=spending)
+        return [design.update(200 * k, 2000 * k, 200 * k, 2000 * k)["boundary"] for k in range(1, 6)]
+
+    def test_obrien_fleming_boundaries(self):
+        """Test boundaries against published Lan-DeMets O'Brien-Fleming values"""
+        np.testing.assert_allclose(
+            self.run_equal_looks("obrien_fleming"), [4.877, 3.357, 2.680, 2.290, 2.031], atol=2e-3
+        )
+
+    def test_pocock_boundaries(self):
+        """Test boundaries against published Lan-DeMets Pocock values"""
+        np.testing.assert_allclose(
+            self.run_equal_looks("pocock"), [2.438, 2.427, 2.410, 2.397, 2.386], atol=2e-3
+        )
+
+    def test_early_stop_on_large_effect(self):
+        """Test that a large effect stops the experiment at an interim look"""
+        design = GroupSequentialTest(ABTest(), baseline_rate=0.10, mde=0.20)
+
+        result = design.update(100, 1000, 200, 1000)
+
+        assert result["reject_null"]
+        assert result["stop"]
+        with pytest.raises(ValueError):
+            design.update(200, 2000, 400, 2000)
+
+    def test_looks_must_add_information(self):
+        """Test that repeating a look raises"""
+        design = GroupSequentialTest(ABTest(), max_sample_size=10000)
+        design.update(100, 1000, 101, 1000)
+
+        with pytest.raises(ValueError):
+            design.update(100, 1000, 101, 1000)
+
+    def test_requires_sizing(self):
+        """Test that the design needs a maximum sample size"""
+        with pytest.raises(ValueError):
+            GroupSequentialTest(ABTest())
+
+
+class TestMSPRTTest:
+    """Test always-valid mSPRT p-values"""
+
+    def test_p_value_is_monotone(self):
+        """Test that the always-valid p-value never increases"""
+        test = MSPRTTest(ABTest(), baseline_rate=0.10, mde=0.20)
+        rng = np.random.default_rng(0)
+        conv_a = conv_b = 0
+        previous = 1.0
+
+        for look in range(1, 30):
+            conv_a += rng.binomial(200, 0.10)
+            conv_b += rng.binomial(200, 0.10)
+            result = test.update(conv_a, 200 * look, conv_b, 200 * look)
+            assert result["p_value"] <= previous
+            previous = result["p_value"]
+
+    def test_rejects_real_effect(self):
+        """Test that a real effect is eventually detected"""
+        test = MSPRTTest(ABTest(), tau=0.02)
+
+        results = [test.update(100 * k, 1000 * k, 130 * k, 1000 * k) for k in range(1, 20)]
+
+        assert results[-1]["reject_null"]
+        lower, upper = results[-1]["confidence_interval"]
+        assert lower < 0.03 < upper
+
+    def test_requires_tau(self):
+        """Test that the mixing scale is required"""
+        with pytest.raises(ValueError):
+            MSPRTTest(ABTest())
@@ -0,0 +1,237 @@
+"""
+Tests for the asyncio readout service
+Author: Gabriel Demetrios Lafis
+"""
+
+import asyncio
+import json
+
+import pytest
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.service import ABTestService, _request, load_test
+
+COUNTS = {"conversions_a": 100, "visitors_a": 1000, "conversions_b": 130, "visitors_b": 1000}
+
+
+def run_with_service(scenario, **kwargs):
+    async def main():
+        async with ABTestService(ABTest(seed=3), **kwargs) as service:
+            return await scenario(service)
+
+    return asyncio.run(main())
+
+
+async def post(service, path, payload):
+    reader, writer = await asyncio.open_connection(service.host, service.port)
+    try:
+        return await _request(reader, writer, path, payload)
+    finally:
+        writer.close()
+
+
+class TestABTestService:
+    """Test the HTTP endpoints, micro-batching and coalescing"""
+
+    def test_ztest_matches_scalar(self):
+        """Test that a batched z-test returns the scalar readout"""
+        status, result = run_with_service(lambda s: post(s, "/ztest", COUNTS))
+        expected = ABTest().two_proportion_ztest(*COUNTS.values())
+
+        assert status == 200
+        assert result["p_value"] == pytest.approx(expected["p_value"])
+        assert result["confidence_interval"] == pytest.approx(expected["confidence_interval"])
+        assert result["is_significant"] is True
+
+    def test_concurrent_requests_are_batched(self):
+        """Test that concurrent z-tests share batches"""
+
+        async def scenario(service):
+            payloads = [dict(COUNTS, conversions_b=100 + i) for i in range(50)]
+            results = await asyncio.gather(*(post(service, "/ztest", p) for p in payloads))
+            return results, service.stats()
+
+        results, stats = run_with_service(scenario, batch_window=0.05)
+
+        assert all(status == 200 for status, _ in results)
+        assert stats["batched"] == 50
+        assert stats["batches"] < 50
+        assert stats["latency_p50_ms"] <= stats["latency_p99_ms"]
+
+    def test_exact_bayesian_requests_are_batched(self):
+        """Test that exact Bayesian tests share batches and match the scalar readout"""
+
+        async def scenario(service):
+            payloads = [dict(COUNTS, conversions_b=100 + i, method="exact") for i in range(20)]
+            results = await asyncio.gather(*(post(service, "/bayesian", p) for p in payloads))
+            return results, service.stats()
+
+        results, stats = run_with_service(scenario, batch_window=0.05)
+        expected = ABTest().bayesian_ab_test(100, 1000, 119, 1000, method="exact")
+
+        assert all(status == 200 for status, _ in results)
+        assert stats["batched"] == 20
+        assert stats["batches"] < 20
+        assert results[19][1]["prob_b_better_than_a"] == pytest.approx(
+            expected["prob_b_better_than_a"], abs=1e-9
+        )
+        assert results[19][1]["credible_interval_b"] == pytest.approx(
+            list(expected["credible_interval_b"])
+        )
+
+    def test_non_finite_values_are_null(self):
+        """Test that NaN statistics are sent as JSON null"""
+        payload = {"conversions_a": 50, "visitors_a": 50, "conversions_b": 80, "visitors_b": 80}
+
+        async def scenario(service):
+            reader, writer = await asyncio.open_connection(service.host, service.port)
+            body = json.dumps(payload).encode("utf-8")
+            writer.write(
+                (
+                    "POST /ztest HTTP/1.1\r\nConnection: close\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n"
+                ).encode("latin-1")
+                + body
+            )
+            await writer.drain()
+            await reader.readuntil(b"\r\n\r\n")
+            data = await reader.read()
+            writer.close()
+            return data
+
+        data = run_with_service(scenario)
+
+        def reject(constant):
+            raise ValueError(constant)
+
+        result = json.loads(data, parse_constant=reject)
+        assert result["z_statistic"] is None
+        assert result["p_value"] is None
+
+    def test_identical_requests_are_coalesced(self):
+        """Test that identical in-flight requests are computed once"""
+
+        async def scenario(service):
+            payload = dict(COUNTS, n_simulations=20000)
+            results = await asyncio.gather(*(post(service, "/bayesian", payload) for _ in range(8)))
+            return results, service.stats()
+
+        results, stats = run_with_service(scenario)
+
+        assert all(status == 200 for status, _ in results)
+        assert len({r["prob_b_better_than_a"] for _, r in results}) == 1
+        assert stats["coalesced"] >= 1
+        assert stats["pending_keys"] == 0
+
+    def test_errors_do_not_affect_other_requests(self):
+        """Test that invalid input returns 400 and unknown paths 404"""
+
+        async def scenario(service):
+            return await asyncio.gather(
+                post(service, "/ztest", dict(COUNTS, conversions_a=2000)),
+                post(service, "/ztest", {"visitors_a": 10}),
+                post(service, "/ztest", COUNTS),
+                post(service, "/missing", COUNTS),
+            )
+
+        (bad, _), (missing, body), (ok, _), (unknown, _) = run_with_service(scenario)
+
+        assert (bad, missing, ok, unknown) == (400, 400, 200, 404)
+        assert "conversions_a" in body["error"]
+
+    def test_invalid_options_and_headers(self):
+        """Test that bad Bayesian options and Content-Length return 400"""
+
+        async def raw(service, request):
+            reader, writer = await asyncio.open_connection(service.host, service.port)
+            writer.write(request)
+            status = int((await reader.readline()).split()[1])
+            writer.close()
+            return status
+
+        async def scenario(service):
+            statuses = await asyncio.gather(
+                *(
+                    post(service, "/bayesian", dict(COUNTS, **option))
+                    for option in (
+                        {"n_simulations": 0},
+                        {"tolerance": "small"},
+                        {"key": [1, 2]},
+                        {"method": "bootstrap"},
+                    )
+                )
+            )
+            header = await raw(service, b"POST /ztest HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+            return [status for status, _ in statuses], header, service.stats()
+
+        statuses, header, stats = run_with_service(scenario)
+
+        assert statuses == [400, 400, 400, 400]
+        assert header == 400
+        assert stats["errors"] == 5
+
+    def test_unexpected_errors_return_500(self):
+        """Test that internal failures are answered instead of dropping the connection"""
+
+        class BrokenABTest(ABTest):
+            def bayesian_ab_test(self, *args, **kwargs):
+                raise ZeroDivisionError("boom")
+
+        async def main():
+            async with ABTestService(BrokenABTest()) as service:
+                first = await post(service, "/bayesian", COUNTS)
+                second = await post(service, "/ztest", COUNTS)
+                return first, second, service.stats()
+
+        (status, body), (ok, _), stats = asyncio.run(main())
+
+        assert status == 500
+        assert "ZeroDivisionError" in body["error"]
+        assert ok == 200
+        assert stats["errors"] == 1
+
+    def test_cancelled_leader_releases_waiters(self):
+        """Test that coalesced waiters fail when the leading request is cancelled"""
+
+        async def main():
+            service = ABTestService()
+            never = asyncio.Event()
+
+            async def compute():
+                await never.wait()
+
+            leader = asyncio.create_task(service._coalesce(("key",), compute))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(service._coalesce(("key",), compute))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(waiter, 1.0)
+            return service.stats()
+
+        stats = asyncio.run(main())
+
+        assert stats["coalesced"] == 1
+        assert stats["pending_keys"] == 0
+
+    def test_load_test_reports_latency(self):
+        """Test the load-test helper against a local instance"""
+
+        async def scenario(service):
+            payloads = [dict(COUNTS, conversions_b=100 + i) for i in range(10)]
+            return await load_test(
+                service.host, service.port, payloads, n_requests=200, concurrency=8
+            )
+
+        report = run_with_service(scenario)
+
+        assert report["requests"] == 200
+        assert report["errors"] == 0
+        assert report["server"]["requests"] == 200
+        assert report["server"]["queue_depth"] == 0
+
+    def test_invalid_settings(self):
+        """Test that invalid settings raise errors"""
+        with pytest.raises(ValueError):
+            ABTestService(batch_window=-1)
+        with pytest.raises(ValueError):
+            ABTestService(max_batch_size=0)
@@ -0,0 +1,150 @@
+"""
+Tests for the persistent experiment store
+Author: Gabriel Demetrios Lafis
+"""
+
+import os
+import time
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.posteriors import BetaPosterior
+from src.hypothesis_testing.store import ExperimentStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ExperimentStore(str(tmp_path), sync=False) as store:
+        yield store
+
+
+class TestExperimentStore:
+    """Test durable experiment counts and priors"""
+
+    def test_counts_accumulate_and_reload(self, store):
+        """Test that batched writes sum per arm and survive a reopen"""
+        store.add_batch([1, 1, 2, 1], [0, 1, 0, 1], [10, 12, 3, 8], [100, 110, 40, 90])
+        store.add(2, 1, 5, 50)
+        store.close()
+
+        reopened = ExperimentStore(store.path)
+        counts = reopened.counts(1)
+
+        np.testing.assert_array_equal(counts["arms"], [0, 1])
+        np.testing.assert_array_equal(counts["conversions"], [10, 20])
+        np.testing.assert_array_equal(counts["visitors"], [100, 200])
+        assert len(reopened) == 2
+        with pytest.raises(KeyError):
+            reopened.counts(3)
+        reopened.close()
+
+    def test_priors_and_posteriors(self, store):
+        """Test stored priors, the default prior and posterior updates"""
+        store.add_batch([1, 2], [0, 0], [30, 30], [100, 100])
+        store.set_priors([1], BetaPosterior(2, 8))
+        store.set_priors([1], [BetaPosterior(3, 7)])
+
+        assert store.get_prior(1) == BetaPosterior(3, 7)
+        assert store.get_prior(2) == BetaPosterior(1, 1)
+        assert store.posterior(1, 0) == BetaPosterior(33, 77)
+        with pytest.raises(KeyError):
+            store.posterior(1, 1)
+
+    def test_torn_log_frame_is_discarded(self, store):
+        """Test that a partially written last batch is dropped on recovery"""
+        store.add(1, 0, 1, 10)
+        store.add(1, 0, 2, 10)
+        store.close()
+        log = os.path.join(store.path, "wal-0.log")
+        size = os.path.getsize(log)
+        with open(log, "r+b") as handle:
+            handle.truncate(size - 5)
+
+        reopened = ExperimentStore(store.path)
+
+        assert reopened.counts(1)["conversions"][0] == 1
+        reopened.add(1, 0, 4, 10)
+        reopened.close()
+        assert ExperimentStore(store.path).counts(1)["conversions"][0] == 5
+
+    def test_compaction_keeps_state(self, store):
+        """Test that compaction folds the log into a new snapshot"""
+        store.add_batch([1, 1], [0, 1], [5, 7], [50, 60])
+        store.set_priors([1], BetaPosterior(2, 3))
+        before = store.table().copy()
+        store.compact()
+        store.add(1, 1, 1, 10)
+        store.close()
+
+        reopened = ExperimentStore(store.path)
+
+        assert sorted(os.listdir(store.path)) == ["snapshot-1.npy", "wal-1.log"]
+        for column in ("experiment_id", "arm", "conversions", "visitors"):
+            np.testing.assert_array_equal(reopened.table()[column][:2], before[column][:2])
+        assert reopened.get_prior(1) == BetaPosterior(2, 3)
+        assert reopened.posterior(1, 1) == BetaPosterior(10, 65)
+        reopened.close()
+
+    def test_log_size_triggers_compaction(self, tmp_path):
+        """Test that the log is folded into a snapshot once it passes the limit"""
+        limit = 4096
+        with ExperimentStore(str(tmp_path), sync=False, max_log_bytes=None) as store:
+            for index in range(100):
+                store.add(index, 0, 1, 10)
+        assert os.path.getsize(tmp_path / "wal-0.log") > limit
+
+        with ExperimentStore(str(tmp_path), sync=False, max_log_bytes=limit) as store:
+            assert store.generation == 1
+            for index in range(100):
+                store.add(index, 1, 2, 10)
+                assert os.path.getsize(store._file("wal", store.generation)) < limit
+            assert store.generation > 1
+            counts = store.ab_counts()
+
+        assert counts["experiment_id"].size == 100
+        assert counts["conversions_a"].sum() == 100
+        assert counts["conversions_b"].sum() == 200
+
+    def test_ab_counts_feed_batch_ztest(self, store):
+        """Test the columnar two-arm view against the batched z-test"""
+        store.add_batch([3, 3, 4, 5, 5], [0, 1, 0, 0, 1], [10, 20, 5, 30, 31], [100] * 5)
+        counts = store.ab_counts()
+        results = ABTest().two_proportion_ztest_batch(
+            counts["conversions_a"], counts["visitors_a"],
+            counts["conversions_b"], counts["visitors_b"],
+        )
+
+        np.testing.assert_array_equal(counts["experiment_id"], [3, 5])
+        assert results["p_value"][0] < 0.05 < results["p_value"][1]
+
+    def test_reload_100k_experiments(self, tmp_path):
+        """Test that 100k compacted experiments reload well under a second"""
+        n = 100_000
+        rng = np.random.default_rng(0)
+        visitors = rng.integers(1000, 5000, 2 * n)
+        with ExperimentStore(str(tmp_path), sync=False) as store:
+            store.add_batch(
+                np.repeat(np.arange(n), 2), np.tile([0, 1], n),
+                rng.binomial(visitors, 0.1), visitors,
+            )
+            store.compact()
+
+        start = time.perf_counter()
+        with ExperimentStore(str(tmp_path)) as reopened:
+            counts = reopened.ab_counts()
+        elapsed = time.perf_counter() - start
+
+        assert counts["experiment_id"].size == n
+        assert elapsed < 1.0
+
+    def test_invalid_counts(self, store):
+        """Test that invalid writes raise errors"""
+        with pytest.raises(ValueError):
+            store.add(1, 0, 11, 10)
+        with pytest.raises(ValueError):
+            store.add(1, -1, 1, 10)
+        with pytest.raises(ValueError):
+            store.set_priors([1, 2], [BetaPosterior()])
+        with pytest.raises(ValueError):
+            ExperimentStore(store.path, max_log_bytes=0)
@@ -0,0 +1,85 @@
+"""
+Tests for streaming experiment accumulators
+Author: Gabriel Demetrios Lafis
+"""
+
+import pytest
+import numpy as np
+from src.hypothesis_testing.ab_test import ABTest
+from src.hypothesis_testing.streaming import ArmAccumulator, ExperimentAccumulator
+
+
+class TestArmAccumulator:
+    """Test single-arm counters"""
+
+    def test_single_and_batch_updates(self):
+        """Test that single events and micro-batches are counted"""
+        arm = ArmAccumulator()
+        arm.update(True)
+        arm.update(False)
+        arm.update_batch(np.array([1, 0, 0, 1, 1]))
+        arm.add(conversions=2, visitors=10)
+
+        assert arm.visitors == 17
+        assert arm.conversions == 6
+
+    def test_slots(self):
+        """Test that the accumulator has no per-instance dict"""
+        arm = ArmAccumulator()
+        assert not hasattr(arm, "__dict__")
+
+    def test_invalid_counts(self):
+        """Test that invalid counts raise"""
+        with pytest.raises(ValueError):
+            ArmAccumulator(conversions=5, visitors=3)
+        with pytest.raises(ValueError):
+            ArmAccumulator().add(conversions=-1, visitors=3)
+
+
+class TestExperimentAccumulator:
+    """Test experiment-level accumulation and readouts"""
+
+    def test_ztest_matches_totals(self):
+        """Test that readouts match ABTest on the same totals"""
+        ab_test = ABTest()
+        acc = ExperimentAccumulator()
+        acc.update_batch("A", np.r_[np.ones(120), np.zeros(1380)])
+        acc.update_batch("B", np.r_[np.ones(145), np.zeros(1355)])
+
+        results = acc.two_proportion_ztest(ab_test)
+        expected = ab_test.two_proportion_ztest(120, 1500, 145, 1500)
+
+        assert results["p_value"] == pytest.approx(expected["p_value"])
+
+    def test_bayesian_readout(self):
+        """Test Bayesian readout with pass-through options"""
+        ab_test = ABTest()
+        acc = ExperimentAccumulator(arms=("control", "variant"))
+        acc.add("control", 100, 1000)
+        acc.add("variant", 200, 1000)
+
+        results = acc.bayesian_ab_test(ab_test, method="exact")
+
+        assert results["prob_b_better_than_a"] > 0.99
+
+    def test_merge_workers(self):
+        """Test that partial aggregates from several workers combine"""
+        worker_1 = ExperimentAccumulator()
+        worker_2 = ExperimentAccumulator(arms=("A", "B", "C"))
+        worker_1.add("A", 10, 100)
+        worker_1.add("B", 12, 100)
+        worker_2.add("A", 5, 50)
+        worker_2.add("C", 7, 40)
+
+        worker_1.merge(worker_2)
+
+        assert worker_1.arms["A"] == ArmAccumulator(15, 150)
+        assert worker_1.arms["B"] == ArmAccumulator(12, 100)
+        assert worker_1.arms["C"] == ArmAccumulator(7, 40)
+        assert worker_1.counts(treatment="C")["visitors_b"] == 40
+
+    def test_unknown_arm(self):
+        """Test that updating an unknown arm raises"""
+        acc = ExperimentAccumulator()
+        with pytest.raises(KeyError):
+            acc.update("Z", True)